@@ -1,18 +1,19 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from autisahara.performance import TimedSerializerMixin
 from .models import Doctor, ParentDetails, Household
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'full_name', 'phone', 'role', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class ParentRegisterSerializer(serializers.ModelSerializer):
+class ParentRegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
 
     class Meta:
@@ -30,7 +31,7 @@ class ParentRegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class DoctorRegisterSerializer(serializers.ModelSerializer):
+class DoctorRegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
     license_number = serializers.CharField(write_only=True)
     specialization = serializers.CharField(write_only=True, required=False, allow_blank=True)
@@ -66,7 +67,7 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
-class DoctorSerializer(serializers.ModelSerializer):
+class DoctorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
@@ -74,13 +75,13 @@ class DoctorSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'license_number', 'certificate_url', 'specialization', 'is_approved']
 
 
-class ParentDetailsSerializer(serializers.ModelSerializer):
+class ParentDetailsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ParentDetails
         exclude = ['user']
 
 
-class HouseholdSerializer(serializers.ModelSerializer):
+class HouseholdSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Household
         exclude = ['user']
@@ -1,3 +1,28 @@
 from django.test import TestCase
+from rest_framework_simplejwt.tokens import RefreshToken
 
-# Create your tests here.
+from autisahara.query_budget import EndpointBudget, QueryBudgetMixin
+
+
+class AccountsQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budgets = [
+        EndpointBudget('register-parent', 'post', role=None, status=201, max_queries=2, data=lambda d: {
+            'email': 'new@example.com', 'password': 'secret123', 'full_name': 'New Parent', 'phone': '9800000000',
+        }),
+        EndpointBudget('register-doctor', 'post', role=None, status=201, max_queries=3, data=lambda d: {
+            'email': 'newdoc@example.com', 'password': 'secret123', 'full_name': 'New Doctor',
+            'phone': '9800000001', 'license_number': 'NMC-2',
+        }),
+        EndpointBudget('login', 'post', role=None, max_queries=1, data=lambda d: {
+            'email': 'parent@example.com', 'password': 'secret123',
+        }),
+        EndpointBudget('token-refresh', 'post', role=None, max_queries=1, data=lambda d: {
+            'refresh': str(RefreshToken.for_user(d.parent)),
+        }),
+        EndpointBudget('current-user', max_queries=0),
+        EndpointBudget('parent-profile', max_queries=1),
+        EndpointBudget('parent-profile', 'post', status=201, max_queries=2, data=lambda d: {'district': 'Lalitpur'}),
+        EndpointBudget('parent-profile', 'put', max_queries=2, data=lambda d: {'district': 'Lalitpur'}),
+        EndpointBudget('parent-household', max_queries=1),
+        EndpointBudget('parent-household', 'post', status=201, max_queries=2, data=lambda d: {'siblings_count': 2}),
+    ]
@@ -4,8 +4,7 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate, get_user_model
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from autisahara.docs import openapi, swagger_auto_schema
 
 from .models import ParentDetails, Household
 from .serializers import (
@@ -0,0 +1,169 @@
+"""
+Item-level M-CHAT population analytics.
+
+MChatItemStats holds, per cohort (age band x gender x province x district),
+the number of responses and of YES answers to each question. Every
+MChatResponse save or delete applies its difference to its cohort's row
+(signals.py), so a report only sums a few thousand counter rows instead of
+scanning every response. Counting YES answers rather than concerning ones
+keeps the counters valid when the scoring rules change.
+
+Counters drift when a family's province/district changes after screening
+and miss rows written with bulk_create; rebuild_item_stats() recomputes them
+from scratch in one aggregate query (``manage.py refresh_mchat_item_stats``,
+run nightly). Bulk jobs can skip the per-row updates with counting_paused()
+and rebuild afterwards.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from children.models import Child
+
+from . import scoring
+from .models import MChatItemStats, MChatResponse
+
+# Upper age in months of each band (age at registration); older is '>30m'
+AGE_BANDS = ((15, '<16m'), (20, '16-20m'), (25, '21-25m'), (30, '26-30m'))
+OLDEST_BAND = '>30m'
+AGE_BAND_LABELS = [label for _, label in AGE_BANDS] + [OLDEST_BAND]
+
+COHORT_FIELDS = ('age_band', 'gender', 'province', 'district')
+QUESTIONS = range(1, scoring.QUESTION_COUNT + 1)
+
+_paused = threading.local()
+
+
+@contextmanager
+def counting_paused():
+    """Don't update the counters for writes in this block (call rebuild_item_stats() after)"""
+    _paused.active = True
+    try:
+        yield
+    finally:
+        _paused.active = False
+
+
+def age_band(age_years, age_months):
+    months = age_years * 12 + age_months
+    for upper, label in AGE_BANDS:
+        if months <= upper:
+            return label
+    return OLDEST_BAND
+
+
+def child_cohort(child_id):
+    """Cohort key of a child, or None if the child no longer exists"""
+    row = Child.objects.filter(pk=child_id).values(
+        'age_years', 'age_months', 'gender',
+        province=F('parent__parent_details__province'), district=F('parent__parent_details__district'),
+    ).first()
+    if row is None:
+        return None
+    return {
+        'age_band': age_band(row['age_years'], row['age_months']),
+        'gender': row['gender'],
+        'province': row['province'] or '',
+        'district': row['district'] or '',
+    }
+
+
+def count_response(child_id, old_mask, new_mask):
+    """Move a child's answers in the counters from old_mask to new_mask (None = no response)"""
+    if old_mask == new_mask or getattr(_paused, 'active', False):
+        return
+    changes = {}
+    responses = (new_mask is not None) - (old_mask is not None)
+    if responses:
+        changes['responses'] = F('responses') + responses
+    for q_num in QUESTIONS:
+        bit = scoring.question_bit(q_num)
+        delta = bool((new_mask or 0) & bit) - bool((old_mask or 0) & bit)
+        if delta:
+            changes[f'yes{q_num}'] = F(f'yes{q_num}') + delta
+    if not changes:
+        return
+
+    cohort = child_cohort(child_id)
+    if cohort is None:
+        return
+    if MChatItemStats.objects.filter(**cohort).update(**changes):
+        return
+    # First response of the cohort: the deltas are its counts
+    try:
+        with transaction.atomic():
+            MChatItemStats.objects.create(**cohort, **{name: change.rhs.value for name, change in changes.items()})
+    except IntegrityError:
+        # Another request created the row first
+        MChatItemStats.objects.filter(**cohort).update(**changes)
+
+
+def rebuild_item_stats():
+    """Recompute every counter row from MChatResponse; returns the number of cohorts"""
+    months = F('child__age_years') * 12 + F('child__age_months')
+    band = Case(
+        *[When(age_months__lte=upper, then=Value(label)) for upper, label in AGE_BANDS],
+        default=Value(OLDEST_BAND),
+    )
+    # SUM(answers_mask & bit) / bit = number of YES answers to that question
+    bit_sums = {f'bits{q}': Sum(F('answers_mask').bitand(scoring.question_bit(q))) for q in QUESTIONS}
+    rows = (
+        MChatResponse.objects
+        .alias(age_months=months)
+        .annotate(
+            age_band=band,
+            gender=F('child__gender'),
+            province=Coalesce(F('child__parent__parent_details__province'), Value('')),
+            district=Coalesce(F('child__parent__parent_details__district'), Value('')),
+        )
+        .values(*COHORT_FIELDS)
+        .annotate(total=Count('pk'), **bit_sums)
+        .order_by()
+    )
+    stats = [
+        MChatItemStats(
+            **{name: row[name] for name in COHORT_FIELDS},
+            responses=row['total'],
+            **{f'yes{q}': row[f'bits{q}'] // scoring.question_bit(q) for q in QUESTIONS},
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        MChatItemStats.objects.all().delete()
+        MChatItemStats.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
+
+
+def item_report(filters, group_by):
+    """
+    Failure rate of each question per group, most often failed first.
+
+    filters narrows the cohorts ({field: value} over COHORT_FIELDS); group_by
+    is a list of COHORT_FIELDS to break the population down by.
+    """
+    sums = {f'y{q}': Coalesce(Sum(f'yes{q}'), 0, output_field=IntegerField()) for q in QUESTIONS}
+    stats = MChatItemStats.objects.filter(**filters)
+    totals = {'total': Coalesce(Sum('responses'), 0), **sums}
+    if group_by:
+        rows = stats.values(*group_by).annotate(**totals).order_by(*group_by)
+    else:
+        rows = [stats.aggregate(**totals)]
+    texts = {q: MChatResponse._meta.get_field(f'q{q}').help_text for q in QUESTIONS}
+
+    groups = []
+    for row in rows:
+        total = row['total']
+        if not total:
+            continue
+        items = []
+        for q in QUESTIONS:
+            yes = row[f'y{q}']
+            failed = yes if q in scoring.REVERSE_QUESTIONS else total - yes
+            items.append({'question': q, 'text': texts[q], 'failed': failed, 'rate': round(failed / total, 4)})
+        items.sort(key=lambda item: (-item['failed'], item['question']))
+        groups.append({**{name: row[name] for name in group_by}, 'responses': total, 'items': items})
+    return groups
@@ -0,0 +1,85 @@
+"""
+In-process broker for ChildAssessment state changes.
+
+Writes publish from the request thread (see signals.py); the doctor queue
+stream (therapy.views.DoctorQueueStreamView) subscribes from the ASGI event
+loop. Idle subscribers just await their queue, so an open dashboard costs no
+queries until something actually changes.
+
+The broker lives in one process. When running several ASGI workers, each
+worker only sees the writes it handled itself.
+"""
+
+import asyncio
+import json
+import threading
+
+# Events buffered per subscriber before new ones are dropped (slow client)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Dashboard refetches the full list when it reconnects
+            pass
+
+
+class AssessmentEventBroker:
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Must be called from the event loop that will consume the queue"""
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event):
+        """Thread-safe: may be called from sync views or worker threads"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Event loop already closed
+                self.unsubscribe(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+broker = AssessmentEventBroker()
+
+
+def assessment_event(assessment, created):
+    """Build the event payload for a saved ChildAssessment"""
+    return {
+        'type': 'assessment.created' if created else 'assessment.updated',
+        'assessment_id': assessment.id,
+        'child_id': assessment.child_id,
+        'status': assessment.status,
+        'assigned_doctor': assessment.assigned_doctor_id,
+        'submitted_at': assessment.submitted_at.isoformat() if assessment.submitted_at else None,
+        'reviewed_at': assessment.reviewed_at.isoformat() if assessment.reviewed_at else None,
+    }
+
+
+def format_sse(event):
+    """Encode an event as a Server-Sent Events message"""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
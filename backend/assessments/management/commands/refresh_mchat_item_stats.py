@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from assessments.analytics import rebuild_item_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the M-CHAT item counters from all responses (schedule nightly)'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        cohorts = rebuild_item_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt M-CHAT item statistics for {cohorts} cohorts in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,81 @@
+"""
+Recompute total_score and risk_level of every M-CHAT response.
+
+Run after changing the scoring rules in assessments/scoring.py (reverse
+questions or risk thresholds). Responses are read in primary-key chunks as
+(pk, answers_mask, total_score, risk_level) tuples, scored a chunk at a time
+with scoring.score_masks() and only the changed rows are written back.
+
+A score has exactly one risk level, so the changed rows of a chunk are
+written with one ``UPDATE ... WHERE id IN (...)`` per new score (at most 21)
+rather than bulk_update, whose per-row CASE takes minutes when most of
+300k rows change. Reports how many responses changed risk tier, and how.
+"""
+
+import time
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from assessments import scoring
+from assessments.models import MChatResponse
+
+
+def rescore_chunk(rows):
+    """{(total_score, risk_level): [pk, ...]} of the changed rows, and their tier moves"""
+    pks, masks, old_scores, old_levels = zip(*rows)
+    scores = scoring.score_masks(masks)
+    levels = scoring.risk_levels(scores)
+
+    changed, moves = defaultdict(list), Counter()
+    for pk, old_score, old_level, score, level in zip(pks, old_scores, old_levels, scores, levels):
+        score, level = int(score), str(level)
+        if score != old_score or level != old_level:
+            changed[score, level].append(pk)
+            if level != old_level:
+                moves[old_level, level] += 1
+    return changed, moves
+
+
+class Command(BaseCommand):
+    help = 'Rescore all M-CHAT responses with the current scoring rules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=20000, help='Responses scored per chunk')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Most ids per UPDATE statement')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without writing them')
+
+    def handle(self, *args, **options):
+        chunk_size, batch_size = options['chunk_size'], options['batch_size']
+        start = time.perf_counter()
+        rows = MChatResponse.objects.order_by('pk').values_list('pk', 'answers_mask', 'total_score', 'risk_level')
+
+        total = updated = 0
+        moves = Counter()
+        last_pk = 0
+        while True:
+            chunk = list(rows.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1][0]
+            total += len(chunk)
+
+            changed, chunk_moves = rescore_chunk(chunk)
+            moves.update(chunk_moves)
+            updated += sum(len(pks) for pks in changed.values())
+            if changed and not options['dry_run']:
+                with transaction.atomic():
+                    for (score, level), pks in changed.items():
+                        for i in range(0, len(pks), batch_size):
+                            MChatResponse.objects.filter(pk__in=pks[i:i + batch_size]).update(
+                                total_score=score, risk_level=level,
+                            )
+
+        elapsed = time.perf_counter() - start
+        verb = 'would change' if options['dry_run'] else 'changed'
+        self.stdout.write(f"Rescored {total} responses in {elapsed:.1f}s; {updated} {verb} score or risk level")
+        self.stdout.write(f"{sum(moves.values())} children {verb} risk tier")
+        for (old_level, new_level), count in sorted(moves.items()):
+            self.stdout.write(f"  {old_level:>6} -> {new_level:<6}{count:>10}")
+        self.stdout.write(self.style.SUCCESS('Done'))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:33
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+
+def backfill_answers_mask(apps, schema_editor):
+    """One UPDATE: answers_mask = sum of 2**(n-1) over the questions answered YES"""
+    MChatResponse = apps.get_model("assessments", "MChatResponse")
+    bits = [Case(When(**{f"q{n}": True}, then=Value(1 << (n - 1))), default=Value(0)) for n in range(1, 21)]
+    MChatResponse.objects.update(answers_mask=sum(bits[1:], bits[0]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assessments", "0002_alter_assessmentvideo_video_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mchatresponse",
+            name="answers_mask",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_answers_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0003_mchatresponse_answers_mask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MChatItemStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('age_band', models.CharField(max_length=10)),
+                ('gender', models.CharField(max_length=10)),
+                ('province', models.CharField(blank=True, max_length=20)),
+                ('district', models.CharField(blank=True, max_length=255)),
+                ('responses', models.IntegerField(default=0)),
+                ('yes1', models.IntegerField(default=0)),
+                ('yes2', models.IntegerField(default=0)),
+                ('yes3', models.IntegerField(default=0)),
+                ('yes4', models.IntegerField(default=0)),
+                ('yes5', models.IntegerField(default=0)),
+                ('yes6', models.IntegerField(default=0)),
+                ('yes7', models.IntegerField(default=0)),
+                ('yes8', models.IntegerField(default=0)),
+                ('yes9', models.IntegerField(default=0)),
+                ('yes10', models.IntegerField(default=0)),
+                ('yes11', models.IntegerField(default=0)),
+                ('yes12', models.IntegerField(default=0)),
+                ('yes13', models.IntegerField(default=0)),
+                ('yes14', models.IntegerField(default=0)),
+                ('yes15', models.IntegerField(default=0)),
+                ('yes16', models.IntegerField(default=0)),
+                ('yes17', models.IntegerField(default=0)),
+                ('yes18', models.IntegerField(default=0)),
+                ('yes19', models.IntegerField(default=0)),
+                ('yes20', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'M-CHAT Item Statistics',
+                'verbose_name_plural': 'M-CHAT Item Statistics',
+                'constraints': [models.UniqueConstraint(fields=('age_band', 'gender', 'province', 'district'), name='unique_mchat_cohort')],
+            },
+        ),
+    ]
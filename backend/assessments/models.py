@@ -1,6 +1,21 @@
 from django.db import models
+from django.db.models import DEFERRED
 from children.models import Child
 
+from . import scoring
+
+
+class MChatResponseQuerySet(models.QuerySet):
+    """Item-level filters on answers_mask, evaluated in SQL"""
+
+    def answered(self, q_num, yes=True):
+        bit = scoring.question_bit(q_num)
+        return self.alias(_answer=models.F('answers_mask').bitand(bit)).filter(_answer=bit if yes else 0)
+
+    def concerning(self, q_num):
+        """Responses whose answer to q_num counts towards the score"""
+        return self.answered(q_num, yes=q_num in scoring.REVERSE_QUESTIONS)
+
 
 class MChatResponse(models.Model):
     """
@@ -14,7 +29,7 @@ class MChatResponse(models.Model):
     ]
 
     # Reverse scored questions (YES = concerning)
-    REVERSE_QUESTIONS = [2, 5, 12]
+    REVERSE_QUESTIONS = list(scoring.REVERSE_QUESTIONS)
 
     child = models.OneToOneField(
         Child,
@@ -44,6 +59,9 @@ class MChatResponse(models.Model):
     q19 = models.BooleanField(help_text="Checks reactions")
     q20 = models.BooleanField(help_text="Likes movement activities")
 
+    # q1..q20 packed into one integer, bit n-1 = question n answered YES (see scoring.py)
+    answers_mask = models.PositiveIntegerField(default=0)
+
     # Calculated fields
     total_score = models.PositiveIntegerField(default=0)
     risk_level = models.CharField(max_length=10, choices=RISK_LEVEL_CHOICES, default='low')
@@ -52,13 +70,23 @@ class MChatResponse(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = MChatResponseQuerySet.as_manager()
+
     class Meta:
         verbose_name = "M-CHAT Response"
         verbose_name_plural = "M-CHAT Responses"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Answers already counted in MChatItemStats (signals.py); DEFERRED if
+        # answers_mask wasn't loaded, read back before the row is written
+        instance._counted_mask = instance.__dict__.get('answers_mask', DEFERRED)
+        return instance
+
     def calculate_score(self):
         """
-        Calculate M-CHAT score based on responses.
+        Calculate M-CHAT score based on responses (refreshes answers_mask).
 
         Scoring Rules:
         - Most questions: NO = 1 point (concerning), YES = 0 points
@@ -69,30 +97,12 @@ class MChatResponse(models.Model):
         - 3-7: Medium Risk
         - 8-20: High Risk
         """
-        score = 0
-
-        for q_num in range(1, 21):
-            answer = getattr(self, f'q{q_num}')
-
-            if q_num in self.REVERSE_QUESTIONS:
-                # YES = 1 point (concerning), NO = 0 points
-                if answer:
-                    score += 1
-            else:
-                # NO = 1 point (concerning), YES = 0 points
-                if not answer:
-                    score += 1
-
-        return score
+        self.answers_mask = scoring.pack_answers(self)
+        return scoring.score_mask(self.answers_mask)
 
     def get_risk_level(self, score):
         """Determine risk level from score"""
-        if score <= 2:
-            return 'low'
-        elif score <= 7:
-            return 'medium'
-        else:
-            return 'high'
+        return scoring.risk_level(score)
 
     def save(self, *args, **kwargs):
         # Auto-calculate score and risk level before saving
@@ -163,5 +173,62 @@ class ChildAssessment(models.Model):
     submitted_at = models.DateTimeField(null=True, blank=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
 
+    # What the regional summaries count an assessment by (reports/signals.py)
+    SUMMARIZED_FIELDS = ('status', 'submitted_at', 'reviewed_at')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._summarized = tuple(instance.__dict__.get(name, DEFERRED) for name in cls.SUMMARIZED_FIELDS)
+        return instance
+
     def __str__(self):
         return f"Assessment for {self.child.full_name} - {self.status}"
+
+
+class MChatItemStats(models.Model):
+    """
+    Population counters of M-CHAT answers, one row per cohort
+    (age band x gender x province x district). Kept current on every
+    MChatResponse save/delete and rebuilt nightly; see analytics.py.
+    """
+    age_band = models.CharField(max_length=10)
+    gender = models.CharField(max_length=10)
+    province = models.CharField(max_length=20, blank=True)
+    district = models.CharField(max_length=255, blank=True)
+
+    responses = models.IntegerField(default=0)
+
+    # YES answers per question; concerning counts follow from REVERSE_QUESTIONS
+    yes1 = models.IntegerField(default=0)
+    yes2 = models.IntegerField(default=0)
+    yes3 = models.IntegerField(default=0)
+    yes4 = models.IntegerField(default=0)
+    yes5 = models.IntegerField(default=0)
+    yes6 = models.IntegerField(default=0)
+    yes7 = models.IntegerField(default=0)
+    yes8 = models.IntegerField(default=0)
+    yes9 = models.IntegerField(default=0)
+    yes10 = models.IntegerField(default=0)
+    yes11 = models.IntegerField(default=0)
+    yes12 = models.IntegerField(default=0)
+    yes13 = models.IntegerField(default=0)
+    yes14 = models.IntegerField(default=0)
+    yes15 = models.IntegerField(default=0)
+    yes16 = models.IntegerField(default=0)
+    yes17 = models.IntegerField(default=0)
+    yes18 = models.IntegerField(default=0)
+    yes19 = models.IntegerField(default=0)
+    yes20 = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "M-CHAT Item Statistics"
+        verbose_name_plural = "M-CHAT Item Statistics"
+        constraints = [
+            models.UniqueConstraint(fields=['age_band', 'gender', 'province', 'district'], name='unique_mchat_cohort'),
+        ]
+
+    def __str__(self):
+        return f"{self.age_band} {self.gender} {self.district or '-'}, {self.province or '-'}: {self.responses}"
@@ -0,0 +1,84 @@
+"""
+Bit-packed M-CHAT scoring.
+
+The 20 answers of an MChatResponse are also stored as one integer,
+``answers_mask``: bit n-1 is set when question n was answered YES. A
+concerning answer is NO on a regular question and YES on a reverse-scored
+one, so
+
+    concerning bits = answers_mask ^ SCORING_MASK
+    score           = popcount(concerning bits)
+
+where SCORING_MASK has the bits of the regular questions set. Population
+queries can test single items in SQL on the mask. score_masks() and
+risk_levels() score whole cohorts at once, with NumPy when it is installed.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # optional: plain Python fallback below
+    np = None
+
+QUESTION_COUNT = 20
+ALL_QUESTIONS = (1 << QUESTION_COUNT) - 1
+
+# Reverse scored questions (YES = concerning)
+REVERSE_QUESTIONS = (2, 5, 12)
+
+# Upper score of each risk level; anything above the last one is 'high'
+RISK_THRESHOLDS = ((2, 'low'), (7, 'medium'))
+HIGHEST_RISK = 'high'
+
+
+def question_bit(q_num):
+    return 1 << (q_num - 1)
+
+
+REVERSE_MASK = sum(question_bit(q) for q in REVERSE_QUESTIONS)
+SCORING_MASK = ALL_QUESTIONS ^ REVERSE_MASK
+
+
+def pack_answers(answers):
+    """Mask from a mapping or object with q1..q20 (True = YES)"""
+    get = answers.get if isinstance(answers, dict) else lambda name: getattr(answers, name)
+    mask = 0
+    for q_num in range(1, QUESTION_COUNT + 1):
+        if get(f'q{q_num}'):
+            mask |= question_bit(q_num)
+    return mask
+
+
+def concerning_mask(mask):
+    return (mask ^ SCORING_MASK) & ALL_QUESTIONS
+
+
+def score_mask(mask):
+    return concerning_mask(mask).bit_count()
+
+
+def risk_level(score):
+    for upper, level in RISK_THRESHOLDS:
+        if score <= upper:
+            return level
+    return HIGHEST_RISK
+
+
+def score_masks(masks):
+    """Scores of a sequence of masks; a NumPy array if NumPy is installed, else a list"""
+    if np is None:
+        return [score_mask(mask) for mask in masks]
+    bits = (np.asarray(masks, dtype=np.uint32) ^ np.uint32(SCORING_MASK)) & np.uint32(ALL_QUESTIONS)
+    # SWAR popcount; works on NumPy versions without np.bitwise_count
+    bits = bits - ((bits >> 1) & np.uint32(0x55555555))
+    bits = (bits & np.uint32(0x33333333)) + ((bits >> 2) & np.uint32(0x33333333))
+    bits = (bits + (bits >> 4)) & np.uint32(0x0F0F0F0F)
+    return ((bits * np.uint32(0x01010101)) >> 24).astype(np.uint8)
+
+
+def risk_levels(scores):
+    """Risk level of each score; a NumPy array if NumPy is installed, else a list"""
+    if np is None:
+        return [risk_level(score) for score in scores]
+    upper = np.array([threshold for threshold, _ in RISK_THRESHOLDS])
+    names = np.array([level for _, level in RISK_THRESHOLDS] + [HIGHEST_RISK])
+    return names[np.searchsorted(upper, np.asarray(scores), side='left')]
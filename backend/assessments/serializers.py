@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from autisahara.fieldsets import SparseFieldsMixin
+from autisahara.performance import TimedSerializerMixin
 from .models import MChatResponse, AssessmentVideo, ChildAssessment
 
 
-class MChatResponseSerializer(serializers.ModelSerializer):
+class MChatResponseSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for M-CHAT questionnaire responses"""
 
     class Meta:
@@ -18,7 +20,7 @@ class MChatResponseSerializer(serializers.ModelSerializer):
         read_only_fields = ['total_score', 'risk_level', 'created_at', 'updated_at']
 
 
-class MChatResultSerializer(serializers.ModelSerializer):
+class MChatResultSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Read-only serializer for M-CHAT results (for doctors)"""
     child_name = serializers.CharField(source='child.full_name', read_only=True)
 
@@ -35,7 +37,7 @@ class MChatResultSerializer(serializers.ModelSerializer):
         ]
 
 
-class AssessmentVideoSerializer(serializers.ModelSerializer):
+class AssessmentVideoSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for assessment videos"""
     video_url = serializers.CharField()  # Accept any string (local path or URL)
 
@@ -45,7 +47,7 @@ class AssessmentVideoSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'uploaded_at']
 
 
-class ChildAssessmentSerializer(serializers.ModelSerializer):
+class ChildAssessmentSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for child assessment status"""
     doctor_name = serializers.CharField(source='assigned_doctor.user.full_name', read_only=True, allow_null=True)
 
@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models import DEFERRED
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .analytics import count_response
+from .events import assessment_event, broker
+from .models import ChildAssessment, MChatResponse
+
+
+@receiver(post_save, sender=ChildAssessment)
+def publish_assessment_change(sender, instance, created, **kwargs):
+    """Push assessment state changes to open doctor dashboards once the write is committed"""
+    event = assessment_event(instance, created)
+    transaction.on_commit(lambda: broker.publish(event))
+
+
+@receiver([pre_save, pre_delete], sender=MChatResponse)
+def load_counted_mask(sender, instance, raw=False, **kwargs):
+    """A response loaded without answers_mask (.only()/.defer()): read what the counters hold for it"""
+    if not raw and getattr(instance, '_counted_mask', None) is DEFERRED:
+        instance._counted_mask = (
+            MChatResponse.objects.filter(pk=instance.pk).values_list('answers_mask', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=MChatResponse)
+def count_mchat_answers(sender, instance, raw=False, **kwargs):
+    """Keep MChatItemStats in step with a new or changed screening"""
+    if raw:
+        return
+    count_response(instance.child_id, getattr(instance, '_counted_mask', None), instance.answers_mask)
+    instance._counted_mask = instance.answers_mask
+
+
+@receiver(post_delete, sender=MChatResponse)
+def uncount_mchat_answers(sender, instance, **kwargs):
+    count_response(instance.child_id, getattr(instance, '_counted_mask', None), None)
@@ -1,3 +1,148 @@
-from django.test import TestCase
+import random
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from autisahara.query_budget import EndpointBudget, QueryBudgetMixin, seed_dataset
+
+from . import analytics, scoring
+from .models import MChatItemStats, MChatResponse
+
+try:
+    import numpy
+except ImportError:  # optional: only the plain Python scoring is tested
+    numpy = None
+
+
+def child_id(d):
+    return {'pk': d.child.id}
+
+
+class AssessmentsQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budgets = [
+        EndpointBudget('child-mchat', kwargs=child_id, max_queries=2),
+        EndpointBudget('child-mchat', 'post', kwargs=child_id, status=201, max_queries=5,
+                       data=lambda d: {f'q{q}': True for q in range(1, 21)}),
+        EndpointBudget('child-videos', kwargs=child_id, max_queries=2),
+        EndpointBudget('child-videos', 'post', kwargs=child_id, status=201, max_queries=2, data=lambda d: {
+            'video_type': 'eating', 'video_url': 'https://videos.example.com/new',
+        }),
+        EndpointBudget('child-video-detail', 'delete', status=204, max_queries=3,
+                       kwargs=lambda d: {'pk': d.child.id, 'video_id': d.video.id}),
+        # +2: each save of the assessment drops the cached pending count (a DELETE on the shared cache)
+        # +1: a resubmission logs the week it leaves for the regional summaries
+        EndpointBudget('child-assessment-submit', 'post', kwargs=child_id, status=201, max_queries=10,
+                       data=lambda d: {'parent_confirmed': True}),
+        EndpointBudget('child-assessment-status', kwargs=child_id, max_queries=4),
+        EndpointBudget('mchat-item-analytics', role='doctor', max_queries=1),
+    ]
+
+
+def loop_score(answers):
+    """The original per-question scoring loop"""
+    return sum(answers[f'q{q}'] if q in scoring.REVERSE_QUESTIONS else not answers[f'q{q}'] for q in range(1, 21))
+
+
+class MChatScoringTests(SimpleTestCase):
+    def check_batch_scoring(self):
+        rnd = random.Random(7)
+        cohort = [{f'q{q}': rnd.random() < 0.5 for q in range(1, 21)} for _ in range(500)]
+        masks = [scoring.pack_answers(answers) for answers in cohort]
+        expected = [loop_score(answers) for answers in cohort]
+
+        self.assertEqual([scoring.score_mask(mask) for mask in masks], expected)
+        self.assertEqual(list(scoring.score_masks(masks)), expected)
+        self.assertEqual(list(scoring.risk_levels(range(21))),
+                         [MChatResponse().get_risk_level(score) for score in range(21)])
+        self.assertEqual(list(scoring.risk_levels([2, 3, 7, 8])), ['low', 'medium', 'medium', 'high'])
+
+    def test_packed_scoring_matches_question_loop(self):
+        with patch.object(scoring, 'np', None):
+            self.check_batch_scoring()
+
+    @skipUnless(numpy, 'numpy is not installed')
+    def test_numpy_scoring_matches_question_loop(self):
+        with patch.object(scoring, 'np', numpy):
+            self.check_batch_scoring()
+
+
+class MChatMaskQueryTests(TestCase):
+    def test_item_filters_use_the_mask(self):
+        d = seed_dataset(1)
+        response = d.child.mchat
+        self.assertEqual(response.answers_mask, scoring.pack_answers(response))
+
+        for q_num in (1, 2, 3):
+            expected = [r.pk for r in MChatResponse.objects.all() if getattr(r, f'q{q_num}')]
+            self.assertEqual(list(MChatResponse.objects.answered(q_num).values_list('pk', flat=True)), expected)
+        reverse_yes = MChatResponse.objects.filter(q2=True).count()
+        self.assertEqual(MChatResponse.objects.concerning(2).count(), reverse_yes)
+
+
+class RescoreMChatCommandTests(TestCase):
+    def test_rescore_fixes_stale_scores_and_reports_tier_changes(self):
+        seed_dataset(1)
+        expected = {r.pk: (r.total_score, r.risk_level) for r in MChatResponse.objects.all()}
+        stale = MChatResponse.objects.exclude(risk_level='high')
+        moved = stale.count()
+        stale.update(total_score=20, risk_level='high')
+
+        out = StringIO()
+        call_command('rescore_mchat', chunk_size=2, stdout=out)
+        self.assertEqual({r.pk: (r.total_score, r.risk_level) for r in MChatResponse.objects.all()}, expected)
+        self.assertIn(f'{moved} children changed risk tier', out.getvalue())
+
+
+def counter_rows():
+    return sorted(MChatItemStats.objects.filter(responses__gt=0).values_list(
+        *analytics.COHORT_FIELDS, 'responses', *[f'yes{q}' for q in range(1, 21)]))
+
+
+class MChatItemAnalyticsTests(TestCase):
+    def setUp(self):
+        self.data = seed_dataset(1)
+        self.client = APIClient()
+
+    def test_counters_follow_writes_and_match_rebuild(self):
+        self.client.force_authenticate(self.data.parent)
+        answers = {f'q{q}': q % 2 == 0 for q in range(1, 21)}
+        response = self.client.post(f'/api/children/{self.data.child.id}/mchat/', answers, format='json')
+        self.assertEqual(response.status_code, 201)
+        MChatResponse.objects.get(child=self.data.pending_child).delete()
+        incremental = counter_rows()
+
+        analytics.rebuild_item_stats()
+        self.assertEqual(counter_rows(), incremental)
+
+    def test_saving_a_deferred_response_counts_it_once(self):
+        before = counter_rows()
+        response = MChatResponse.objects.only('id', 'child').get(child=self.data.child)
+        response.save()
+        self.assertEqual(counter_rows(), before)
+
+        response = MChatResponse.objects.defer('answers_mask').get(child=self.data.child)
+        response.q1 = not response.q1
+        response.save()
+        response = MChatResponse.objects.defer('answers_mask').get(child=self.data.child)
+        response.delete()
+        incremental = counter_rows()
+        analytics.rebuild_item_stats()
+        self.assertEqual(counter_rows(), incremental)
+
+    def test_item_report_by_gender(self):
+        self.client.force_authenticate(self.data.doctor_user)
+        response = self.client.get('/api/children/analytics/mchat-items/?group_by=gender&province=bagmati')
+        self.assertEqual(response.status_code, 200)
+        [group] = response.data['groups']
+        self.assertEqual((group['gender'], group['responses']), ('male', 1))
+        failed = {item['question']: item['failed'] for item in group['items']}
+        # seed_dataset answers YES to every question not divisible by 3
+        self.assertEqual(failed, {q: int((q % 3 != 0) == (q in scoring.REVERSE_QUESTIONS)) for q in range(1, 21)})
+
+        self.assertEqual(self.client.get('/api/children/analytics/mchat-items/?group_by=name').status_code, 400)
+        self.client.force_authenticate(self.data.parent)
+        self.assertEqual(self.client.get('/api/children/analytics/mchat-items/').status_code, 403)
@@ -5,6 +5,7 @@ from .views import (
     AssessmentVideoDetailView,
     AssessmentSubmitView,
     AssessmentStatusView,
+    MChatItemAnalyticsView,
 )
 
 urlpatterns = [
@@ -18,4 +19,7 @@ urlpatterns = [
     # Assessment Submission
     path('<int:pk>/assessment/submit/', AssessmentSubmitView.as_view(), name='child-assessment-submit'),
     path('<int:pk>/assessment/status/', AssessmentStatusView.as_view(), name='child-assessment-status'),
+
+    # Population analytics
+    path('analytics/mchat-items/', MChatItemAnalyticsView.as_view(), name='mchat-item-analytics'),
 ]
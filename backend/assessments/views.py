@@ -5,10 +5,15 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from datetime import date, timedelta
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from autisahara.docs import openapi, swagger_auto_schema
 
+from autisahara.batch import cached_object_or_404
+from autisahara.fieldsets import sparse_queryset
+from autisahara.idempotency import idempotent
+
+from accounts.models import ParentDetails
 from children.models import Child
+from .analytics import AGE_BAND_LABELS, COHORT_FIELDS, item_report
 from .models import MChatResponse, AssessmentVideo, ChildAssessment
 from .serializers import (
     MChatResponseSerializer,
@@ -51,7 +56,7 @@ class MChatView(APIView):
         child = self.get_child(pk, request.user)
         try:
             mchat = child.mchat
-            return Response(MChatResultSerializer(mchat).data)
+            return Response(MChatResultSerializer(mchat, context={'request': request}).data)
         except MChatResponse.DoesNotExist:
             return Response({'detail': 'M-CHAT not submitted yet'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -162,8 +167,8 @@ class AssessmentVideoListView(APIView):
     )
     def get(self, request, pk):
         child = self.get_child(pk, request.user)
-        videos = child.videos.all()
-        serializer = AssessmentVideoSerializer(videos, many=True)
+        videos = sparse_queryset(child.videos.all(), AssessmentVideoSerializer, request)
+        serializer = AssessmentVideoSerializer(videos, many=True, context={'request': request})
         return Response(serializer.data)
 
     @swagger_auto_schema(
@@ -189,6 +194,7 @@ class AssessmentVideoListView(APIView):
         },
         tags=["Assessment Videos"]
     )
+    @idempotent
     def post(self, request, pk):
         child = self.get_child(pk, request.user)
         serializer = AssessmentVideoSerializer(data=request.data)
@@ -254,6 +260,7 @@ class AssessmentSubmitView(APIView):
         },
         tags=["Assessment Submission"]
     )
+    @idempotent
     def post(self, request, pk):
         child = self.get_child(pk, request.user)
         serializer = AssessmentSubmitSerializer(data=request.data)
@@ -300,7 +307,7 @@ class AssessmentStatusView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get_child(self, pk, user):
-        return get_object_or_404(Child, pk=pk, parent=user)
+        return cached_object_or_404(Child, pk, parent=user)
 
     @swagger_auto_schema(
         operation_summary="Get assessment status",
@@ -323,6 +330,68 @@ class AssessmentStatusView(APIView):
         child = self.get_child(pk, request.user)
         try:
             assessment = child.assessment
-            return Response(ChildAssessmentSerializer(assessment).data)
+            return Response(ChildAssessmentSerializer(assessment, context={'request': request}).data)
         except ChildAssessment.DoesNotExist:
             return Response({'detail': 'Assessment not submitted yet'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class MChatItemAnalyticsView(APIView):
+    """
+    Population statistics of the 20 M-CHAT items (doctors and admins).
+    Served from the MChatItemStats counters, not by scanning responses.
+    """
+    permission_classes = [IsAuthenticated]
+
+    CHOICES = {
+        'age_band': AGE_BAND_LABELS,
+        'gender': [value for value, _ in Child.GENDER_CHOICES],
+        'province': [value for value, _ in ParentDetails.PROVINCE_CHOICES],
+    }
+
+    @swagger_auto_schema(
+        operation_summary="M-CHAT item failure rates",
+        operation_description="""
+        How often each M-CHAT item is failed (answered in the concerning
+        direction), most often failed first.
+
+        **Filters**: `age_band` (<16m, 16-20m, 21-25m, 26-30m, >30m; age at
+        registration), `gender`, `province`, `district`.
+
+        **Breakdown**: `group_by`, comma-separated from age_band, gender,
+        province, district. Without it the whole population is one group.
+        """,
+        manual_parameters=[
+            openapi.Parameter('group_by', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('age_band', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('gender', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('province', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('district', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={200: "Groups with per-item failure counts and rates", 403: "Doctors and admins only"},
+        tags=["M-CHAT Screening"]
+    )
+    def get(self, request):
+        if request.user.role not in ('doctor', 'admin'):
+            return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        group_by = [name for name in request.query_params.get('group_by', '').split(',') if name]
+        unknown = set(group_by) - set(COHORT_FIELDS)
+        if unknown:
+            return Response({'error': f"Cannot group by {', '.join(sorted(unknown))}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {}
+        for name in COHORT_FIELDS:
+            value = request.query_params.get(name)
+            if value is None:
+                continue
+            if name in self.CHOICES and value not in self.CHOICES[name]:
+                return Response({'error': f'Invalid {name}'}, status=status.HTTP_400_BAD_REQUEST)
+            filters[name] = value
+
+        groups = item_report(filters, group_by)
+        return Response({
+            'responses': sum(group['responses'] for group in groups),
+            'group_by': group_by,
+            'groups': groups,
+        })
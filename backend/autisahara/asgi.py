@@ -3,6 +3,10 @@ ASGI config for autisahara project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run it with an ASGI server, e.g. ``uvicorn autisahara.asgi:application``, so
+long-lived streams such as therapy/doctor/pending/stream/ are served as
+coroutines instead of holding a worker thread each.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,81 @@
+"""
+Async counterpart of DRF's APIView for hot read endpoints.
+
+DRF views are synchronous, so under ASGI each request still holds a thread
+for its whole lifetime. AsyncAPIView keeps the parts of APIView the read
+endpoints rely on (JWT auth, DRF-style 401/404 bodies, JSON renderer output)
+on top of a plain async Django view, so handlers can use the async ORM.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .renderers import json_dumps
+from .stream_tickets import redeem_stream_ticket
+from .streaming import StreamingJSONResponse, materialized
+
+
+class AsyncAPIView(View):
+    # EventSource cannot send headers; streams may accept ?ticket=<stream ticket> instead
+    allow_stream_ticket = False
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await sync_to_async(self.authenticate)(request)
+        if user is None:
+            response = self.respond(
+                {'detail': 'Authentication credentials were not provided.'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+            response['WWW-Authenticate'] = 'Bearer realm="api"'
+            return response
+        request.user = user
+
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except Http404 as exc:
+            return self.respond({'detail': str(exc) or 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    def authenticate(self, request):
+        if getattr(request, '_force_auth_user', None) is not None:
+            return request._force_auth_user  # a sub-request of an authenticated batch (batch.py)
+        if self.allow_stream_ticket and 'ticket' in request.GET:
+            return redeem_stream_ticket(request.GET['ticket'])
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except (InvalidToken, AuthenticationFailed):
+            return None
+        return result[0] if result else None
+
+    def respond(self, data, status=status.HTTP_200_OK):
+        """Render like rest_framework.response.Response (JSON, or a binary format the client asked for)"""
+        renderer = self.binary_renderer()
+        if renderer is not None:
+            return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+        return HttpResponse(json_dumps(data), status=status, content_type='application/json')
+
+    async def stream(self, data, status=status.HTTP_200_OK):
+        """Like streaming.streamed_response(): data's iterators streamed to JSON clients, read whole otherwise"""
+        if self.binary_renderer() is None:
+            return StreamingJSONResponse(data, status=status, asynchronous=isinstance(self.request, ASGIRequest))
+        # The iterators read from sync querysets
+        return self.respond(await sync_to_async(materialized)(data), status=status)
+
+    def binary_renderer(self):
+        """The MessagePack/CBOR renderer the Accept header prefers over JSON, if any"""
+        renderers = [renderer() for renderer in api_settings.DEFAULT_RENDERER_CLASSES if renderer.format != 'api']
+        if all(renderer.render_style != 'binary' for renderer in renderers):
+            return None
+        try:
+            renderer, _ = DefaultContentNegotiation().select_renderer(Request(self.request), renderers)
+        except NotAcceptable:
+            return None
+        return renderer if renderer.render_style == 'binary' else None
@@ -0,0 +1,129 @@
+"""
+Composite batch requests: several GET endpoints in one round trip.
+
+    POST /api/batch/
+    {"requests": [{"url": "/api/auth/me/"}, {"url": "/api/children/"},
+                  {"url": "/api/therapy/child/7/today/"}]}
+
+    {"responses": [{"status": 200, "body": {...}}, ...]}
+
+The app's launch sequence is five dependent-looking but independent GETs;
+over a mobile link each one costs a full round trip. run_batch() resolves
+every URL and calls its view in-process, in order, with:
+
+- shared authentication: the batch request's user is handed to each view
+  (as DRF's forced authentication), so the token is checked and the user
+  loaded once;
+- a shared per-request cache: views fetch the objects several launch
+  endpoints need through cached_object_or_404(), which loads each object
+  once per batch. Outside a batch it is a plain get_object_or_404().
+
+Only GET is allowed, so sub-requests can't see each other's writes and the
+cache can't go stale. Sub-requests skip the middleware stack (timing,
+CORS) that the batch request itself already went through.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.http import Http404, HttpRequest, QueryDict
+from django.shortcuts import get_object_or_404
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from .renderers import json_loads
+
+# Sub-requests per batch
+BATCH_MAX_REQUESTS = 20
+
+# Headers of the batch request that don't describe its sub-requests
+_REQUEST_ONLY_META = {'CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_IDEMPOTENCY_KEY', 'wsgi.input'}
+
+_cache = ContextVar('batch_cache', default=None)
+
+
+def cached_object_or_404(model, pk, **filters):
+    """
+    get_object_or_404(model, pk=pk, **filters), loaded once per batch.
+    filters must be plain field equalities (parent=request.user).
+    """
+    cache = _cache.get()
+    if cache is None:
+        return get_object_or_404(model, pk=pk, **filters)
+
+    # '7' (a query string) and 7 (a URL converter) are the same object
+    key = (model, model._meta.pk.to_python(pk))
+    if key not in cache:
+        cache[key] = model._default_manager.filter(pk=pk).first()
+    obj = cache[key]
+    if obj is None or any(
+        getattr(obj, model._meta.get_field(name).attname) != getattr(value, 'pk', value)
+        for name, value in filters.items()
+    ):
+        raise Http404(f'No {model._meta.object_name} matches the given query.')
+    return obj
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET'], default='GET')
+    url = serializers.CharField()
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False, max_length=BATCH_MAX_REQUESTS)
+
+
+def run_batch(request, sub_requests):
+    """[{'status', 'body'}] for each validated sub-request, run as request.user"""
+    token = _cache.set({})
+    try:
+        return [_run(request, sub['url']) for sub in sub_requests]
+    finally:
+        _cache.reset(token)
+
+
+def _run(request, url):
+    parts = urlsplit(url)
+    try:
+        match = resolve(parts.path)
+    except Resolver404:
+        return {'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Not found.'}}
+    if match.url_name == 'batch':
+        return {'status': status.HTTP_400_BAD_REQUEST, 'body': {'error': 'Batches can not be nested'}}
+
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = parts.path
+    sub.META = {key: value for key, value in request.META.items() if key not in _REQUEST_ONLY_META}
+    # Sub-responses are embedded as data; the batch response as a whole is content-negotiated
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=parts.path, QUERY_STRING=parts.query, HTTP_ACCEPT='application/json')
+    sub.GET = QueryDict(parts.query)
+    sub.COOKIES = request.COOKIES
+    sub.resolver_match = match
+    sub.user = request.user
+    # Picked up by DRF's Request (and AsyncAPIView) instead of re-authenticating
+    sub._force_auth_user, sub._force_auth_token = request.user, request.auth
+
+    response = match.func(sub, *match.args, **match.kwargs)
+    if asyncio.iscoroutine(response):
+        response = async_to_sync(_await)(response)
+    return {'status': response.status_code, 'body': _body(response)}
+
+
+async def _await(coroutine):
+    return await coroutine
+
+
+def _body(response):
+    if isinstance(response, Response):
+        return response.data
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+    if not content:
+        return None
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json_loads(content)
+    return content.decode(response.charset)
+
@@ -0,0 +1,64 @@
+"""
+Compact schema for the binary (MessagePack/CBOR) response formats.
+
+The mobile app mostly re-downloads the same few enum strings (task,
+curriculum and assessment statuses, M-CHAT risk levels, spectrum types).
+In the binary formats the values of the fields below are sent as small
+integers, their index in the field's code table; the app fetches the
+tables once from /api/compact-codes/. Values not in a table (free text,
+display labels) are sent unchanged.
+
+Values JSON has no type for (datetimes, dates, Decimals, UUIDs, lazy
+strings) are converted exactly as the JSON renderer converts them, so the
+two formats carry the same data.
+
+Codes are part of the wire format: only ever append to a table.
+"""
+
+from rest_framework.utils import encoders
+
+# ChildAssessment, ChildCurriculum and DailyProgress statuses
+STATUS_CODES = [
+    'pending', 'in_review', 'accepted', 'completed',
+    'active', 'paused',
+    'not_done', 'done_with_help', 'done_without_help',
+]
+RISK_LEVEL_CODES = ['low', 'medium', 'high']
+SPECTRUM_CODES = ['none', 'mild', 'moderate', 'severe']
+
+CODE_TABLES = {
+    'status': STATUS_CODES,
+    'risk_level': RISK_LEVEL_CODES,
+    'spectrum_type': SPECTRUM_CODES,
+}
+
+# Response keys holding a coded value, and their table
+CODED_FIELDS = {
+    'status': 'status',
+    'curriculum_status': 'status',
+    'risk_level': 'risk_level',
+    'mchat_risk': 'risk_level',
+    'spectrum_type': 'spectrum_type',
+}
+
+_codes = {key: {value: code for code, value in enumerate(CODE_TABLES[table])} for key, table in CODED_FIELDS.items()}
+_default = encoders.JSONEncoder().default
+_native = (str, int, float, bool, type(None), bytes)
+
+
+def compact(data):
+    """data with coded fields replaced by their codes and non-JSON types converted"""
+    if isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            codes = _codes.get(key)
+            if codes is not None and isinstance(value, str) and value in codes:
+                result[key] = codes[value]
+            else:
+                result[key] = compact(value)
+        return result
+    if isinstance(data, (list, tuple)):
+        return [compact(item) for item in data]
+    if isinstance(data, _native):
+        return data
+    return compact(_default(data))
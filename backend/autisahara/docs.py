@@ -0,0 +1,103 @@
+"""
+swagger_auto_schema and openapi for the view modules, with a lazy mode.
+
+Views import both from here instead of drf_yasg. By default they are
+drf_yasg's own. With settings.LAZY_API_DOCS on, nothing from drf_yasg is
+imported at startup: ``openapi.X(...)`` only records the call, and
+``@swagger_auto_schema(...)`` only remembers the view method. materialize()
+builds the real objects and applies the real decorator; autisahara.schema
+calls it before generating the schema, so the documentation is the same in
+both modes. Worker processes that never serve /swagger.json never pay for
+drf_yasg (see benchmarks/bench_startup.py).
+"""
+
+import threading
+
+from django.conf import settings
+
+LAZY = getattr(settings, 'LAZY_API_DOCS', False)
+
+
+class Deferred:
+    """A recorded ``openapi.<name>`` attribute or call"""
+
+    def __init__(self, name, args=(), kwargs=None, called=False):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.called = called
+
+    def __call__(self, *args, **kwargs):
+        return Deferred(self.name, args, kwargs, called=True)
+
+    def build(self):
+        from drf_yasg import openapi as real_openapi
+
+        value = getattr(real_openapi, self.name)
+        if self.called:
+            value = value(*resolve(self.args), **resolve(self.kwargs))
+        return value
+
+
+class LazyOpenapi:
+    """Stands in for the drf_yasg.openapi module"""
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Deferred(name)
+
+
+def resolve(value):
+    """Replace Deferred objects, also inside containers, with the real drf_yasg objects"""
+    if isinstance(value, Deferred):
+        return value.build()
+    if isinstance(value, dict):
+        return {key: resolve(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(resolve(item) for item in value)
+    return value
+
+
+_pending = []
+_lock = threading.Lock()
+
+
+def lazy_swagger_auto_schema(**kwargs):
+    def decorator(view_method):
+        _pending.append((view_method, kwargs))
+        return view_method
+    return decorator
+
+
+def materialize():
+    """Apply the recorded swagger_auto_schema decorators (no-op outside lazy mode)"""
+    if not _pending:
+        return
+    from drf_yasg.utils import swagger_auto_schema as real_swagger_auto_schema
+
+    with _lock:
+        for view_method, kwargs in _pending:
+            # Sets attributes on view_method in place, as it did at import in eager mode
+            real_swagger_auto_schema(**resolve(kwargs))(view_method)
+        _pending.clear()
+
+
+if LAZY:
+    openapi = LazyOpenapi()
+    swagger_auto_schema = lazy_swagger_auto_schema
+else:
+    from drf_yasg import openapi  # noqa: F401
+    from drf_yasg.utils import swagger_auto_schema  # noqa: F401
+
+
+def lazy_view(factory):
+    """A view that imports (via factory) the real view on its first request"""
+    view = None
+
+    def view_func(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = factory()
+        return view(request, *args, **kwargs)
+    return view_func
@@ -0,0 +1,206 @@
+"""
+Sparse fieldsets: ``?fields=`` and ``?omit=`` on GET requests.
+
+    ?fields=id,title,tasks.id,tasks.title    only these (dots reach into nested serializers)
+    ?omit=tasks.instructions,tasks.why_description    everything but these
+
+Serializers opt in with SparseFieldsMixin; the selection is read from the
+request in the serializer context, so views must pass
+``context={'request': request}`` (generic views already do). Unknown names
+are ignored.
+
+sparse_queryset() trims the SQL to match: it loads only the columns the
+remaining fields read (``only()``), joins (select_related) the forward and
+one-to-one relations they traverse and prefetches the nested lists, with
+the same trimming applied to those. Columns behind a SerializerMethodField
+or a method source can't be inferred; list them in the serializer's
+``Meta.sparse_sources`` ({field: [ORM paths]}), otherwise that model's
+columns are all loaded.
+
+sparse_data() applies a selection to a payload built by hand.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _parse(value):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}"""
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class FieldSelection:
+    """Fields kept at one level of a response; `fields`/`omit` are trees from _parse"""
+
+    def __init__(self, fields=None, omit=None):
+        self.fields = fields
+        self.omit = omit or {}
+
+    @classmethod
+    def from_request(cls, request):
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        params = getattr(request, 'query_params', request.GET)
+        fields, omit = params.get('fields'), params.get('omit')
+        if not fields and not omit:
+            return None
+        return cls(_parse(fields) if fields else None, _parse(omit) if omit else None)
+
+    def keeps(self, name):
+        if self.fields is not None and name not in self.fields:
+            return False
+        return self.omit.get(name) != {}
+
+    def nested(self, name):
+        """Selection inside field `name`, or None for all of it"""
+        fields = self.fields.get(name) if self.fields is not None else None
+        omit = self.omit.get(name)
+        return FieldSelection(fields or None, omit) if fields or omit else None
+
+
+class SparseFieldsMixin:
+    """Drops the fields ?fields=/?omit= leave out (read requests only)"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.field_selection()
+        if selection is None:
+            return fields
+        for name in list(fields):
+            if not selection.keeps(name):
+                del fields[name]
+                continue
+            nested = getattr(fields[name], 'child', fields[name])
+            if isinstance(nested, SparseFieldsMixin):
+                nested._field_selection = selection.nested(name)
+        return fields
+
+    def field_selection(self):
+        if hasattr(self, '_field_selection'):
+            return self._field_selection
+        root = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+        if root.parent is not None:
+            return None  # nested in a serializer without sparse fields
+        return FieldSelection.from_request(self.context.get('request'))
+
+
+def sparse_data(data, selection):
+    """Hand-built payload (dicts and lists) cut down to selection"""
+    if selection is None:
+        return data
+    if isinstance(data, list):
+        return [sparse_data(item, selection) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {
+        name: sparse_data(value, selection.nested(name))
+        for name, value in data.items() if selection.keeps(name)
+    }
+
+
+# ============== SQL TRIMMING ==============
+
+def _all_columns(model, prefix):
+    return {prefix + field.name for field in model._meta.concrete_fields}
+
+
+def _add_path(model, path, prefix, columns, joins):
+    """Record the column and joins an ORM path needs; False if it isn't a plain field path"""
+    parts = path.split('__')
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return False
+        last = index == len(parts) - 1
+        if field.is_relation and (field.many_to_many or field.one_to_many):
+            return False
+        if not field.concrete and last:
+            return False  # reverse one-to-one object
+        if field.is_relation and not last:
+            joined = prefix + '__'.join(parts[:index + 1])
+            joins.add(joined)
+            if field.concrete:
+                columns.add(joined)  # the foreign key itself can't be deferred
+            model = field.related_model
+    columns.add(prefix + path)
+    return True
+
+
+def _plan(serializer, model, prefix=''):
+    """(columns, select_related paths, Prefetch list) for rendering serializer over model"""
+    columns, joins, prefetches = set(), set(), []
+    complete = True
+    declared = getattr(getattr(serializer, 'Meta', None), 'sparse_sources', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in declared:
+            for path in declared[name]:
+                complete &= _add_path(model, path, prefix, columns, joins)
+            continue
+        nested = getattr(field, 'child', field)
+        if isinstance(nested, serializers.BaseSerializer) and field.source != '*':
+            try:
+                relation = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                complete = False
+                continue
+            if relation.one_to_many or relation.many_to_many:
+                prefetches.append(_prefetch(nested, relation, prefix + field.source))
+            else:
+                joins.add(prefix + field.source)
+                if relation.concrete:
+                    columns.add(prefix + field.source)
+                nested_columns, nested_joins, nested_prefetches = _plan(
+                    nested, relation.related_model, f'{prefix}{field.source}__'
+                )
+                columns |= nested_columns
+                joins |= nested_joins
+                prefetches += nested_prefetches
+        elif isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+            complete = False
+        else:
+            complete &= _add_path(model, field.source.replace('.', '__'), prefix, columns, joins)
+
+    if not complete:
+        columns |= _all_columns(model, prefix)
+    return columns, joins, prefetches
+
+
+def _prefetch(serializer, relation, lookup):
+    related = relation.related_model
+    columns, joins, prefetches = _plan(serializer, related)
+    if relation.one_to_many:
+        columns.add(relation.field.name)  # matches prefetched rows to their parent
+    return Prefetch(lookup, queryset=_trimmed(related._default_manager.all(), columns, joins, prefetches))
+
+
+def _trimmed(queryset, columns, joins, prefetches):
+    if joins:  # select_related() without arguments would follow every foreign key
+        queryset = queryset.select_related(*joins)
+    return queryset.prefetch_related(*prefetches).only(*columns)
+
+
+def sparse_queryset(queryset, serializer_class, request):
+    """
+    queryset loading just what serializer_class renders for this request's
+    ?fields=/?omit= (unchanged without them). Its select_related and
+    prefetch_related are replaced by the ones the selected fields need.
+    """
+    serializer = serializer_class(context={'request': request})
+    if serializer.field_selection() is None:
+        return queryset
+    columns, joins, prefetches = _plan(serializer, queryset.model)
+    # A related manager's queryset (child.videos.all()) reads its foreign key on every row
+    columns |= {field.name for field in queryset._known_related_objects}
+    return _trimmed(queryset.select_related(None).prefetch_related(None), columns, joins, prefetches)
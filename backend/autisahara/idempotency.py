@@ -0,0 +1,126 @@
+"""
+Idempotency-Key support for mobile write endpoints.
+
+Parents on flaky networks retry POSTs. When a request carries an
+``Idempotency-Key`` header, the first successful response is stored in the
+``idempotency`` cache and replayed for any retry with the same key, so the
+handler (validation + writes) runs only once.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import UploadedFile
+from django.http import QueryDict
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+REPLAY_HEADER = 'Idempotent-Replayed'
+
+
+def _cache():
+    return caches['idempotency']
+
+
+def _cache_key(request, key):
+    raw = f"{request.user.pk}:{request.method}:{request.path}:{key}"
+    return 'idem:' + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _file_fingerprint(value):
+    # json.dumps default: uploads are compared by content, not by file name
+    if isinstance(value, UploadedFile):
+        digest = hashlib.sha256()
+        for chunk in value.chunks():
+            digest.update(chunk)
+        value.seek(0)  # the handler reads it again
+        return {'name': value.name, 'size': value.size, 'sha256': digest.hexdigest()}
+    return str(value)
+
+
+def _fingerprint(request):
+    data = request.data
+    if isinstance(data, QueryDict):
+        data = dict(data.lists())  # form bodies: every value of repeated keys, uploads included
+    body = json.dumps(data, sort_keys=True, default=_file_fingerprint)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def idempotent(view_method):
+    """
+    Decorator for APIView write methods (post).
+
+    - No header: the handler runs as usual.
+    - First request with a key: the handler runs and a 2xx response is stored.
+    - Retry with the same key and body: the stored response is replayed.
+    - Retry while the first request is still running (or just failed): 409 Conflict.
+    - Same key with a different body: 422 Unprocessable Entity.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+
+        cache = _cache()
+        cache_key = _cache_key(request, key)
+        fingerprint = _fingerprint(request)
+
+        stored = cache.get(cache_key)
+        if stored is None and cache.add(
+            cache_key,
+            {'state': 'in_progress', 'fingerprint': fingerprint},
+            # Held until the first request finishes, however slow; a killed worker releases it here
+            timeout=settings.REQUEST_TIMEOUT,
+        ):
+            return _run_and_store(view_method, self, request, args, kwargs, cache_key, fingerprint)
+
+        # Lost the race to another worker that stored the key just now
+        if stored is None:
+            stored = cache.get(cache_key)
+        if stored is None:
+            # ...and released it again (its handler failed): the client retries later
+            return _still_processing()
+
+        if stored['fingerprint'] != fingerprint:
+            return Response(
+                {'error': 'Idempotency-Key was already used with a different request'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        if stored['state'] == 'in_progress':
+            return _still_processing()
+
+        return Response(stored['data'], status=stored['status'], headers={REPLAY_HEADER: 'true'})
+
+    return wrapper
+
+
+def _still_processing():
+    return Response(
+        {'error': 'A request with this Idempotency-Key is still being processed'},
+        status=status.HTTP_409_CONFLICT
+    )
+
+
+def _run_and_store(view_method, view, request, args, kwargs, cache_key, fingerprint):
+    cache = _cache()
+    stored = False
+    try:
+        response = view_method(view, request, *args, **kwargs)
+        # Only successes are replayed; errors release the key so a retry can run
+        if 200 <= response.status_code < 300 and isinstance(response, Response):
+            cache.set(cache_key, {
+                'state': 'done',
+                'fingerprint': fingerprint,
+                'status': response.status_code,
+                'data': response.data,
+            }, timeout=settings.IDEMPOTENCY_KEY_TTL)
+            stored = True
+        return response
+    finally:
+        if not stored:
+            cache.delete(cache_key)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from autisahara.schema import schema_version, write_schema
+
+
+class Command(BaseCommand):
+    help = 'Write the OpenAPI schema for the current code version (run at deploy time)'
+
+    def handle(self, *args, **options):
+        path = write_schema()
+        self.stdout.write(self.style.SUCCESS(f'Schema {schema_version()} written to {path}'))
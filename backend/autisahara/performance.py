@@ -0,0 +1,285 @@
+"""
+Per-request performance instrumentation.
+
+PerformanceTimingMiddleware records, for every API request:
+- SQL query count and time (via a database execute wrapper)
+- serializer time (serializers with TimedSerializerMixin, compiled plans)
+- total view time
+
+It adds them as a Server-Timing header, logs one JSON line to the
+``autisahara.performance`` logger (at WARNING for requests slower than
+PERFORMANCE_SLOW_REQUEST_MS, INFO otherwise), and keeps the most recent
+samples per endpoint for the admin-only stats endpoint
+(autisahara.views.PerformanceStatsView). Samples are kept per process.
+
+A streamed body (autisahara.streaming) runs its queries while the server
+reads it, after the middleware has returned. Its sample and log line are
+recorded when the stream ends and include that work; the Server-Timing
+header has to go out before the body, so it only covers the view.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('autisahara.performance')
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+
+# ============== SQL ==============
+
+def _record_query(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.sql_seconds += time.perf_counter() - start
+        timing.queries += 1
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    # Installed on every new connection so queries from sync_to_async
+    # threads (async views) are counted too; the ContextVar follows the request.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _wrap_open_connections():
+    """Cover connections this thread opened before the middleware was loaded"""
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrapper(None, connection)
+
+
+# ============== SERIALIZERS ==============
+
+class serializer_timer:
+    """
+    Adds the time spent in the with block to the current request's serializer
+    time. Used by TimedSerializerMixin and by renderers that bypass
+    serializers (autisahara.compiled). Only the outermost block is timed;
+    nested ones are part of it.
+    """
+    __slots__ = ('timing', 'start')
+
+    def __enter__(self):
+        self.timing = timing = _current.get()
+        if timing is not None:
+            timing.serializer_depth += 1
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        timing = self.timing
+        if timing is not None:
+            timing.serializer_depth -= 1
+            if timing.serializer_depth == 0:
+                timing.serializer_seconds += time.perf_counter() - self.start
+
+
+class TimedSerializerMixin:
+    """
+    Counts a serializer's output as serializer time. The app's response
+    serializers opt in; DRF's own classes are left alone. Timing
+    to_representation rather than .data covers many=True and nested uses.
+    """
+
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
+
+
+# ============== STREAMED BODIES ==============
+
+def _timed_chunks(chunks, timing, done):
+    """Iterate chunks with timing as the current request's, then call done()"""
+    try:
+        while True:
+            token = _current.set(timing)
+            try:
+                chunk = next(chunks, None)
+            finally:
+                _current.reset(token)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        done()
+
+
+async def _atimed_chunks(chunks, timing, done):
+    # Async counterpart of _timed_chunks; sync_to_async carries the context to the sync thread
+    try:
+        while True:
+            token = _current.set(timing)
+            try:
+                chunk = await anext(chunks, None)
+            finally:
+                _current.reset(token)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        done()
+
+
+# ============== AGGREGATES ==============
+
+class EndpointStats:
+    """Most recent samples per endpoint, bounded by PERFORMANCE_SAMPLES_PER_ENDPOINT"""
+
+    def __init__(self, max_samples):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=max_samples))
+        self._counts = defaultdict(int)
+
+    def record(self, endpoint, sample):
+        with self._lock:
+            self._samples[endpoint].append(sample)
+            self._counts[endpoint] += 1
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def summary(self):
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+            counts = dict(self._counts)
+
+        result = {}
+        for endpoint, samples in sorted(snapshot.items()):
+            result[endpoint] = {
+                'requests': counts[endpoint],
+                'samples': len(samples),
+                'errors': sum(1 for s in samples if s['status'] >= 500),
+                'total_ms': _distribution([s['total_ms'] for s in samples]),
+                'sql_ms': _distribution([s['sql_ms'] for s in samples]),
+                'serializer_ms': _distribution([s['serializer_ms'] for s in samples]),
+                'queries': _distribution([s['queries'] for s in samples]),
+            }
+        return result
+
+
+def _percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _distribution(values):
+    ordered = sorted(values)
+    return {
+        'mean': round(sum(ordered) / len(ordered), 2),
+        'p50': round(_percentile(ordered, 50), 2),
+        'p95': round(_percentile(ordered, 95), 2),
+        'p99': round(_percentile(ordered, 99), 2),
+        'max': round(ordered[-1], 2),
+    }
+
+
+endpoint_stats = EndpointStats(getattr(settings, 'PERFORMANCE_SAMPLES_PER_ENDPOINT', 1000))
+
+
+# ============== MIDDLEWARE ==============
+
+class PerformanceTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefixes = tuple(getattr(settings, 'PERFORMANCE_TIMING_PATHS', ['/api/']))
+        self.slow_ms = getattr(settings, 'PERFORMANCE_SLOW_REQUEST_MS', 500)
+        connection_created.connect(_install_query_wrapper, dispatch_uid='performance-query-wrapper')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith(self.prefixes):
+            return self.get_response(request)
+
+        _wrap_open_connections()
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, timing, start)
+        return response
+
+    async def __acall__(self, request):
+        if not request.path.startswith(self.prefixes):
+            return await self.get_response(request)
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, timing, start)
+        return response
+
+    def finish(self, request, response, timing, start):
+        sample = self.sample(response, timing, start)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={sample["sql_ms"]};desc="{timing.queries} queries"',
+            f'serializer;dur={sample["serializer_ms"]}',
+            f'total;dur={sample["total_ms"]}',
+        ])
+
+        if not response.streaming:
+            self.record(request, sample)
+            return
+
+        def done():
+            self.record(request, self.sample(response, timing, start))
+
+        # Count the body's queries and time into this request, recorded once it is read
+        if response.is_async:
+            response.streaming_content = _atimed_chunks(aiter(response.streaming_content), timing, done)
+        else:
+            response.streaming_content = _timed_chunks(iter(response.streaming_content), timing, done)
+
+    def sample(self, response, timing, start):
+        return {
+            'queries': timing.queries,
+            'sql_ms': round(timing.sql_seconds * 1000, 2),
+            'serializer_ms': round(timing.serializer_seconds * 1000, 2),
+            'total_ms': round((time.perf_counter() - start) * 1000, 2),
+            'status': response.status_code,
+        }
+
+    def record(self, request, sample):
+        match = request.resolver_match
+        endpoint = f"{request.method} /{match.route}" if match else f"{request.method} <unresolved>"
+        endpoint_stats.record(endpoint, sample)
+
+        level = logging.WARNING if sample['total_ms'] > self.slow_ms else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps({'endpoint': endpoint, 'path': request.path, **sample}))
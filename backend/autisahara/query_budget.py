@@ -0,0 +1,278 @@
+"""
+Query-budget test harness for the API.
+
+Each app's tests.py declares an EndpointBudget per route: who calls it,
+the maximum number of SQL queries and the latency budget. QueryBudgetMixin
+seeds a realistic dataset, calls every declared endpoint as the right role and
+fails if a budget is exceeded. It also re-runs every endpoint against a
+dataset ten times larger and fails if the query count grows (an N+1), unless
+the budget says the endpoint is allowed to scale.
+
+autisahara/tests.py checks that every API route has a budget. Set
+QUERY_BUDGET_REPORT=1 to print the query count of every endpoint at 1x and
+10x data after each test case.
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User, Doctor, ParentDetails, Household
+from assessments.models import MChatResponse, AssessmentVideo, ChildAssessment
+from children.models import Child, ChildEducation, ChildHealth, MedicalHistory
+from therapy.models import (
+    Curriculum, CurriculumTask, ChildCurriculum, DailyProgress, DoctorReview, DiagnosisReport,
+)
+
+# Scale 1 sizes; the scaling check multiplies all of them by 10
+BASE_SIZES = {
+    'children': 2,          # children of the main parent
+    'pending': 3,           # other families waiting for a doctor
+    'accepted': 2,          # other families accepted by the doctor
+    'curricula': 2,         # extra curricula in the library
+    'tasks_per_day': 2,     # tasks per curriculum day
+    'progress_days': 3,     # days of submitted progress for the main child
+    'videos': 2,            # assessment videos of the main child
+    'reviews': 1,           # doctor reviews / diagnosis reports for the main child
+}
+
+SUBMITTED_AT = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+
+
+@dataclass
+class EndpointBudget:
+    url_name: str
+    method: str = 'get'
+    role: Optional[str] = 'parent'     # 'parent', 'doctor', 'admin' or None (anonymous)
+    max_queries: int = 10
+    max_ms: float = 250
+    status: int = 200
+    # Builds reverse() kwargs / request body from the seeded dataset
+    kwargs: Callable = field(default=lambda d: {})
+    data: Callable = field(default=lambda d: None)
+    # Query count may grow with the dataset (writes over seeded rows, etc.)
+    scales: bool = False
+
+    @property
+    def label(self):
+        return f"{self.method.upper()} {self.url_name}"
+
+
+def create_family(index, doctor=None, status='pending'):
+    parent = User.objects.create_user(
+        email=f'family{index}@example.com', password='secret123',
+        full_name=f'Parent {index}', phone='9841000000', role='parent',
+    )
+    child = Child.objects.create(
+        parent=parent, full_name=f'Child {index}', date_of_birth='2022-03-15',
+        age_years=2, age_months=index % 12, gender=['male', 'female'][index % 2],
+    )
+    MChatResponse.objects.create(child=child, **{f'q{q}': (q + index) % 5 != 0 for q in range(1, 21)})
+    ChildAssessment.objects.create(
+        child=child, status=status, assigned_doctor=doctor if status != 'pending' else None,
+        parent_confirmed=True, submitted_at=SUBMITTED_AT,
+    )
+    return parent, child
+
+
+def seed_dataset(scale=1):
+    """Create a doctor, a fully registered parent/child in active therapy, and other families"""
+    sizes = {name: value * scale for name, value in BASE_SIZES.items()}
+
+    admin = User.objects.create_superuser(email='admin@example.com', password='secret123', full_name='Admin')
+    doctor_user = User.objects.create_user(
+        email='doctor@example.com', password='secret123', full_name='Dr. Sita Thapa', role='doctor',
+    )
+    doctor = Doctor.objects.create(user=doctor_user, license_number='NMC-1', specialization='Child Psychiatry')
+
+    parent = User.objects.create_user(
+        email='parent@example.com', password='secret123', full_name='Ram Sharma', phone='9841234567', role='parent',
+    )
+    ParentDetails.objects.create(user=parent, mother_name='Gita', district='Kathmandu', province='bagmati')
+    Household.objects.create(user=parent, siblings_count=1)
+
+    children = []
+    for i in range(sizes['children']):
+        child = Child.objects.create(
+            parent=parent, full_name=f'Aarav {i}', date_of_birth='2022-03-15',
+            age_years=2, age_months=8, gender='male',
+        )
+        ChildEducation.objects.create(child=child, goes_to_school=True, school_name='ABC School')
+        ChildHealth.objects.create(child=child, height_cm='85.5', weight_kg='12.0')
+        MedicalHistory.objects.create(child=child, family_autism_history=i == 0)
+        children.append(child)
+    child = children[0]
+
+    MChatResponse.objects.create(child=child, **{f'q{q}': q % 3 != 0 for q in range(1, 21)})
+    AssessmentVideo.objects.bulk_create([
+        AssessmentVideo(child=child, video_type='walking', video_url=f'https://videos.example.com/{i}')
+        for i in range(sizes['videos'])
+    ])
+    ChildAssessment.objects.create(
+        child=child, assigned_doctor=doctor, status='accepted', parent_confirmed=True,
+        submitted_at=SUBMITTED_AT, reviewed_at=SUBMITTED_AT + timedelta(days=1),
+    )
+
+    assessment_curriculum = Curriculum.objects.create(
+        title='Pre-Assessment', description='Observation tasks', duration_days=7, type='assessment',
+    )
+    curriculum = Curriculum.objects.create(
+        title='45-Day Comprehensive Development', description='Social, communication and sensory skills',
+        duration_days=45, type='specialized', spectrum_type='moderate', created_by=doctor,
+    )
+    library = Curriculum.objects.bulk_create([
+        Curriculum(title=f'Library {i}', description='General', duration_days=7, created_by=doctor)
+        for i in range(sizes['curricula'])
+    ])
+    tasks = CurriculumTask.objects.bulk_create([
+        CurriculumTask(
+            curriculum=c, day_number=day, title=f'Day {day} task {i}', order_index=i,
+            why_description='Builds joint attention. ' * 5, instructions='Sit facing your child. ' * 10,
+        )
+        for c in (assessment_curriculum, curriculum, *library)
+        for day in range(1, c.duration_days + 1)
+        for i in range(sizes['tasks_per_day'])
+    ])
+
+    days = sizes['progress_days']
+    start = date.today() - timedelta(days=days)
+    child_curriculum = ChildCurriculum.objects.create(
+        child=child, curriculum=curriculum, assigned_by=doctor, start_date=start,
+        end_date=start + timedelta(days=curriculum.duration_days), current_day=min(days + 1, 45),
+    )
+    DailyProgress.objects.bulk_create([
+        DailyProgress(
+            child_curriculum=child_curriculum, task=task, day_number=task.day_number,
+            date=start + timedelta(days=task.day_number - 1),
+            status=['done_with_help', 'done_without_help', 'not_done'][task.order_index % 3],
+        )
+        for task in tasks if task.curriculum_id == curriculum.id and task.day_number <= days
+    ])
+    DoctorReview.objects.bulk_create([
+        DoctorReview(
+            child_curriculum=child_curriculum, doctor=doctor, review_period=15 * (i + 1),
+            observations='Good progress', recommendations='Continue',
+        )
+        for i in range(sizes['reviews'])
+    ])
+    reports = DiagnosisReport.objects.bulk_create([
+        DiagnosisReport(
+            child=child, doctor=doctor, has_autism=True, spectrum_type='mild',
+            detailed_report='Findings', next_steps='Speech therapy', shared_with_parent=True,
+        )
+        for _ in range(sizes['reviews'])
+    ])
+
+    pending = [create_family(100 + i) for i in range(sizes['pending'])]
+    accepted = [create_family(200 + i, doctor, 'accepted') for i in range(sizes['accepted'])]
+
+    return SimpleNamespace(
+        admin=admin, doctor_user=doctor_user, doctor=doctor, parent=parent,
+        child=child, children=children, video=child.videos.first(),
+        curriculum=curriculum, assessment_curriculum=assessment_curriculum,
+        child_curriculum=child_curriculum, task=tasks[len(tasks) // 2], report=reports[0],
+        pending_child=pending[0][1], accepted_child=accepted[0][1],
+    )
+
+
+class _Rollback(Exception):
+    pass
+
+
+class QueryBudgetMixin:
+    """Mix into a TestCase and set `budgets` to a list of EndpointBudget"""
+    budgets = []
+
+    # {label: {scale: queries}} across all budget test cases, for the scaling report
+    measurements = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The dataset creates dozens of users; don't spend the test run on PBKDF2
+        cls.enterClassContext(override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if os.environ.get('QUERY_BUDGET_REPORT'):
+            cls.print_scaling_report()
+
+    @classmethod
+    def print_scaling_report(cls):
+        out = sys.stderr
+        out.write(f"\n{cls.__name__}: queries at 1x / 10x data\n")
+        for budget in cls.budgets:
+            counts = QueryBudgetMixin.measurements.get(budget.label, {})
+            small, large = counts.get(1, '-'), counts.get(10, '-')
+            flag = '  GROWS' if isinstance(large, int) and isinstance(small, int) and large > small else ''
+            out.write(f"  {budget.label:<40}{small:>6}{large:>6}   budget {budget.max_queries}{flag}\n")
+
+    def call(self, data, budget):
+        """Call one endpoint and roll its writes back; returns (response, queries, ms)"""
+        client = APIClient()
+        user = {'parent': data.parent, 'doctor': data.doctor_user, 'admin': data.admin}.get(budget.role)
+        if user is not None:
+            # A fresh instance, so relations cached while seeding don't hide queries
+            client.force_authenticate(User.objects.get(pk=user.pk))
+        url = reverse(budget.url_name, kwargs=budget.kwargs(data))
+
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = getattr(client, budget.method)(url, budget.data(data), format='json')
+                    if response.streaming:
+                        # Streamed bodies run their queries while being read
+                        b''.join(response.streaming_content)
+                    ms = (time.perf_counter() - start) * 1000
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        # Savepoints come from the harness and from atomic() in the views, not from the endpoint's work
+        count = sum(1 for q in queries.captured_queries if 'SAVEPOINT' not in q['sql'])
+        return response, count, ms
+
+    def measure(self, scale):
+        data = seed_dataset(scale)
+        results = {}
+        for budget in self.budgets:
+            results[budget.label] = self.call(data, budget)
+            QueryBudgetMixin.measurements.setdefault(budget.label, {})[scale] = results[budget.label][1]
+        return results
+
+    def test_query_and_latency_budgets(self):
+        for budget, (response, queries, ms) in zip(self.budgets, self.measure(1).values()):
+            with self.subTest(endpoint=budget.label):
+                self.assertEqual(response.status_code, budget.status, getattr(response, 'data', None))
+                self.assertLessEqual(queries, budget.max_queries, f"{budget.label}: {queries} queries")
+                self.assertLessEqual(ms, budget.max_ms, f"{budget.label}: {ms:.1f} ms")
+
+    def test_query_count_does_not_grow_with_data(self):
+        small = self.measure(1)
+        # Start the 10x dataset from an empty database (still inside the test transaction)
+        User.objects.all().delete()
+        Curriculum.objects.all().delete()
+        large = self.measure(10)
+
+        for budget in self.budgets:
+            if budget.scales:
+                continue
+            small_queries, large_queries = small[budget.label][1], large[budget.label][1]
+            with self.subTest(endpoint=budget.label):
+                self.assertEqual(large[budget.label][0].status_code, budget.status)
+                self.assertLessEqual(
+                    large_queries, small_queries,
+                    f"{budget.label}: {small_queries} queries at 1x, {large_queries} at 10x"
+                )
@@ -0,0 +1,134 @@
+"""
+orjson-based JSON renderer and parser for DRF.
+
+Drop-in replacements for rest_framework's JSONRenderer and JSONParser (see
+REST_FRAMEWORK in settings.py). orjson serializes dicts, lists, strings,
+numbers, datetimes, dates, times and UUIDs natively in C, several times
+faster than the json module on large nested payloads such as a curriculum
+with all of its tasks. Anything else (Decimal, lazy translation strings,
+querysets...) goes through DRF's own JSONEncoder.default, so values are
+rendered as before: datetimes in UTC end in "Z", Decimals become numbers,
+U+2028/U+2029 are escaped.
+
+orjson only handles integers that fit in 64 bits: it refuses to render
+larger ones and parses them as floats. Payloads with such integers (and,
+to stay cheap to check, any run of 19 or more digits) go through DRF's
+JSONRenderer and JSONParser instead.
+
+orjson is optional: without it both classes behave exactly like DRF's.
+
+MessagePackRenderer and CBORRenderer serve the same data in the compact
+schema (see compact.py) to clients that ask for application/msgpack or
+application/cbor. settings.py enables each one when its library (msgpack,
+cbor2) is installed.
+"""
+
+import io
+import json
+import re
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders
+
+from .compact import compact
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: MessagePackRenderer is only enabled when installed
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional: CBORRenderer is only enabled when installed
+    cbor2 = None
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_default = encoders.JSONEncoder().default
+
+# 19 digits may already fall outside orjson's -2**63..2**64-1
+_LONG_DIGITS = re.compile(rb'\d{19}')
+
+
+def _exact_with_orjson(content):
+    """Whether orjson parses content's numbers exactly (no integer literal beyond 64 bits)"""
+    return _LONG_DIGITS.search(content) is None
+
+
+def json_dumps(data):
+    """data as compact JSON bytes, like JSONRenderer().render(data)"""
+    if orjson is None:
+        return renderers.JSONRenderer().render(data)
+    try:
+        rendered = orjson.dumps(data, default=_default, option=OPTIONS)
+    except TypeError:
+        # Integers beyond 64 bits (and nesting deeper than orjson allows)
+        return renderers.JSONRenderer().render(data)
+    # Same escaping as JSONRenderer: keep the output a strict JavaScript subset
+    if b'\xe2\x80' in rendered:
+        rendered = rendered.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+    return rendered
+
+
+def json_loads(content):
+    """Parsed JSON bytes"""
+    if orjson is None or not _exact_with_orjson(content):
+        return json.loads(content)
+    return orjson.loads(content)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # orjson can't pretty-print with arbitrary indents or loose separators
+        if (orjson is None or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        return json_dumps(data)
+
+
+class ORJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        content = stream.read()
+        if not _exact_with_orjson(content):
+            return super().parse(io.BytesIO(content), media_type, parser_context)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(compact(data))
+
+
+class CBORRenderer(renderers.BaseRenderer):
+    media_type = 'application/cbor'
+    format = 'cbor'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return cbor2.dumps(compact(data))
+
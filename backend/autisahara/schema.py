@@ -0,0 +1,149 @@
+"""
+Precomputed OpenAPI schema.
+
+drf_yasg walks every view and swagger_auto_schema decorator to build the
+schema, which is too slow to repeat on every hit to /swagger.json. The
+schema is built once per code version, written to API_SCHEMA_ROOT and kept
+in memory; ApiSchemaView serves it with an ETag so clients revalidate with
+a cheap 304.
+
+The version is settings.API_SCHEMA_VERSION (APP_VERSION in the environment)
+or, when unset, a hash of the Python sources of SCHEMA_PACKAGES, so a
+deploy with changed code gets a fresh schema. Run ``python manage.py generate_api_schema``
+at deploy time to build the file before the first request; otherwise the
+first request builds it.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import get_resolver
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import condition
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+from .docs import materialize
+
+API_INFO = openapi.Info(
+    title="AutiSahara Nepal API",
+    default_version='v1',
+    description="""
+## AutiSahara Nepal - Autism Therapy Platform API
+
+A mobile-first platform connecting Nepali families with autism therapists.
+
+### Features
+- **Parent Registration**: Register parents with child information
+- **Doctor Registration**: Register verified therapists
+- **M-CHAT Screening**: 20-question autism screening for toddlers (16-30 months)
+- **Curriculum System**: Daily therapy tasks with progress tracking
+- **Video Submissions**: Upload child behavior videos for doctor review
+
+### Authentication
+All endpoints (except registration and login) require JWT Bearer token.
+Include the token in the Authorization header:
+```
+Authorization: Bearer <access_token>
+```
+    """,
+    terms_of_service="https://autisahara.com/terms/",
+    contact=openapi.Contact(email="support@autisahara.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+schema_view = get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=[permissions.AllowAny],
+)
+
+# The local apps (INSTALLED_APPS), whose sources the schema is built from
+SCHEMA_PACKAGES = ['autisahara', 'accounts', 'children', 'assessments', 'therapy', 'reports']
+
+_lock = threading.Lock()
+_documents = {}
+_version = None
+
+
+def schema_version():
+    """Code version the schema belongs to"""
+    global _version
+    if _version is None:
+        _version = getattr(settings, 'API_SCHEMA_VERSION', '') or _source_hash()
+    return _version
+
+
+def _source_hash():
+    base_dir = Path(settings.BASE_DIR)
+    digest = hashlib.sha256()
+    for package in SCHEMA_PACKAGES:
+        for path in sorted((base_dir / package).rglob('*.py')):
+            if path.name == 'tests.py':
+                continue
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def schema_path(version=None):
+    return Path(settings.API_SCHEMA_ROOT) / f'swagger-{version or schema_version()}.json'
+
+
+def build_schema():
+    """Generate the schema JSON (bytes) with drf_yasg"""
+    # Import every view, then apply their deferred LAZY_API_DOCS decorators
+    get_resolver().url_patterns
+    materialize()
+    generator = schema_view.generator_class(API_INFO)
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def write_schema(version=None):
+    """Build the schema and write it atomically; returns the file path"""
+    path = schema_path(version)
+    content = build_schema()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+    _documents[version or schema_version()] = content
+    return path
+
+
+def get_schema_document():
+    """Schema JSON for the current code version: memory, then file, then build"""
+    version = schema_version()
+    content = _documents.get(version)
+    if content is None:
+        with _lock:
+            content = _documents.get(version)
+            if content is None:
+                path = schema_path(version)
+                if not path.exists():
+                    write_schema(version)
+                content = _documents.setdefault(version, path.read_bytes())
+    return content
+
+
+def _etag(request, *args, **kwargs):
+    return schema_version()
+
+
+@method_decorator(condition(etag_func=_etag), name='get')
+class ApiSchemaView(View):
+    """Serves the precomputed swagger.json; If-None-Match gets a 304"""
+
+    def get(self, request):
+        response = HttpResponse(get_schema_document(), content_type='application/json')
+        # Always revalidate: the ETag changes with the code version
+        response['Cache-Control'] = 'no-cache'
+        return response
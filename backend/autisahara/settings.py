@@ -4,7 +4,9 @@ Django settings for autisahara project.
 
 from pathlib import Path
 from datetime import timedelta
+from importlib.util import find_spec
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -35,10 +37,12 @@ INSTALLED_APPS = [
     "drf_yasg",
 
     # Local apps
+    "autisahara",
     "accounts",
     "children",
     "assessments",
     "therapy",
+    "reports",
 ]
 
 MIDDLEWARE = [
@@ -50,6 +54,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "autisahara.performance.PerformanceTimingMiddleware",
 ]
 
 ROOT_URLCONF = "autisahara.urls"
@@ -70,17 +75,52 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "autisahara.wsgi.application"
+ASGI_APPLICATION = "autisahara.asgi.application"
+
+# Route the hot read endpoints (therapy/async_views.py) to their async variants.
+# Turn on when serving through autisahara.asgi; leave off under WSGI.
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', 'False') == 'True'
 
 
 # Database - SQLite for hackathon
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get('SQLITE_PATH', BASE_DIR / "db.sqlite3"),
     }
 }
 
 
+# Cache
+# "default" is per process; use it only for values any worker may recompute.
+# The idempotency and shared caches are database tables so every worker sees
+# the same entries: retries that land on a different worker still replay, and
+# a cached count dropped by one worker is dropped for all of them.
+# Create them with: python manage.py createcachetable
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "idempotency": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "idempotency_keys",
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "shared_cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+# Stored responses for Idempotency-Key retries expire after this many seconds
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+# Longest a request may run, in seconds: the app server's worker timeout
+# (gunicorn --timeout). Video uploads from slow phones take minutes.
+# A key stays held this long while its first request runs.
+REQUEST_TIMEOUT = int(os.environ.get('REQUEST_TIMEOUT', 600))
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -111,6 +151,13 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.User"
 
 # Django REST Framework
+# Optional binary response formats, each enabled when its library is installed
+BINARY_RENDERERS = [
+    f"autisahara.renderers.{renderer}"
+    for renderer, library in (("MessagePackRenderer", "msgpack"), ("CBORRenderer", "cbor2"))
+    if find_spec(library) is not None
+]
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -118,6 +165,18 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson-backed JSON (same output as DRF's, several times faster on large payloads),
+    # then MessagePack/CBOR in the compact schema for the mobile app when installed
+    "DEFAULT_RENDERER_CLASSES": [
+        "autisahara.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        *BINARY_RENDERERS,
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "autisahara.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 # JWT Settings - Extended for hackathon
@@ -142,6 +201,7 @@ CORS_ALLOW_HEADERS = [
     'x-csrftoken',
     'x-requested-with',
     'ngrok-skip-browser-warning',
+    'idempotency-key',
 ]
 
 # CSRF Settings for ngrok tunneling
@@ -165,4 +225,43 @@ SWAGGER_SETTINGS = {
         }
     },
     'USE_SESSION_AUTH': False,
+    # Load the precomputed schema (autisahara/schema.py) instead of regenerating it
+    'SPEC_URL': 'schema-json',
+}
+REDOC_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
+
+# Defer importing drf_yasg and building the swagger_auto_schema payloads of the
+# views until the docs are first requested (autisahara/docs.py); saves boot
+# time and memory in every worker
+LAZY_API_DOCS = os.environ.get('LAZY_API_DOCS', 'False') == 'True'
+
+# Precomputed OpenAPI schema: written here per code version (outside the source tree)
+API_SCHEMA_ROOT = os.environ.get('API_SCHEMA_ROOT', Path(tempfile.gettempdir()) / 'autisahara-schema')
+# Code version for the schema (set by the deploy); unset = hash of the sources
+API_SCHEMA_VERSION = os.environ.get('APP_VERSION', '')
+
+# Performance instrumentation (autisahara/performance.py)
+# Requests under these prefixes get a Server-Timing header and a log line
+PERFORMANCE_TIMING_PATHS = ['/api/']
+# Recent samples kept per endpoint for /api/admin/performance/
+PERFORMANCE_SAMPLES_PER_ENDPOINT = 1000
+# Requests slower than this are logged at WARNING, the rest at INFO. Only slow
+# requests are logged by default; PERFORMANCE_LOG_LEVEL=INFO logs every request.
+PERFORMANCE_SLOW_REQUEST_MS = int(os.environ.get('PERFORMANCE_SLOW_REQUEST_MS', 500))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "autisahara.performance": {
+            "handlers": ["console"],
+            "level": os.environ.get('PERFORMANCE_LOG_LEVEL', 'WARNING'),
+            "propagate": False,
+        },
+    },
 }
@@ -0,0 +1,45 @@
+"""
+Short-lived tickets for authenticating event streams.
+
+EventSource can't send an Authorization header, so a stream has to be
+authenticated from its URL. Putting the access token there leaks a
+long-lived credential into proxy and server access logs and browser
+history. Instead the client POSTs (with its usual header) to
+api/stream-ticket/ and opens the stream with ?ticket=<ticket>:
+
+- a ticket is a random string mapped to the user in the shared cache, so
+  any worker can redeem it;
+- it expires after STREAM_TICKET_TTL seconds;
+- it is deleted when redeemed, so a logged URL can't be replayed.
+"""
+
+import secrets
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+STREAM_TICKET_TTL = 30
+
+
+def _cache():
+    return caches['shared']
+
+
+def _cache_key(ticket):
+    return f'stream-ticket:{ticket}'
+
+
+def issue_stream_ticket(user):
+    ticket = secrets.token_urlsafe(32)
+    _cache().set(_cache_key(ticket), user.pk, STREAM_TICKET_TTL)
+    return ticket
+
+
+def redeem_stream_ticket(ticket):
+    """The active user the ticket was issued to, or None; a ticket redeems once"""
+    cache, key = _cache(), _cache_key(ticket)
+    user_id = cache.get(key)
+    # Only the worker whose DELETE removed the row gets the user
+    if user_id is None or not cache.delete(key):
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_active=True).first()
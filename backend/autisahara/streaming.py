@@ -0,0 +1,113 @@
+"""
+Streaming JSON responses for long lists.
+
+A view returns StreamingJSONResponse(data) where some values of data are
+iterators (typically a generator over ``queryset.iterator()``). Everything
+else is rendered as usual; each iterator is written out as a JSON array
+one element at a time while its rows are still being read from the
+database. Peak memory is one chunk of rows rather than the whole list, and
+the first bytes leave before the last row is fetched.
+
+The output is byte-identical to rest_framework.response.Response with the
+default (compact) JSON renderer. Elements of a streamed array are encoded
+whole, so they must not contain iterators themselves.
+
+Views call streamed_response(), which streams only to JSON clients; other
+negotiated formats (MessagePack, CBOR, the browsable API) need the whole
+payload and get a regular Response.
+
+Under ASGI the body is an async iterator that reads each chunk in the sync
+thread (the rows come from a sync queryset iterator); handed a sync
+iterator, Django's ASGI handler would read the whole body into memory
+first. PerformanceTimingMiddleware counts the queries run while the body
+is read into the request's sample.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .renderers import json_dumps
+
+# Bytes buffered before a chunk is handed to the server
+CHUNK_SIZE = 16 * 1024
+
+
+def _key(key):
+    # The json module's conversion of non-string object keys
+    if key is True or key is False:
+        return 'true' if key else 'false'
+    return 'null' if key is None else str(key)
+
+
+def _is_lazy(value):
+    return hasattr(value, '__next__')
+
+
+def iter_json(data, chunk_size=CHUNK_SIZE):
+    """Yield data as JSON in byte chunks of about chunk_size, streaming its iterators"""
+    def parts(value):
+        if isinstance(value, dict):
+            yield b'{'
+            for index, (key, item) in enumerate(value.items()):
+                if index:
+                    yield b','
+                yield json_dumps(_key(key))
+                yield b':'
+                yield from parts(item)
+            yield b'}'
+        elif _is_lazy(value):
+            yield b'['
+            for index, item in enumerate(value):
+                if index:
+                    yield b','
+                yield json_dumps(item)
+            yield b']'
+        else:
+            yield json_dumps(value)
+
+    buffer, size = [], 0
+    for part in parts(data):
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+async def aiter_chunks(chunks):
+    """The sync iterator chunks as an async iterator, each chunk read in the sync thread"""
+    read = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await read(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Closes the queryset iterator's cursor in the thread that opened it
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    def __init__(self, data, status=status.HTTP_200_OK, asynchronous=False, **kwargs):
+        chunks = iter_json(data)
+        super().__init__(aiter_chunks(chunks) if asynchronous else chunks, status=status,
+                         content_type=JSONRenderer.media_type, **kwargs)
+
+
+def materialized(data):
+    """data with its iterators read into lists, for renderers that need the whole payload"""
+    if isinstance(data, dict):
+        return {key: materialized(value) for key, value in data.items()}
+    return list(data) if _is_lazy(data) else data
+
+
+def streamed_response(request, data, status=status.HTTP_200_OK):
+    """StreamingJSONResponse if the request negotiated JSON, else a Response with the iterators consumed"""
+    if isinstance(getattr(request, 'accepted_renderer', None), JSONRenderer):
+        asynchronous = isinstance(getattr(request, '_request', request), ASGIRequest)
+        return StreamingJSONResponse(data, status=status, asynchronous=asynchronous)
+    return Response(materialized(data), status=status)
@@ -0,0 +1,526 @@
+import io
+import tempfile
+import uuid
+from contextlib import contextmanager
+from unittest import skipUnless
+from unittest.mock import patch
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from importlib import import_module, reload
+from pathlib import Path
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import AsyncClient, Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, clear_url_caches, get_resolver, resolve
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from assessments.models import ChildAssessment, MChatResponse
+from children.models import Child
+from therapy.async_views import AsyncProgressHistoryView
+from therapy.models import ChildCurriculum, Curriculum, DailyProgress, DiagnosisReport
+from therapy.serializers import CurriculumDetailSerializer, CurriculumSerializer, DailyProgressSerializer
+
+from . import batch, docs, idempotency, schema
+from .compact import CODE_TABLES, compact
+from .compiled import CompiledListSerializer, CompiledSerializer, compiled
+from .performance import RequestTiming, _current, endpoint_stats
+from .query_budget import EndpointBudget, QueryBudgetMixin, create_family, seed_dataset
+from .renderers import ORJSONParser, ORJSONRenderer, json_dumps, json_loads, msgpack
+
+# Long-lived streams have no response time to budget
+UNBUDGETED_ROUTES = {'doctor-pending-stream'}
+
+
+class PerformanceQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budgets = [
+        EndpointBudget('performance-stats', role='admin', max_queries=0),
+        EndpointBudget('performance-stats', 'delete', role='admin', status=204, max_queries=0),
+        EndpointBudget('compact-codes', max_queries=0),
+        EndpointBudget('batch', 'post', max_queries=12, data=lambda d: {'requests': launch_requests(d)}),
+        EndpointBudget('stream-ticket', 'post', role='doctor', status=201, max_queries=3),
+    ]
+
+
+def launch_requests(d):
+    """The parent app's cold-start calls"""
+    return [{'url': url} for url in (
+        '/api/auth/me/', '/api/children/', f'/api/therapy/child/{d.child.id}/today/',
+        f'/api/therapy/child/{d.child.id}/feedback/', f'/api/children/{d.child.id}/assessment/status/',
+    )]
+
+
+def api_route_names(patterns, prefix=''):
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from api_route_names(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern) and route.startswith('api/') and pattern.name:
+            yield pattern.name
+
+
+class QueryBudgetCoverageTests(SimpleTestCase):
+    def test_every_api_route_has_a_budget(self):
+        # Importing the test modules registers their QueryBudgetMixin subclasses
+        for app in ('accounts', 'children', 'assessments', 'therapy', 'reports'):
+            import_module(f'{app}.tests')
+        budgeted = {budget.url_name for case in QueryBudgetMixin.__subclasses__() for budget in case.budgets}
+        missing = set(api_route_names(get_resolver().url_patterns)) - budgeted - UNBUDGETED_ROUTES
+        self.assertFalse(missing, f"API routes without a query budget: {sorted(missing)}")
+
+
+class ApiSchemaTests(SimpleTestCase):
+    def setUp(self):
+        self.schema_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(API_SCHEMA_ROOT=self.schema_root))
+        schema._documents.clear()
+
+    def test_schema_is_written_once_and_revalidated_with_etag(self):
+        response = self.client.get('/swagger.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], f'"{schema.schema_version()}"')
+        self.assertIn(b'"swagger": "2.0"', response.content)
+        self.assertTrue(schema.schema_path().exists())
+
+        response = self.client.get('/swagger.json', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_version_hashes_only_the_app_packages(self):
+        base_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(BASE_DIR=base_dir))
+
+        def write(relative, text):
+            path = base_dir / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+            return schema._source_hash()
+
+        version = write('therapy/views.py', 'A = 1')
+        self.assertEqual(write('scratch/notes.py', 'B = 2'), version)
+        self.assertEqual(write('therapy/tests.py', 'C = 3'), version)
+        self.assertNotEqual(write('therapy/views.py', 'A = 2'), version)
+
+
+class LazyApiDocsTests(SimpleTestCase):
+    def test_deferred_decorator_matches_eager(self):
+        from drf_yasg import openapi
+        from drf_yasg.utils import swagger_auto_schema
+
+        def eager_view(self, request):
+            pass
+
+        def lazy_view(self, request):
+            pass
+
+        lazy = docs.LazyOpenapi()
+        swagger_auto_schema(operation_summary='Get', responses={200: openapi.Response(
+            'OK', openapi.Schema(type=openapi.TYPE_OBJECT))})(eager_view)
+        docs.lazy_swagger_auto_schema(operation_summary='Get', responses={200: lazy.Response(
+            'OK', lazy.Schema(type=lazy.TYPE_OBJECT))})(lazy_view)
+        self.assertFalse(hasattr(lazy_view, '_swagger_auto_schema'))
+
+        docs.materialize()
+        self.assertEqual(lazy_view._swagger_auto_schema, eager_view._swagger_auto_schema)
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_output_matches_drf_json_renderer(self):
+        data = {
+            'utc': datetime(2024, 2, 1, 8, 30, 15, 123456, tzinfo=timezone.utc),
+            'kathmandu': datetime(2024, 2, 1, 14, 15, tzinfo=timezone(timedelta(hours=5, minutes=45))),
+            'naive': datetime(2024, 2, 1, 8, 30),
+            'date': date(2024, 2, 1),
+            'height_cm': Decimal('85.50'),
+            'id': uuid.UUID(int=1),
+            'label': gettext_lazy('Pending'),
+            'text': 'नमस्ते \u2028 line',
+            'nested': [{'score': 3, 'risk': None, 'ok': True}, (1.5, -2)],
+            7: 'integer key',
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(data, 'application/json; indent=2'),
+                         JSONRenderer().render(data, 'application/json; indent=2'))
+
+    def test_parser(self):
+        body = '{"full_name": "राम", "age_years": 2, "height_cm": "85.5"}'.encode()
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), {'full_name': 'राम', 'age_years': 2, 'height_cm': '85.5'})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"full_name": '))
+
+    def test_integers_beyond_64_bits_match_drf(self):
+        data = {'big': 2 ** 64, 'negative': -2 ** 63 - 1, 'edge': 2 ** 64 - 1, 'nested': [{'id': 10 ** 30}]}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(json_dumps(data), JSONRenderer().render(data))
+
+        body = JSONRenderer().render(data)
+        parsed = ORJSONParser().parse(io.BytesIO(body))
+        self.assertEqual(parsed, JSONParser().parse(io.BytesIO(body)))
+        self.assertEqual(parsed, data)
+        self.assertIsInstance(parsed['big'], int)
+        self.assertEqual(json_loads(body), data)
+
+
+class CompactSchemaTests(TestCase):
+    def test_code_tables_cover_model_choices(self):
+        choices = {
+            'status': [ChildAssessment.STATUS_CHOICES, ChildCurriculum.STATUS_CHOICES, DailyProgress.STATUS_CHOICES],
+            'risk_level': [MChatResponse.RISK_LEVEL_CHOICES],
+            'spectrum_type': [DiagnosisReport.SPECTRUM_CHOICES],
+        }
+        for table, field_choices in choices.items():
+            for value, _ in sum(field_choices, []):
+                self.assertIn(value, CODE_TABLES[table])
+
+    def test_compact_codes_enums_and_converts_like_json(self):
+        data = {
+            'status': 'done_with_help', 'mchat_risk': 'high', 'spectrum_type': 'Mild (Level 1 - Requiring Support)',
+            'submitted_at': datetime(2024, 2, 1, 8, 30, tzinfo=timezone.utc), 'height_cm': Decimal('85.5'),
+            'curricula': [{'curriculum_status': 'paused', 'start_date': date(2024, 2, 1)}],
+        }
+        self.assertEqual(compact(data), {
+            'status': 7, 'mchat_risk': 2, 'spectrum_type': 'Mild (Level 1 - Requiring Support)',
+            'submitted_at': '2024-02-01T08:30:00Z', 'height_cm': 85.5,
+            'curricula': [{'curriculum_status': 5, 'start_date': '2024-02-01'}],
+        })
+
+    def test_streamed_endpoints_fall_back_to_regular_response(self):
+        d = seed_dataset(1)
+        client = APIClient()
+        client.force_authenticate(d.parent)
+        url = f'/api/therapy/child/{d.child.id}/history/'
+        streamed = client.get(url)
+        browsable = client.get(url, HTTP_ACCEPT='text/html')
+        self.assertTrue(streamed.streaming)
+        self.assertFalse(browsable.streaming)
+        self.assertEqual(ORJSONRenderer().render(browsable.data), b''.join(streamed.streaming_content))
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack_negotiation(self):
+        d = seed_dataset(1)
+        client = APIClient()
+        client.force_authenticate(d.parent)
+        response = client.get(f'/api/therapy/child/{d.child.id}/curriculum/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        body = msgpack.unpackb(response.content)
+        self.assertEqual(body['curricula'][0]['status'], CODE_TABLES['status'].index('active'))
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.d = seed_dataset(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.d.doctor_user)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), ' '.join(q['sql'] for q in queries.captured_queries)
+
+    def test_fields_trims_payload_and_columns(self):
+        url = f'/api/therapy/curricula/{self.d.curriculum.id}/'
+        full, full_sql = self.get(url)
+        data, sql = self.get(url + '?fields=id,title,tasks.id,tasks.title')
+        self.assertEqual(data, {
+            'id': full['id'], 'title': full['title'],
+            'tasks': [{'id': t['id'], 'title': t['title']} for t in full['tasks']],
+        })
+        self.assertIn('"instructions"', full_sql)
+        self.assertNotIn('"instructions"', sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_omit_and_method_field_sources(self):
+        url = f'/api/therapy/curricula/{self.d.curriculum.id}/?omit=tasks.instructions,tasks.why_description'
+        data, sql = self.get(url)
+        self.assertEqual(data['created_by_name'], 'Dr. Sita Thapa')
+        self.assertEqual(set(data['tasks'][0]), {'id', 'day_number', 'title', 'demo_video_url', 'order_index'})
+        self.assertNotIn('"instructions"', sql)
+
+    def test_hand_built_payload(self):
+        data, sql = self.get(f'/api/therapy/doctor/patient/{self.d.child.id}/?fields=child.full_name,mchat_result')
+        self.assertEqual(set(data), {'child', 'mchat_result'})
+        self.assertEqual(data['child'], {'full_name': self.d.child.full_name})
+        self.assertNotIn('assessments_assessmentvideo', sql)
+
+    def test_writes_ignore_selection(self):
+        self.client.force_authenticate(self.d.parent)
+        response = self.client.post('/api/children/?fields=id', {
+            'full_name': 'Maya', 'date_of_birth': '2022-01-01', 'age_years': 2, 'age_months': 10, 'gender': 'female',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('full_name', response.json())
+
+
+class CompiledSerializerTests(TestCase):
+    def setUp(self):
+        self.d = seed_dataset(1)
+
+    def test_rows_match_serializer_output(self):
+        progress = DailyProgress.objects.order_by('-day_number', 'id')
+        expected = [DailyProgressSerializer(entry).data for entry in progress.select_related('task')]
+        rendered = list(compiled(DailyProgressSerializer).rows(progress))
+        self.assertEqual(len(rendered), self.d.child_curriculum.progress_entries.count())
+        self.assertEqual(ORJSONRenderer().render(rendered), ORJSONRenderer().render(expected))
+
+    def test_nested_task_list_uses_values(self):
+        curriculum = Curriculum.objects.get(pk=self.d.curriculum.pk)
+        prefetched = Curriculum.objects.prefetch_related('tasks').get(pk=self.d.curriculum.pk)
+        serializer = CurriculumDetailSerializer(curriculum)
+        self.assertIsInstance(serializer.fields['tasks'], CompiledListSerializer)
+        data = serializer.data
+        self.assertEqual(
+            ORJSONRenderer().render(data), ORJSONRenderer().render(CurriculumDetailSerializer(prefetched).data)
+        )
+
+    def test_method_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            CompiledSerializer(CurriculumSerializer())
+
+    def test_rendering_counts_as_serializer_time(self):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            rendered = list(compiled(DailyProgressSerializer).rows(DailyProgress.objects.all()))
+        finally:
+            _current.reset(token)
+        self.assertTrue(rendered)
+        self.assertGreater(timing.serializer_seconds, 0)
+        self.assertEqual(timing.serializer_depth, 0)
+
+    def test_only_timed_serializers_count_as_serializer_time(self):
+        class PlainSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = DailyProgress
+                fields = ['id', 'status']
+
+        def serializer_seconds(serializer_class):
+            timing = RequestTiming()
+            token = _current.set(timing)
+            try:
+                serializer_class(DailyProgress.objects.select_related('task'), many=True).data
+            finally:
+                _current.reset(token)
+            self.assertEqual(timing.serializer_depth, 0)
+            return timing.serializer_seconds
+
+        self.assertEqual(serializer_seconds(PlainSerializer), 0)  # DRF's classes are not patched
+        self.assertGreater(serializer_seconds(DailyProgressSerializer), 0)
+
+
+class BatchApiTests(TestCase):
+    def setUp(self):
+        self.d = seed_dataset(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.d.parent)
+
+    def batch(self, requests):
+        return self.client.post('/api/batch/', {'requests': requests}, format='json')
+
+    def test_sub_responses_match_direct_calls(self):
+        requests = launch_requests(self.d)
+        responses = self.batch(requests).json()['responses']
+        self.assertEqual(len(responses), len(requests))
+        for request, result in zip(requests, responses):
+            direct = self.client.get(request['url'])
+            self.assertEqual(result['status'], direct.status_code)
+            self.assertEqual(result['body'], direct.json())
+
+    def test_shared_child_lookup_keeps_access_checks(self):
+        other = create_family(1000)[1]
+        responses = self.batch([
+            {'url': f'/api/children/{self.d.child.id}/assessment/status/'},
+            {'url': f'/api/children/{other.id}/assessment/status/'},
+            {'url': '/api/nowhere/'},
+            {'url': '/api/batch/'},
+        ]).json()['responses']
+        self.assertEqual([r['status'] for r in responses], [200, 404, 404, 400])
+
+    def test_shared_lookup_normalises_the_key(self):
+        token = batch._cache.set({})
+        try:
+            with self.assertNumQueries(1):
+                first = batch.cached_object_or_404(Child, self.d.child.id, parent=self.d.parent)
+                self.assertIs(batch.cached_object_or_404(Child, str(self.d.child.id)), first)
+        finally:
+            batch._cache.reset(token)
+
+    def test_only_get_sub_requests(self):
+        response = self.batch([{'method': 'POST', 'url': '/api/children/'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.batch([]).status_code, 400)
+
+
+class StreamTicketTests(TestCase):
+    stream_url = '/api/therapy/doctor/pending/stream/'
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.d = seed_dataset(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.d.doctor_user)
+
+    def test_ticket_opens_the_stream_once(self):
+        ticket = self.client.post('/api/stream-ticket/').data['ticket']
+        # Authenticated: the sync test client then gets the stream's WSGI refusal
+        self.assertEqual(Client().get(self.stream_url, {'ticket': ticket}).status_code, 501)
+        self.assertEqual(Client().get(self.stream_url, {'ticket': ticket}).status_code, 401)
+        self.assertEqual(Client().get(self.stream_url, {'ticket': 'made-up'}).status_code, 401)
+
+    def test_access_token_is_not_accepted_in_the_url(self):
+        token = str(AccessToken.for_user(self.d.doctor_user))
+        self.assertEqual(Client().get(self.stream_url, {'token': token}).status_code, 401)
+        self.assertEqual(Client().get(self.stream_url, headers={'Authorization': f'Bearer {token}'}).status_code, 501)
+
+
+@contextmanager
+def async_read_views():
+    """The URLconf routed as with ASYNC_READ_VIEWS=True (therapy.urls picks its views on import)"""
+    def reroute():
+        reload(import_module('therapy.urls'))
+        reload(import_module(settings.ROOT_URLCONF))
+        clear_url_caches()
+
+    try:
+        with override_settings(ASYNC_READ_VIEWS=True):
+            reroute()
+            yield
+    finally:
+        reroute()
+
+
+class StreamedResponseTests(TestCase):
+    endpoint = 'GET /api/therapy/child/<int:child_id>/history/'
+
+    def setUp(self):
+        self.d = seed_dataset(1)
+        self.url = f'/api/therapy/child/{self.d.child.id}/history/'
+        endpoint_stats.clear()
+
+    def test_queries_read_while_streaming_are_recorded(self):
+        client = APIClient()
+        client.force_authenticate(self.d.parent)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.url)
+            self.assertNotIn(self.endpoint, endpoint_stats.summary())  # recorded when the body is read
+            b''.join(response.streaming_content)
+        self.assertEqual(endpoint_stats.summary()[self.endpoint]['queries']['max'], len(queries))
+        # The header went out before the body, so it only counts the view's queries
+        self.assertLess(int(response['Server-Timing'].split('desc="')[1].split()[0]), len(queries))
+
+    async def test_asgi_streams_an_async_body(self):
+        token = await sync_to_async(AccessToken.for_user)(self.d.parent)
+        response = await AsyncClient().get(self.url, headers={'Authorization': f'Bearer {token}'})
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body, await sync_to_async(self.wsgi_body)())
+        self.assertIn(self.endpoint, endpoint_stats.summary())
+
+    async def test_async_read_view_streams(self):
+        token = await sync_to_async(AccessToken.for_user)(self.d.parent)
+        with async_read_views():
+            self.assertIs(resolve(self.url).func.view_class, AsyncProgressHistoryView)
+            response = await AsyncClient().get(self.url, headers={'Authorization': f'Bearer {token}'})
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body, await sync_to_async(self.wsgi_body)())
+
+    def wsgi_body(self):
+        client = APIClient()
+        client.force_authenticate(self.d.parent)
+        return b''.join(client.get(self.url).streaming_content)
+
+
+class SlowRequestLogTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(seed_dataset(1).parent)
+
+    @override_settings(PERFORMANCE_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_at_warning(self):
+        with self.assertLogs('autisahara.performance', 'WARNING') as logs:
+            self.client.get('/api/compact-codes/')
+        self.assertIn('"endpoint": "GET /api/compact-codes/"', logs.output[0])
+
+    @override_settings(PERFORMANCE_SLOW_REQUEST_MS=60 * 1000)
+    def test_other_requests_are_logged_at_info(self):
+        with self.assertNoLogs('autisahara.performance', 'WARNING'):
+            self.client.get('/api/compact-codes/')
+        with self.assertLogs('autisahara.performance', 'INFO'):
+            self.client.get('/api/compact-codes/')
+
+
+class IdempotencyTests(TestCase):
+    url = '/api/children/register/'
+    body = {'full_name': 'Aarav Sharma', 'date_of_birth': '2022-03-15', 'age_years': 2, 'age_months': 8,
+            'gender': 'male'}
+
+    def setUp(self):
+        caches['idempotency'].clear()
+        self.parent = create_family(1000)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.parent)
+        self.children_before = self.registered()
+
+    def register(self, key, **changes):
+        uploads = any(isinstance(value, SimpleUploadedFile) for value in changes.values())
+        return self.client.post(self.url, {**self.body, **changes}, format='multipart' if uploads else 'json',
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    def registered(self):
+        return self.parent.children.count()
+
+    def test_retry_replays_the_first_response(self):
+        first, retry = self.register('k1'), self.register('k1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual((retry.status_code, retry.json()), (201, first.json()))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(self.registered(), self.children_before + 1)
+
+    def test_key_reused_with_a_different_body_is_rejected(self):
+        self.register('k1')
+        self.assertEqual(self.register('k1', full_name='Other Name').status_code, 422)
+        self.assertEqual(self.registered(), self.children_before + 1)
+
+    def test_retry_while_the_first_request_runs_conflicts(self):
+        # What the first request stores before its handler runs
+        first = SimpleNamespace(user=self.parent, method='POST', path=self.url, data=self.body)
+        caches['idempotency'].add(idempotency._cache_key(first, 'k1'),
+                                  {'state': 'in_progress', 'fingerprint': idempotency._fingerprint(first)})
+        self.assertEqual(self.register('k1').status_code, 409)
+        self.assertEqual(self.registered(), self.children_before)
+
+    def test_key_released_during_the_race_conflicts(self):
+        # add() lost to a request whose handler failed and deleted the key before the second get()
+        class RacedCache:
+            def get(self, key):
+                return None
+
+            def add(self, key, value, timeout):
+                self.timeout = timeout
+                return False
+
+        raced = RacedCache()
+        with patch.object(idempotency, '_cache', lambda: raced), override_settings(REQUEST_TIMEOUT=900):
+            self.assertEqual(self.register('k1').status_code, 409)
+        self.assertEqual(raced.timeout, 900)  # the key is held as long as a request may run
+        self.assertEqual(self.registered(), self.children_before)
+
+    def test_uploads_are_compared_by_content(self):
+        def upload(content):
+            return SimpleUploadedFile('notes.txt', content)
+
+        self.assertEqual(self.register('k1', attachment=upload(b'first')).status_code, 201)
+        self.assertEqual(self.register('k1', attachment=upload(b'first'))['Idempotent-Replayed'], 'true')
+        self.assertEqual(self.register('k1', attachment=upload(b'other')).status_code, 422)
+        self.assertEqual(self.registered(), self.children_before + 1)
@@ -1,41 +1,23 @@
+from importlib import import_module
+
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="AutiSahara Nepal API",
-        default_version='v1',
-        description="""
-## AutiSahara Nepal - Autism Therapy Platform API
-
-A mobile-first platform connecting Nepali families with autism therapists.
-
-### Features
-- **Parent Registration**: Register parents with child information
-- **Doctor Registration**: Register verified therapists
-- **M-CHAT Screening**: 20-question autism screening for toddlers (16-30 months)
-- **Curriculum System**: Daily therapy tasks with progress tracking
-- **Video Submissions**: Upload child behavior videos for doctor review
-
-### Authentication
-All endpoints (except registration and login) require JWT Bearer token.
-Include the token in the Authorization header:
-```
-Authorization: Bearer <access_token>
-```
-        """,
-        terms_of_service="https://autisahara.com/terms/",
-        contact=openapi.Contact(email="support@autisahara.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
+
+from .docs import lazy_view, materialize
+from .views import BatchView, CompactCodesView, PerformanceStatsView, StreamTicketView
+
+# The UI pages only embed the API title and fetch the spec from swagger.json
+# (SPEC_URL), so they can be cached for long
+UI_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def schema_ui(renderer):
+    schema_view = import_module("autisahara.schema").schema_view
+    materialize()
+    return schema_view.with_ui(renderer, cache_timeout=UI_CACHE_TIMEOUT)
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -43,11 +25,18 @@ urlpatterns = [
     path("api/children/", include("children.urls")),
     path("api/children/", include("assessments.urls")),
     path("api/therapy/", include("therapy.urls")),
+    path("api/reports/", include("reports.urls")),
+    path("api/admin/performance/", PerformanceStatsView.as_view(), name="performance-stats"),
+    path("api/compact-codes/", CompactCodesView.as_view(), name="compact-codes"),
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    path("api/stream-ticket/", StreamTicketView.as_view(), name="stream-ticket"),
 
     # Swagger UI
-    path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
-    path("swagger.json", schema_view.without_ui(cache_timeout=0), name="schema-json"),
+    # Imported on first use, so workers that never serve docs don't load drf_yasg's generator
+    path("swagger/", lazy_view(lambda: schema_ui("swagger")), name="schema-swagger-ui"),
+    path("redoc/", lazy_view(lambda: schema_ui("redoc")), name="schema-redoc"),
+    path("swagger.json", lazy_view(lambda: import_module("autisahara.schema").ApiSchemaView.as_view()),
+         name="schema-json"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,69 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .batch import BatchSerializer, run_batch
+from .compact import CODE_TABLES, CODED_FIELDS
+from .performance import endpoint_stats
+from .stream_tickets import STREAM_TICKET_TTL, issue_stream_ticket
+
+
+class PerformanceStatsView(APIView):
+    """
+    Per-endpoint timing aggregates recorded by PerformanceTimingMiddleware (admin only).
+
+    Each endpoint reports mean/p50/p95/p99/max of total, SQL and serializer
+    time in ms and of the query count, over its most recent samples in this
+    worker process.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(endpoint_stats.summary())
+
+    def delete(self, request):
+        endpoint_stats.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CompactCodesView(APIView):
+    """
+    Code tables of the compact binary (MessagePack/CBOR) responses.
+
+    In those formats the fields listed in `fields` carry the index of their
+    value in the named table instead of the string.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'tables': CODE_TABLES, 'fields': CODED_FIELDS})
+
+
+class BatchView(APIView):
+    """
+    Run several GET endpoints in one round trip (see batch.py).
+
+    Takes {"requests": [{"url": "/api/..."}, ...]} and returns
+    {"responses": [{"status": ..., "body": ...}, ...]} in the same order.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({'responses': run_batch(request, serializer.validated_data['requests'])})
+
+
+class StreamTicketView(APIView):
+    """
+    Single-use ticket for opening an event stream (see stream_tickets.py).
+
+    Returns {"ticket": ..., "expires_in": seconds}; pass it as ?ticket= to the
+    stream URL instead of the access token.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({'ticket': issue_stream_ticket(request.user), 'expires_in': STREAM_TICKET_TTL},
+                        status=status.HTTP_201_CREATED)
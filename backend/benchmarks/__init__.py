@@ -0,0 +1,47 @@
+"""
+Performance benchmarks for the AutiSahara API.
+
+Each benchmark is a standalone script that runs against a throwaway test
+database, so it never touches db.sqlite3. Run from the backend directory:
+
+    python -m benchmarks.bench_registration
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'autisahara.settings')
+    # Keep the per-request timing log out of benchmark output
+    os.environ.setdefault('PERFORMANCE_LOG_LEVEL', 'WARNING')
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create a fresh test database (migrated + cache tables) for the duration of the block"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer():
+    """Yields a dict whose 'seconds' key is filled in when the block exits"""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['seconds'] = time.perf_counter() - start
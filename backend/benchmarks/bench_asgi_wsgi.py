@@ -0,0 +1,140 @@
+"""
+Concurrent-connection throughput of the hot read endpoints: WSGI vs ASGI.
+
+Seeds a throwaway SQLite database, then starts each server in turn and
+drives DoctorPendingPatients, DoctorPatientDetail, TodayTasks and
+ProgressHistory with an increasing number of keep-alive connections.
+The ASGI server runs with ASYNC_READ_VIEWS=True (therapy/async_views.py).
+
+Run with: python -m benchmarks.bench_asgi_wsgi [--concurrency 10 50 200] [--duration 10]
+
+Needs gunicorn and uvicorn installed; a server whose command is missing is skipped.
+Override the commands with --wsgi-cmd / --asgi-cmd ({port} and {workers} are filled in).
+"""
+
+import argparse
+import asyncio
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks.loadgen import run_load, wait_for_port
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_WSGI_CMD = 'gunicorn autisahara.wsgi:application --workers {workers} --bind 127.0.0.1:{port}'
+DEFAULT_ASGI_CMD = 'uvicorn autisahara.asgi:application --workers {workers} --host 127.0.0.1 --port {port}'
+
+
+def seed(families, days):
+    """Create one doctor and `families` parents, each with a child part-way through a curriculum"""
+    from accounts.models import User, Doctor
+    from assessments.models import ChildAssessment, MChatResponse
+    from children.models import Child
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from therapy.models import Curriculum, CurriculumTask, ChildCurriculum, DailyProgress
+
+    doctor_user = User.objects.create_user(email='doctor@bench.local', password='bench123', full_name='Dr. Bench', role='doctor')
+    doctor = Doctor.objects.create(user=doctor_user, license_number='BENCH-1')
+
+    curriculum = Curriculum.objects.create(title='Bench Curriculum', description='Benchmark', duration_days=45, created_by=doctor)
+    tasks = CurriculumTask.objects.bulk_create([
+        CurriculumTask(curriculum=curriculum, day_number=day, title=f'Day {day} task {i}',
+                       why_description='Why ' * 40, instructions='Step. ' * 80, order_index=i)
+        for day in range(1, 46) for i in range(3)
+    ])
+
+    parents = []
+    for n in range(families):
+        parent = User.objects.create_user(email=f'parent{n}@bench.local', password='bench123', full_name=f'Parent {n}', role='parent')
+        child = Child.objects.create(parent=parent, full_name=f'Child {n}', date_of_birth='2022-03-15',
+                                     age_years=2, age_months=n % 12, gender='male')
+        MChatResponse.objects.create(child=child, **{f'q{q}': (q + n) % 4 != 0 for q in range(1, 21)})
+        ChildAssessment.objects.create(child=child, status='pending' if n % 2 else 'accepted',
+                                       assigned_doctor=None if n % 2 else doctor)
+        start = date.today() - timedelta(days=days)
+        child_curriculum = ChildCurriculum.objects.create(
+            child=child, curriculum=curriculum, assigned_by=doctor, start_date=start,
+            end_date=start + timedelta(days=45), current_day=days + 1,
+        )
+        DailyProgress.objects.bulk_create([
+            DailyProgress(child_curriculum=child_curriculum, task=task, day_number=task.day_number,
+                          date=start + timedelta(days=task.day_number - 1), status='done_with_help')
+            for task in tasks if task.day_number <= days
+        ])
+        parents.append((str(RefreshToken.for_user(parent).access_token), child.id))
+
+    return str(RefreshToken.for_user(doctor_user).access_token), parents
+
+
+def request_mix(doctor_token, parents):
+    def make_requests(index):
+        parent_token, child_id = parents[index % len(parents)]
+        doctor = {'Authorization': f'Bearer {doctor_token}'}
+        parent = {'Authorization': f'Bearer {parent_token}'}
+        return [
+            ('GET doctor/pending/', 'GET', '/api/therapy/doctor/pending/', doctor, None),
+            ('GET doctor/patient/<id>/', 'GET', f'/api/therapy/doctor/patient/{child_id}/', doctor, None),
+            ('GET child/<id>/today/', 'GET', f'/api/therapy/child/{child_id}/today/', parent, None),
+            ('GET child/<id>/history/', 'GET', f'/api/therapy/child/{child_id}/history/', parent, None),
+        ]
+    return make_requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--families', type=int, default=50)
+    parser.add_argument('--days', type=int, default=30, help='days of progress per child')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--wsgi-cmd', default=DEFAULT_WSGI_CMD)
+    parser.add_argument('--asgi-cmd', default=DEFAULT_ASGI_CMD)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='autisahara-bench-')
+    env = dict(os.environ, SQLITE_PATH=os.path.join(tmpdir, 'bench.sqlite3'), DEBUG='False')
+    for command in (['migrate'], ['createcachetable']):
+        subprocess.run([sys.executable, 'manage.py', *command, '--verbosity', '0'], cwd=BACKEND_DIR, env=env, check=True)
+
+    os.environ.update(SQLITE_PATH=env['SQLITE_PATH'])
+    from benchmarks import setup_django
+    setup_django()
+    print(f"Seeding {args.families} families with {args.days} days of progress...")
+    doctor_token, parents = seed(args.families, args.days)
+    make_requests = request_mix(doctor_token, parents)
+
+    servers = [
+        ('WSGI', args.wsgi_cmd, {}),
+        ('ASGI', args.asgi_cmd, {'ASYNC_READ_VIEWS': 'True'}),
+    ]
+    for label, command, extra_env in servers:
+        argv = shlex.split(command.format(port=args.port, workers=args.workers))
+        if shutil.which(argv[0]) is None:
+            print(f"\n{label}: '{argv[0]}' not installed, skipping")
+            continue
+
+        process = subprocess.Popen(argv, cwd=BACKEND_DIR, env=dict(env, **extra_env),
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_for_port(args.port):
+                print(f"\n{label}: server did not start, skipping")
+                continue
+            for concurrency in args.concurrency:
+                result = asyncio.run(run_load('127.0.0.1', args.port, make_requests, concurrency, args.duration))
+                result.print_summary(f"{label} ({command.split()[0]}, {args.workers} workers) x {concurrency} connections")
+        finally:
+            process.terminate()
+            process.wait()
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
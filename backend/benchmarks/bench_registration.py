@@ -0,0 +1,77 @@
+"""
+Child registration throughput: one-by-one vs batch.
+
+Run with: python -m benchmarks.bench_registration [--children 200] [--batch-size 50]
+"""
+
+import argparse
+
+from benchmarks import setup_django, test_database, timer
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+
+
+def registration_payload(i):
+    return {
+        'full_name': f'Child {i}',
+        'date_of_birth': '2022-03-15',
+        'age_years': 2,
+        'age_months': i % 12,
+        'gender': ['male', 'female', 'other'][i % 3],
+        'education': {'goes_to_school': False},
+        'health': {'height_cm': '85.5', 'weight_kg': '12.0', 'has_vaccinations': 'complete'},
+        'medical_history': {'family_autism_history': i % 10 == 0},
+    }
+
+
+def make_client(email):
+    user = User.objects.create_user(email=email, password='secret123', full_name='Field Worker', role='parent')
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def run_single(count):
+    client = make_client('single@example.com')
+    with CaptureQueriesContext(connection) as queries, timer() as t:
+        for i in range(count):
+            response = client.post('/api/children/register/', registration_payload(i), format='json')
+            assert response.status_code == 201, response.data
+    return t['seconds'], len(queries)
+
+
+def run_batch(count, batch_size):
+    client = make_client('batch@example.com')
+    with CaptureQueriesContext(connection) as queries, timer() as t:
+        for start in range(0, count, batch_size):
+            payload = {'children': [registration_payload(i) for i in range(start, min(start + batch_size, count))]}
+            response = client.post('/api/children/register/batch/', payload, format='json')
+            assert response.status_code == 201, response.data
+    return t['seconds'], len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--children', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args()
+
+    with test_database():
+        print(f"Registering {args.children} children (batch size {args.batch_size})")
+        print(f"{'mode':<10}{'seconds':>10}{'reg/s':>10}{'queries':>10}{'q/child':>10}")
+        for mode, (seconds, queries) in [
+            ('single', run_single(args.children)),
+            ('batch', run_batch(args.children, args.batch_size)),
+        ]:
+            print(f"{mode:<10}{seconds:>10.3f}{args.children / seconds:>10.1f}"
+                  f"{queries:>10}{queries / args.children:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
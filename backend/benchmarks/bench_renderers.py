@@ -0,0 +1,84 @@
+"""
+Render time per endpoint: DRF's JSONRenderer vs the orjson renderer.
+
+Seeds the query-budget dataset at --scale, fetches every GET endpoint that
+has a query budget, then renders each response's data with both renderers
+and reports the median render time, the speed-up, and whether the bytes
+are identical. Streamed responses (already rendered row by row) are listed
+without timings.
+
+Run with: python -m benchmarks.bench_renderers [--scale 10] [--repeat 50]
+"""
+
+import argparse
+import statistics
+import time
+from importlib import import_module
+
+from benchmarks import setup_django, test_database
+
+setup_django()
+
+from django.urls import reverse  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from autisahara.query_budget import QueryBudgetMixin, seed_dataset  # noqa: E402
+from autisahara.renderers import ORJSONRenderer  # noqa: E402
+
+APPS = ('accounts', 'children', 'assessments', 'therapy', 'reports')
+
+
+def get_budgets():
+    budgets = []
+    for app in APPS:
+        module = import_module(f'{app}.tests')
+        for value in vars(module).values():
+            if isinstance(value, type) and issubclass(value, QueryBudgetMixin) and value is not QueryBudgetMixin:
+                budgets += [b for b in value.budgets if b.method == 'get' and b.status == 200]
+    return budgets
+
+
+def render_ms(renderer, data, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        renderer.render(data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with test_database():
+        data = seed_dataset(args.scale)
+        users = {'parent': data.parent, 'doctor': data.doctor_user, 'admin': data.admin}
+        stdlib, fast = JSONRenderer(), ORJSONRenderer()
+
+        print(f"Render time per endpoint, median of {args.repeat} (seed scale {args.scale})")
+        print(f"{'endpoint':<36}{'KB':>8}{'json ms':>10}{'orjson ms':>11}{'speed-up':>10}  same bytes")
+        totals = [0.0, 0.0]
+        for budget in get_budgets():
+            client = APIClient()
+            if budget.role:
+                client.force_authenticate(users[budget.role])
+            response = client.get(reverse(budget.url_name, kwargs=budget.kwargs(data)))
+            if response.streaming:
+                print(f"{budget.url_name:<36}{'(streamed)':>8}")
+                continue
+            body = stdlib.render(response.data)
+            slow_ms = render_ms(stdlib, response.data, args.repeat)
+            fast_ms = render_ms(fast, response.data, args.repeat)
+            totals[0] += slow_ms
+            totals[1] += fast_ms
+            print(f"{budget.url_name:<36}{len(body) / 1024:>8.1f}{slow_ms:>10.3f}{fast_ms:>11.3f}"
+                  f"{slow_ms / fast_ms:>9.1f}x  {'yes' if fast.render(response.data) == body else 'NO'}")
+        print(f"{'total':<36}{'':>8}{totals[0]:>10.3f}{totals[1]:>11.3f}{totals[0] / totals[1]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
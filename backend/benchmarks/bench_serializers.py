@@ -0,0 +1,84 @@
+"""
+Serialization time on the hot read paths: DRF serializers vs compiled plans.
+
+Seeds the query-budget dataset at --scale and renders, both ways, the lists
+behind curriculum detail (tasks), progress history and doctor progress
+(progress entries with their task) and today's tasks (one serializer per
+row, as TodayTasksView did). Times include the query: the DRF side loads
+model instances (select_related as the views did), the compiled side reads
+.values() rows. Reports the median time, the speed-up and whether the JSON
+bytes are identical.
+
+Run with: python -m benchmarks.bench_serializers [--scale 10] [--repeat 20]
+"""
+
+import argparse
+import statistics
+
+from benchmarks import setup_django, test_database, timer
+
+setup_django()
+
+from autisahara.compiled import compiled  # noqa: E402
+from autisahara.query_budget import seed_dataset  # noqa: E402
+from autisahara.renderers import json_dumps  # noqa: E402
+from therapy.models import CurriculumTask, DailyProgress  # noqa: E402
+from therapy.serializers import CurriculumTaskSerializer, DailyProgressSerializer  # noqa: E402
+
+
+def drf_list(serializer_class, queryset):
+    serializer = serializer_class()  # one instance for all rows, as ListSerializer does
+    return [serializer.to_representation(obj) for obj in queryset]
+
+
+def drf_per_row(serializer_class, queryset):
+    return [serializer_class(obj).data for obj in queryset]
+
+
+def cases(data):
+    tasks = CurriculumTask.objects.filter(curriculum=data.curriculum)
+    progress = DailyProgress.objects.filter(child_curriculum=data.child_curriculum).order_by('-day_number', 'id')
+    today = tasks.filter(day_number=1)
+    return [
+        ('curriculum tasks',
+         lambda: drf_list(CurriculumTaskSerializer, tasks),
+         lambda: list(compiled(CurriculumTaskSerializer).rows(tasks))),
+        ('progress history',
+         lambda: drf_list(DailyProgressSerializer, progress.select_related('task')),
+         lambda: list(compiled(DailyProgressSerializer).rows(progress))),
+        ('today tasks',
+         lambda: drf_per_row(CurriculumTaskSerializer, today),
+         lambda: list(compiled(CurriculumTaskSerializer).rows(today))),
+    ]
+
+
+def median_ms(render, repeat):
+    times = []
+    for _ in range(repeat):
+        with timer() as t:
+            render()
+        times.append(t['seconds'])
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with test_database():
+        data = seed_dataset(args.scale)
+
+        print(f"Serialization time, median of {args.repeat} (seed scale {args.scale})")
+        print(f"{'list':<20}{'rows':>7}{'drf ms':>10}{'compiled ms':>13}{'speed-up':>10}  same bytes")
+        for name, drf, fast in cases(data):
+            expected = drf()
+            drf_ms, fast_ms = median_ms(drf, args.repeat), median_ms(fast, args.repeat)
+            same = json_dumps(fast()) == json_dumps(expected)
+            print(f"{name:<20}{len(expected):>7}{drf_ms:>10.2f}{fast_ms:>13.2f}"
+                  f"{drf_ms / fast_ms:>9.1f}x  {'yes' if same else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
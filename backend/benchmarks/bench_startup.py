@@ -0,0 +1,139 @@
+"""
+Worker start-up cost with eager vs lazy API docs (LAZY_API_DOCS).
+
+For each mode, in fresh interpreters:
+  - import time of booting the app (django.setup() + loading the URLconf),
+    from ``python -X importtime``, in total and for drf_yasg and the
+    libraries it pulls in;
+  - resident memory after boot;
+  - time to first request: from spawning ``runserver --noreload`` until
+    the first HTTP response, and the server's RSS at that point.
+
+Every gunicorn/uvicorn worker pays these costs on (re)start, so the
+difference is the per-worker saving.
+
+Run with: python -m benchmarks.bench_startup [--repeat 5] [--port 8767]
+"""
+
+import argparse
+import http.client
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {'eager': 'False', 'lazy': 'True'}
+
+# Top-level packages only imported for the API docs (yaml and uritemplate
+# are not counted: rest_framework.compat imports them anyway)
+DOCS_PACKAGES = {'drf_yasg', 'swagger_spec_validator', 'ruamel', 'inflection', 'jsonschema'}
+
+BOOT = """
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'autisahara.settings')
+from autisahara.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(rss_kb())
+"""
+
+RSS = """
+def rss_kb(pid='self'):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+"""
+
+exec(RSS)
+
+
+def boot_imports(env):
+    """(total import ms, docs packages import ms, RSS KB) of one boot"""
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', RSS + BOOT], cwd=BACKEND_DIR, env=env,
+                             capture_output=True, text=True, check=True)
+    total = docs = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        total += int(self_us)
+        if name.split('.')[0] in DOCS_PACKAGES:
+            docs += int(self_us)
+    return total / 1000, docs / 1000, int(process.stdout.split()[-1])
+
+
+def first_request(env, port):
+    """(seconds until the first HTTP response, server RSS KB)"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'manage.py', 'runserver', str(port), '--noreload', '--skip-checks'],
+                               cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if process.poll() is not None:
+                sys.exit('Server exited during start-up')
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            try:
+                connection.request('GET', '/api/auth/me/')
+                connection.getresponse().read()
+                return time.perf_counter() - start, rss_kb(process.pid)
+            except OSError:
+                time.sleep(0.005)
+            finally:
+                connection.close()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8767)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='autisahara-startup-')
+    base_env = dict(os.environ, SQLITE_PATH=os.path.join(tmpdir, 'startup.sqlite3'), DEBUG='False',
+                    PERFORMANCE_LOG_LEVEL='WARNING')
+    try:
+        subprocess.run([sys.executable, 'manage.py', 'migrate', '--verbosity', '0'], cwd=BACKEND_DIR, env=base_env,
+                       check=True)
+        envs = {mode: dict(base_env, LAZY_API_DOCS=flag) for mode, flag in MODES.items()}
+        boots = {mode: [] for mode in MODES}
+        starts = {mode: [] for mode in MODES}
+        for env in envs.values():
+            boot_imports(env)  # warm the bytecode cache
+        # Alternate the modes so drift in machine load hits both alike
+        for _ in range(args.repeat):
+            for mode, env in envs.items():
+                boots[mode].append(boot_imports(env))
+                starts[mode].append(first_request(env, args.port))
+        results = {
+            mode: {
+                'import ms': statistics.median(b[0] for b in boots[mode]),
+                'docs import ms': statistics.median(b[1] for b in boots[mode]),
+                'boot RSS MB': statistics.median(b[2] for b in boots[mode]) / 1024,
+                'first request ms': statistics.median(s[0] for s in starts[mode]) * 1000,
+                'server RSS MB': statistics.median(s[1] for s in starts[mode]) / 1024,
+            }
+            for mode in MODES
+        }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    print(f"\nWorker start-up, median of {args.repeat}")
+    print(f"{'':<20}{'eager':>10}{'lazy':>10}{'saving':>10}")
+    for metric in results['eager']:
+        eager, lazy = results['eager'][metric], results['lazy'][metric]
+        print(f"{metric:<20}{eager:>10.1f}{lazy:>10.1f}{eager - lazy:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+End-to-end load test of the parent and doctor journeys.
+
+Parents: register -> full child registration -> M-CHAT -> videos ->
+assessment submit -> daily today's tasks / submit progress / advance day.
+Doctors: pending list -> accept -> assign curriculum -> progress -> review
+-> diagnosis, working through the patients the parents submit.
+
+Every virtual user is a real client on its own keep-alive connection, so
+the numbers include auth, validation and the database. Reports throughput
+and p50/p95/p99 latency per endpoint.
+
+Run with: python -m benchmarks.load_journeys [--parents 40] [--doctors 5] [--duration 60]
+
+By default a throwaway SQLite database is seeded (doctors, curricula and
+--families of background data from generate_synthetic_data) and served with
+--server-cmd. With --no-server the configured database is seeded instead
+and the load goes to a server you already run on --port. SQLite serialises
+writes: under load some writes fail with "database is locked" (counted as
+errors), so use Postgres for capacity numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from benchmarks.loadgen import run_scenarios, timed_request, wait_for_port
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_SERVER_CMD = 'gunicorn autisahara.wsgi:application --workers {workers} --threads 4 --bind 127.0.0.1:{port}'
+FALLBACK_SERVER_CMD = f'{sys.executable} manage.py runserver {{port}} --noreload'
+
+MCHAT_ANSWERS = {f'q{q}': q not in (2, 5, 12) for q in range(1, 21)}
+
+
+class JourneyUser:
+    """One virtual user: a connection, a bearer token and the shared result"""
+
+    def __init__(self, connection, result, deadline):
+        self.connection = connection
+        self.result = result
+        self.deadline = deadline
+        self.token = None
+
+    @property
+    def expired(self):
+        return time.perf_counter() >= self.deadline
+
+    async def call(self, name, method, path, body=None, expect=(200, 201)):
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+        status, content = await timed_request(self.result, self.connection, name, method, path, headers, body, expect)
+        if status not in expect:
+            return status, None
+        return status, json.loads(content) if content else None
+
+    async def login(self, email, password):
+        status, data = await self.call('POST auth/login/', 'POST', '/api/auth/login/',
+                                       {'email': email, 'password': password})
+        self.token = data['tokens']['access'] if data else None
+        return self.token is not None
+
+
+# ============== PARENT JOURNEY ==============
+
+def parent_journey(days, run_id):
+    async def journey(connection, result, index, deadline):
+        user = JourneyUser(connection, result, deadline)
+        round_number = 0
+        while not user.expired:
+            round_number += 1
+            await parent_round(user, f'load-{run_id}-{index}-{round_number}@load.autisahara.test', days)
+    return journey
+
+
+async def parent_round(user, email, days):
+    user.token = None
+    _, data = await user.call('POST auth/register/parent/', 'POST', '/api/auth/register/parent/', {
+        'email': email, 'password': 'loadtest123', 'full_name': 'Load Parent', 'phone': '9800000000',
+    })
+    if not data:
+        return
+    user.token = data['tokens']['access']
+
+    _, child = await user.call('POST children/register/', 'POST', '/api/children/register/', {
+        'full_name': 'Load Child', 'date_of_birth': '2023-01-15', 'age_years': 1, 'age_months': 10,
+        'gender': 'male',
+        'education': {'goes_to_school': False},
+        'health': {'height_cm': '82.0', 'weight_kg': '11.0', 'seen_pediatrician': True},
+        'medical_history': {'family_autism_history': False},
+    })
+    if not child:
+        return
+    child_path = f"/api/children/{child['id']}"
+
+    await user.call('POST children/<id>/mchat/', 'POST', f'{child_path}/mchat/', MCHAT_ANSWERS)
+    for video_type in ('walking', 'playing'):
+        await user.call('POST children/<id>/videos/', 'POST', f'{child_path}/videos/', {
+            'video_type': video_type, 'video_url': f'https://videos.example.com/{video_type}.mp4',
+        })
+    await user.call('POST children/<id>/assessment/submit/', 'POST', f'{child_path}/assessment/submit/',
+                    {'parent_confirmed': True})
+
+    therapy_path = f"/api/therapy/child/{child['id']}"
+    for _ in range(days):
+        if user.expired:
+            return
+        # 404 until a curriculum is active
+        status, today = await user.call('GET therapy/child/<id>/today/', 'GET', f'{therapy_path}/today/',
+                                        expect=(200, 404))
+        if status != 200:
+            await asyncio.sleep(0.5)
+            continue
+        for task in today['tasks']:
+            await user.call('POST therapy/child/<id>/submit/', 'POST', f'{therapy_path}/submit/', {
+                'task_id': task['task']['id'], 'status': 'done_with_help',
+            })
+        await user.call('POST therapy/child/<id>/advance/', 'POST', f'{therapy_path}/advance/')
+
+
+# ============== DOCTOR JOURNEY ==============
+
+def doctor_journey(doctor_emails, password, curriculum_ids):
+    async def journey(connection, result, index, deadline):
+        user = JourneyUser(connection, result, deadline)
+        if not await user.login(doctor_emails[index % len(doctor_emails)], password):
+            return
+        while not user.expired:
+            _, pending = await user.call('GET therapy/doctor/pending/', 'GET', '/api/therapy/doctor/pending/')
+            if not pending:
+                await asyncio.sleep(0.5)
+                continue
+            # Spread doctors over the queue; a patient another doctor took first answers 400
+            patient = pending[index % len(pending)]
+            await doctor_round(user, patient['child_id'], curriculum_ids[index % len(curriculum_ids)])
+    return journey
+
+
+async def doctor_round(user, child_id, curriculum_id):
+    patient_path = f'/api/therapy/doctor/patient/{child_id}'
+    status, _ = await user.call('POST therapy/doctor/patient/<id>/accept/', 'POST', f'{patient_path}/accept/',
+                                expect=(200, 400))
+    if status != 200:
+        return
+    await user.call('GET therapy/doctor/patient/<id>/', 'GET', f'{patient_path}/')
+    await user.call('POST therapy/doctor/patient/<id>/assign/', 'POST', f'{patient_path}/assign/', {
+        'curriculum_id': curriculum_id, 'start_date': date.today().isoformat(),
+    })
+    await user.call('GET therapy/doctor/patient/<id>/progress/', 'GET', f'{patient_path}/progress/')
+    await user.call('POST therapy/doctor/patient/<id>/review/', 'POST', f'{patient_path}/review/', {
+        'review_period': 15, 'observations': 'Engages with caregiver', 'recommendations': 'Continue',
+    })
+    await user.call('POST therapy/doctor/patient/<id>/diagnosis/', 'POST', f'{patient_path}/diagnosis/', {
+        'has_autism': True, 'spectrum_type': 'mild', 'detailed_report': 'Load test report',
+        'next_steps': 'Speech therapy', 'shared_with_parent': True,
+    })
+
+
+# ============== SETUP ==============
+
+def seed(doctors, families):
+    """Doctors, therapy curricula and an assessment curriculum, plus background families"""
+    from django.core.management import call_command
+    from therapy.management.commands.generate_synthetic_data import EMAIL_DOMAIN, PASSWORD
+    from therapy.models import Curriculum, CurriculumTask
+
+    call_command('generate_synthetic_data', families=families, doctors=doctors, clear=True, stdout=open(os.devnull, 'w'))
+
+    if not Curriculum.objects.filter(type='assessment').exists():
+        pre_assessment = Curriculum.objects.create(
+            title='Synthetic Pre-Assessment', description='Observation tasks', duration_days=7, type='assessment',
+        )
+        CurriculumTask.objects.bulk_create([
+            CurriculumTask(curriculum=pre_assessment, day_number=day, title=f'Observe {day}.{i}',
+                           why_description='Observation', instructions='Watch and note', order_index=i)
+            for day in range(1, 8) for i in range(2)
+        ])
+
+    emails = [f'doctor{n}@{EMAIL_DOMAIN}' for n in range(doctors)]
+    curriculum_ids = list(Curriculum.objects.exclude(type='assessment').values_list('id', flat=True))
+    return emails, PASSWORD, curriculum_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--parents', type=int, default=40, help='concurrent parent users')
+    parser.add_argument('--doctors', type=int, default=5, help='concurrent doctor users')
+    parser.add_argument('--days', type=int, default=7, help='therapy days each parent works through per round')
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--families', type=int, default=1000, help='background families in the database')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--server-cmd', default=DEFAULT_SERVER_CMD)
+    parser.add_argument('--no-server', action='store_true', help='target an already running server on --port')
+    args = parser.parse_args()
+
+    tmpdir = None
+    if not args.no_server:
+        tmpdir = tempfile.mkdtemp(prefix='autisahara-load-')
+        os.environ.update(SQLITE_PATH=os.path.join(tmpdir, 'load.sqlite3'))
+        for command in (['migrate'], ['createcachetable']):
+            subprocess.run([sys.executable, 'manage.py', *command, '--verbosity', '0'], cwd=BACKEND_DIR, check=True)
+
+    from benchmarks import setup_django
+    setup_django()
+    print(f"Seeding {args.doctors} doctors and {args.families} background families...")
+    doctor_emails, password, curriculum_ids = seed(args.doctors, args.families)
+
+    process = None
+    try:
+        if not args.no_server:
+            command = args.server_cmd
+            if shutil.which(shlex.split(command)[0]) is None:
+                print(f"'{shlex.split(command)[0]}' not installed, falling back to runserver")
+                command = FALLBACK_SERVER_CMD
+            argv = shlex.split(command.format(port=args.port, workers=args.workers))
+            process = subprocess.Popen(argv, cwd=BACKEND_DIR, env=dict(os.environ, DEBUG='False'),
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if not wait_for_port(args.port):
+                sys.exit('Server did not start')
+
+        scenarios = [
+            (parent_journey(args.days, int(time.time())), args.parents),
+            (doctor_journey(doctor_emails, password, curriculum_ids), args.doctors),
+        ]
+        result = asyncio.run(run_scenarios('127.0.0.1', args.port, scenarios, args.duration))
+        result.print_summary(f"{args.parents} parents + {args.doctors} doctors for {args.duration:.0f}s")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Small asyncio HTTP/1.1 load generator (stdlib only).
+
+Each virtual client keeps one keep-alive connection open and sends requests
+back to back, so `concurrency` is the number of simultaneous connections the
+server has to hold.
+"""
+
+import asyncio
+import json
+import socket
+import time
+from collections import defaultdict
+
+
+class HttpConnection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, headers=None, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = json.dumps(body).encode() if body is not None else b''
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(payload)}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode('latin-1').split("\r\n")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding') == 'chunked':
+            content = await self._read_chunked()
+        else:
+            content = await self.reader.readexactly(int(response_headers.get('content-length', 0)))
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, content
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readuntil(b"\r\n")).strip().split(b';')[0], 16)
+            if size == 0:
+                await self.reader.readuntil(b"\r\n")
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+
+
+class LoadResult:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.seconds = 0.0
+
+    def record(self, name, seconds, ok):
+        self.latencies[name].append(seconds)
+        if not ok:
+            self.errors[name] += 1
+
+    @property
+    def total_requests(self):
+        return sum(len(values) for values in self.latencies.values())
+
+    def summary(self):
+        """Rows of (name, requests, errors, req/s, p50 ms, p95 ms, p99 ms)"""
+        rows = []
+        for name, values in sorted(self.latencies.items()):
+            rows.append((
+                name, len(values), self.errors[name], len(values) / self.seconds,
+                percentile(values, 50) * 1000, percentile(values, 95) * 1000, percentile(values, 99) * 1000,
+            ))
+        return rows
+
+    def print_summary(self, title):
+        print(f"\n{title}: {self.total_requests} requests in {self.seconds:.1f}s "
+              f"({self.total_requests / self.seconds:.1f} req/s)")
+        print(f"{'endpoint':<40}{'reqs':>7}{'errs':>6}{'req/s':>9}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}")
+        for name, count, errors, rate, p50, p95, p99 in self.summary():
+            print(f"{name:<40}{count:>7}{errors:>6}{rate:>9.1f}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+async def timed_request(result, connection, name, method, path, headers=None, body=None, expect=(200, 201)):
+    start = time.perf_counter()
+    try:
+        status, _, content = await connection.request(method, path, headers, body)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        await connection.close()
+        result.record(name, time.perf_counter() - start, ok=False)
+        return None, None
+    result.record(name, time.perf_counter() - start, ok=status in expect)
+    return status, content
+
+
+async def run_load(host, port, make_requests, concurrency, duration):
+    """
+    Drive `concurrency` connections for `duration` seconds.
+
+    make_requests(client_index) returns a list of (name, method, path, headers, body)
+    that each client cycles through.
+    """
+    result = LoadResult()
+    deadline = time.perf_counter() + duration
+
+    async def client(index):
+        connection = HttpConnection(host, port)
+        requests = make_requests(index)
+        i = 0
+        try:
+            while time.perf_counter() < deadline:
+                name, method, path, headers, body = requests[i % len(requests)]
+                await timed_request(result, connection, name, method, path, headers, body)
+                i += 1
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+async def run_scenarios(host, port, scenarios, duration):
+    """
+    Run user journeys for `duration` seconds.
+
+    scenarios is a list of (journey, users); each virtual user awaits
+    journey(connection, result, index, deadline) on its own connection and
+    should return once the deadline has passed.
+    """
+    result = LoadResult()
+    deadline = time.perf_counter() + duration
+
+    async def user(journey, index):
+        connection = HttpConnection(host, port)
+        try:
+            await journey(connection, result, index, deadline)
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        user(journey, index) for journey, users in scenarios for index in range(users)
+    ))
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return True
+        time.sleep(0.2)
+    return False
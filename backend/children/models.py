@@ -154,14 +154,18 @@ class MedicalHistory(models.Model):
     # Auto-flag
     requires_specialist = models.BooleanField(default=False)
 
-    def save(self, *args, **kwargs):
-        # Auto-set requires_specialist if any flag is True
-        self.requires_specialist = any([
+    def needs_specialist(self):
+        """True if any of A1-A4 was answered YES"""
+        return any([
             self.pregnancy_infection,
             self.birth_complications,
             self.brain_injury_first_year,
             self.family_autism_history
         ])
+
+    def save(self, *args, **kwargs):
+        # Auto-set requires_specialist if any flag is True
+        self.requires_specialist = self.needs_specialist()
         super().save(*args, **kwargs)
 
     def __str__(self):
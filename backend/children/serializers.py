@@ -1,27 +1,45 @@
+from django.db import transaction
 from rest_framework import serializers
+from autisahara.fieldsets import SparseFieldsMixin
+from autisahara.performance import TimedSerializerMixin
 from .models import Child, ChildEducation, ChildHealth, MedicalHistory
 
+# Optional one-to-one sections of a full registration: (field name, model)
+REGISTRATION_SECTIONS = [
+    ('education', ChildEducation),
+    ('health', ChildHealth),
+    ('medical_history', MedicalHistory),
+]
 
-class ChildEducationSerializer(serializers.ModelSerializer):
+# Upper bound for one batch registration request
+MAX_BATCH_REGISTRATIONS = 100
+
+
+def _mark_section_missing(child, name):
+    """Cache an empty reverse one-to-one so serializing the child doesn't query for it"""
+    Child._meta.get_field(name).set_cached_value(child, None)
+
+
+class ChildEducationSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ChildEducation
         exclude = ['child']
 
 
-class ChildHealthSerializer(serializers.ModelSerializer):
+class ChildHealthSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ChildHealth
         exclude = ['child']
 
 
-class MedicalHistorySerializer(serializers.ModelSerializer):
+class MedicalHistorySerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = MedicalHistory
         exclude = ['child']
         read_only_fields = ['requires_specialist']
 
 
-class ChildSerializer(serializers.ModelSerializer):
+class ChildSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Basic child serializer for list/create operations"""
     class Meta:
         model = Child
@@ -29,7 +47,7 @@ class ChildSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class ChildDetailSerializer(serializers.ModelSerializer):
+class ChildDetailSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Detailed child serializer with nested education, health, medical history"""
     education = ChildEducationSerializer(read_only=True)
     health = ChildHealthSerializer(read_only=True)
@@ -45,7 +63,7 @@ class ChildDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class ChildCreateSerializer(serializers.ModelSerializer):
+class ChildCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for creating a child with all sections at once (optional)"""
     education = ChildEducationSerializer(required=False)
     health = ChildHealthSerializer(required=False)
@@ -105,19 +123,66 @@ class ChildFullRegistrationSerializer(serializers.Serializer):
     medical_history = MedicalHistorySerializer(required=False)
 
     def create(self, validated_data):
-        education_data = validated_data.pop('education', None)
-        health_data = validated_data.pop('health', None)
-        medical_history_data = validated_data.pop('medical_history', None)
+        sections = {name: validated_data.pop(name, None) for name, _ in REGISTRATION_SECTIONS}
 
-        # Create the child
-        child = Child.objects.create(**validated_data)
+        # One transaction: the child and its sections are saved together or not at all.
+        # The created objects are cached on the child, so ChildDetailSerializer
+        # can render the response without reading them back.
+        with transaction.atomic():
+            child = Child.objects.create(**validated_data)
 
-        # Create related objects if provided
-        if education_data:
-            ChildEducation.objects.create(child=child, **education_data)
-        if health_data:
-            ChildHealth.objects.create(child=child, **health_data)
-        if medical_history_data:
-            MedicalHistory.objects.create(child=child, **medical_history_data)
+            for name, model in REGISTRATION_SECTIONS:
+                if sections[name]:
+                    model.objects.create(child=child, **sections[name])
+                else:
+                    _mark_section_missing(child, name)
 
         return child
+
+
+class ChildBatchRegistrationSerializer(serializers.Serializer):
+    """
+    Register many children in ONE call (NGO field workers on one tablet session).
+
+    Each entry has the same shape as ChildFullRegistrationSerializer.
+    The whole batch is saved in one transaction with one bulk INSERT per table,
+    so the statement count does not grow with the number of children.
+    """
+    children = ChildFullRegistrationSerializer(many=True)
+
+    def validate_children(self, value):
+        if not value:
+            raise serializers.ValidationError("At least one child is required.")
+        if len(value) > MAX_BATCH_REGISTRATIONS:
+            raise serializers.ValidationError(
+                f"At most {MAX_BATCH_REGISTRATIONS} children can be registered at once."
+            )
+        return value
+
+    def create(self, validated_data):
+        parent = validated_data['parent']
+        entries = validated_data['children']
+        section_names = {name for name, _ in REGISTRATION_SECTIONS}
+
+        with transaction.atomic():
+            children = Child.objects.bulk_create([
+                Child(parent=parent, **{k: v for k, v in entry.items() if k not in section_names})
+                for entry in entries
+            ])
+
+            for name, model in REGISTRATION_SECTIONS:
+                objs = []
+                for child, entry in zip(children, entries):
+                    if entry.get(name):
+                        objs.append(model(child=child, **entry[name]))
+                    else:
+                        _mark_section_missing(child, name)
+
+                # bulk_create skips save(), so apply the A1-A4 auto-flag here
+                if model is MedicalHistory:
+                    for history in objs:
+                        history.requires_specialist = history.needs_specialist()
+
+                model.objects.bulk_create(objs)
+
+        return children
@@ -1,3 +1,92 @@
+from unittest import mock
+
+from django.db import IntegrityError
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from autisahara.query_budget import EndpointBudget, QueryBudgetMixin, create_family
+
+from .models import ChildHealth, MedicalHistory
+from .serializers import MAX_BATCH_REGISTRATIONS
+
+
+def registration(name='Aarav Sharma'):
+    return {
+        'full_name': name, 'date_of_birth': '2022-03-15', 'age_years': 2, 'age_months': 8, 'gender': 'male',
+        'education': {'goes_to_school': True, 'school_name': 'ABC School'},
+        'health': {'height_cm': '85.0', 'weight_kg': '12.0'},
+        'medical_history': {'family_autism_history': False},
+    }
+
+
+def child_id(d):
+    return {'pk': d.child.id}
+
+
+class ChildrenQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budgets = [
+        EndpointBudget('child-full-registration', 'post', status=201, max_queries=4, data=lambda d: registration()),
+        EndpointBudget('child-batch-registration', 'post', status=201, max_queries=4, data=lambda d: {
+            'children': [registration(f'Child {i}') for i in range(5)],
+        }),
+        EndpointBudget('child-list-create', max_queries=1),
+        EndpointBudget('child-list-create', 'post', status=201, max_queries=1, data=lambda d: {
+            'full_name': 'Sita', 'date_of_birth': '2022-03-15', 'age_years': 2, 'age_months': 8, 'gender': 'female',
+        }),
+        EndpointBudget('child-detail', kwargs=child_id, max_queries=4),
+        EndpointBudget('child-detail', 'put', kwargs=child_id, max_queries=2, data=lambda d: {'age_months': 9}),
+        # Cascades load the rows whose deletion signals receivers (adherence, dashboard counters);
+        # each cached count they drop is a DELETE on the shared cache table, once per cascade
+        EndpointBudget('child-detail', 'delete', kwargs=child_id, status=204, max_queries=22),
+        EndpointBudget('child-education', kwargs=child_id, max_queries=2),
+        EndpointBudget('child-education', 'post', kwargs=child_id, status=201, max_queries=3,
+                       data=lambda d: {'grade_class': 'Nursery'}),
+        EndpointBudget('child-health', kwargs=child_id, max_queries=2),
+        EndpointBudget('child-health', 'post', kwargs=child_id, status=201, max_queries=3,
+                       data=lambda d: {'weight_kg': '12.5'}),
+        EndpointBudget('child-medical-history', kwargs=child_id, max_queries=2),
+        EndpointBudget('child-medical-history', 'post', kwargs=child_id, status=201, max_queries=3,
+                       data=lambda d: {'birth_complications': True}),
+    ]
+
+
+class ChildBatchRegistrationTests(TestCase):
+    url = '/api/children/register/batch/'
+
+    def setUp(self):
+        self.parent = create_family(1000)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.parent)
+        self.children_before = self.parent.children.count()
+
+    def register(self, entries):
+        return self.client.post(self.url, {'children': entries}, format='json')
+
+    def test_one_invalid_entry_saves_nothing(self):
+        invalid = dict(registration('No Birthday'), date_of_birth='not a date')
+        response = self.register([registration('Valid Child'), invalid])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data['children'][1]), ['date_of_birth'])
+        self.assertEqual(self.parent.children.count(), self.children_before)
+
+    def test_failed_insert_rolls_back_the_batch(self):
+        with mock.patch.object(MedicalHistory.objects, 'bulk_create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.register([registration(f'Child {i}') for i in range(3)])
+        self.assertEqual(self.parent.children.count(), self.children_before)
+        self.assertFalse(ChildHealth.objects.filter(child__parent=self.parent, child__full_name='Child 0').exists())
+
+    def test_batch_size_is_limited(self):
+        entries = [registration(f'Child {i}') for i in range(MAX_BATCH_REGISTRATIONS + 1)]
+        self.assertEqual(self.register(entries).status_code, 400)
+        self.assertEqual(self.register([]).status_code, 400)
+        self.assertEqual(self.register(entries[:MAX_BATCH_REGISTRATIONS]).status_code, 201)
+        self.assertEqual(self.parent.children.count(), self.children_before + MAX_BATCH_REGISTRATIONS)
 
-# Create your tests here.
+    def test_specialist_flag_is_set_on_bulk_insert(self):
+        flagged = dict(registration('Flagged'), medical_history={'family_autism_history': True})
+        response = self.register([registration('Unflagged'), flagged])
+        self.assertEqual(response.status_code, 201)
+        flags = dict(MedicalHistory.objects.filter(child__parent=self.parent)
+                     .values_list('child__full_name', 'requires_specialist'))
+        self.assertEqual(flags, {'Unflagged': False, 'Flagged': True})
@@ -6,11 +6,13 @@ from .views import (
     ChildHealthView,
     MedicalHistoryView,
     ChildFullRegistrationView,
+    ChildBatchRegistrationView,
 )
 
 urlpatterns = [
     # Full Registration (ONE endpoint for all sections)
     path('register/', ChildFullRegistrationView.as_view(), name='child-full-registration'),
+    path('register/batch/', ChildBatchRegistrationView.as_view(), name='child-batch-registration'),
 
     # Child CRUD
     path('', ChildListCreateView.as_view(), name='child-list-create'),
@@ -3,8 +3,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from autisahara.docs import openapi, swagger_auto_schema
+
+from autisahara.fieldsets import sparse_queryset
+from autisahara.idempotency import idempotent
 
 from .models import Child, ChildEducation, ChildHealth, MedicalHistory
 from .serializers import (
@@ -15,6 +17,7 @@ from .serializers import (
     ChildHealthSerializer,
     MedicalHistorySerializer,
     ChildFullRegistrationSerializer,
+    ChildBatchRegistrationSerializer,
 )
 
 
@@ -40,8 +43,8 @@ class ChildListCreateView(APIView):
         tags=["Children"]
     )
     def get(self, request):
-        children = Child.objects.filter(parent=request.user)
-        serializer = ChildSerializer(children, many=True)
+        children = sparse_queryset(Child.objects.filter(parent=request.user), ChildSerializer, request)
+        serializer = ChildSerializer(children, many=True, context={'request': request})
         return Response(serializer.data)
 
     @swagger_auto_schema(
@@ -118,8 +121,9 @@ class ChildDetailView(APIView):
         tags=["Children"]
     )
     def get(self, request, pk):
-        child = self.get_child(pk, request.user)
-        serializer = ChildDetailSerializer(child)
+        children = sparse_queryset(Child.objects.all(), ChildDetailSerializer, request)
+        child = get_object_or_404(children, pk=pk, parent=request.user)
+        serializer = ChildDetailSerializer(child, context={'request': request})
         return Response(serializer.data)
 
     @swagger_auto_schema(
@@ -191,7 +195,7 @@ class ChildEducationView(APIView):
         child = self.get_child(pk, request.user)
         try:
             education = child.education
-            return Response(ChildEducationSerializer(education).data)
+            return Response(ChildEducationSerializer(education, context={'request': request}).data)
         except ChildEducation.DoesNotExist:
             return Response({'detail': 'Education info not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -263,7 +267,7 @@ class ChildHealthView(APIView):
         child = self.get_child(pk, request.user)
         try:
             health = child.health
-            return Response(ChildHealthSerializer(health).data)
+            return Response(ChildHealthSerializer(health, context={'request': request}).data)
         except ChildHealth.DoesNotExist:
             return Response({'detail': 'Health info not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -341,7 +345,7 @@ class MedicalHistoryView(APIView):
         child = self.get_child(pk, request.user)
         try:
             history = child.medical_history
-            return Response(MedicalHistorySerializer(history).data)
+            return Response(MedicalHistorySerializer(history, context={'request': request}).data)
         except MedicalHistory.DoesNotExist:
             return Response({'detail': 'Medical history not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -431,6 +435,10 @@ class ChildFullRegistrationView(APIView):
         }
         ```
 
+        **Retries**: Send an `Idempotency-Key` header (e.g. a UUID generated when
+        the form is submitted). Retries with the same key replay the first
+        response instead of registering the child again.
+
         **After this**: Proceed to M-CHAT screening via POST /api/children/{id}/mchat/
         """,
         request_body=ChildFullRegistrationSerializer,
@@ -456,6 +464,7 @@ class ChildFullRegistrationView(APIView):
         },
         tags=["Children"]
     )
+    @idempotent
     def post(self, request):
         serializer = ChildFullRegistrationSerializer(data=request.data)
         if serializer.is_valid():
@@ -466,3 +475,57 @@ class ChildFullRegistrationView(APIView):
                 status=status.HTTP_201_CREATED
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ChildBatchRegistrationView(APIView):
+    """
+    Register several children with ALL sections in ONE API call.
+    Used by NGO field workers who register many families from one tablet session.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Batch child registration (all sections)",
+        operation_description="""
+        Creates up to 100 child profiles, each with its related sections, in ONE API call.
+
+        **Use Case**: Field workers collect registrations offline during a visit,
+        then upload the whole session at once.
+
+        **Behaviour**:
+        - Each entry in `children` has the same shape as POST /api/children/register/
+        - The batch is all-or-nothing: if any entry is invalid, nothing is saved
+          and the errors are returned per entry
+        - Send an `Idempotency-Key` header so a retried upload does not
+          register the children twice
+
+        **Example Request**:
+        ```json
+        {
+            "children": [
+                {"full_name": "Aarav Sharma", "date_of_birth": "2022-03-15",
+                 "age_years": 2, "age_months": 8, "gender": "male"},
+                {"full_name": "Sita Rai", "date_of_birth": "2021-11-02",
+                 "age_years": 3, "age_months": 0, "gender": "female",
+                 "medical_history": {"family_autism_history": true}}
+            ]
+        }
+        ```
+        """,
+        request_body=ChildBatchRegistrationSerializer,
+        responses={
+            201: ChildDetailSerializer(many=True),
+            400: "Validation error"
+        },
+        tags=["Children"]
+    )
+    @idempotent
+    def post(self, request):
+        serializer = ChildBatchRegistrationSerializer(data=request.data)
+        if serializer.is_valid():
+            children = serializer.save(parent=request.user)
+            return Response(
+                ChildDetailSerializer(children, many=True).data,
+                status=status.HTTP_201_CREATED
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -1,3 +1,14 @@
 from django.contrib import admin
+from .models import RegionalWeeklySummary, SummaryRefresh
 
-# Register your models here.
+
+@admin.register(RegionalWeeklySummary)
+class RegionalWeeklySummaryAdmin(admin.ModelAdmin):
+    list_display = ['province', 'district', 'week_start', 'screenings', 'high_risk', 'acceptances', 'diagnoses']
+    list_filter = ['province', 'week_start']
+    search_fields = ['district']
+
+
+@admin.register(SummaryRefresh)
+class SummaryRefreshAdmin(admin.ModelAdmin):
+    list_display = ['name', 'refreshed_at', 'weeks_refreshed']
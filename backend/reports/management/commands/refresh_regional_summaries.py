@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reports.summaries import refresh_regional_summaries
+
+
+class Command(BaseCommand):
+    help = 'Refresh the regional screening summaries (schedule every few minutes, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rebuild every week, not just those since the last refresh (after backfills)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rows, since = refresh_regional_summaries(full=options['full'])
+        scope = f'weeks from {since}' if since else 'all weeks'
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed {scope}: {rows} summary rows in {time.perf_counter() - start:.2f}s'
+        ))
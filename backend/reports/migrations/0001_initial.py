@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SummaryRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('refreshed_at', models.DateTimeField()),
+                ('weeks_refreshed', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RegionalWeeklySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('province', models.CharField(blank=True, max_length=20)),
+                ('district', models.CharField(blank=True, max_length=255)),
+                ('week_start', models.DateField(help_text='Monday of the week')),
+                ('screenings', models.PositiveIntegerField(default=0)),
+                ('high_risk', models.PositiveIntegerField(default=0)),
+                ('medium_risk', models.PositiveIntegerField(default=0)),
+                ('submissions', models.PositiveIntegerField(default=0)),
+                ('acceptances', models.PositiveIntegerField(default=0)),
+                ('acceptance_hours', models.FloatField(default=0, help_text='Sum of submission-to-acceptance times')),
+                ('diagnoses', models.PositiveIntegerField(default=0)),
+                ('diagnosed_mild', models.PositiveIntegerField(default=0)),
+                ('diagnosed_moderate', models.PositiveIntegerField(default=0)),
+                ('diagnosed_severe', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['province', 'district', 'week_start'],
+                'indexes': [models.Index(fields=['week_start'], name='reports_reg_week_st_909897_idx')],
+                'constraints': [models.UniqueConstraint(fields=('province', 'district', 'week_start'), name='unique_regional_week')],
+            },
+        ),
+    ]
@@ -1,3 +1,64 @@
 from django.db import models
 
-# Create your models here.
+
+class RegionalWeeklySummary(models.Model):
+    """
+    Materialized screening statistics per district and week.
+
+    Every event counts in the week it happened (Asia/Kathmandu): screenings
+    by M-CHAT submission, submissions by submitted_at, acceptances by
+    reviewed_at, diagnoses by report date. Maintained by
+    ``manage.py refresh_regional_summaries``; see summaries.py.
+    """
+    province = models.CharField(max_length=20, blank=True)
+    district = models.CharField(max_length=255, blank=True)
+    week_start = models.DateField(help_text="Monday of the week")
+
+    # M-CHAT screenings completed, by risk level
+    screenings = models.PositiveIntegerField(default=0)
+    high_risk = models.PositiveIntegerField(default=0)
+    medium_risk = models.PositiveIntegerField(default=0)
+
+    # Assessments submitted to doctors, and accepted by one
+    submissions = models.PositiveIntegerField(default=0)
+    acceptances = models.PositiveIntegerField(default=0)
+    acceptance_hours = models.FloatField(default=0, help_text="Sum of submission-to-acceptance times")
+
+    # Diagnosis reports
+    diagnoses = models.PositiveIntegerField(default=0)
+    diagnosed_mild = models.PositiveIntegerField(default=0)
+    diagnosed_moderate = models.PositiveIntegerField(default=0)
+    diagnosed_severe = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['province', 'district', 'week_start']
+        constraints = [
+            models.UniqueConstraint(fields=['province', 'district', 'week_start'], name='unique_regional_week'),
+        ]
+        indexes = [models.Index(fields=['week_start'])]
+
+    def __str__(self):
+        return f"{self.district or '-'}, {self.province or '-'} week of {self.week_start}: {self.screenings} screenings"
+
+
+class SummaryRefresh(models.Model):
+    """Watermark of the last refresh of a materialized summary"""
+    name = models.CharField(max_length=50, unique=True)
+    refreshed_at = models.DateTimeField()
+    weeks_refreshed = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} refreshed {self.refreshed_at}"
+
+
+class StaleSummaryWeek(models.Model):
+    """
+    A week whose summarized events changed after they were counted: an
+    assessment resubmitted, accepted or sent back moves its counts out of
+    the week of its previous submitted_at/reviewed_at. The next refresh
+    recomputes the week and drops the row.
+    """
+    week_start = models.DateField(unique=True, help_text="Monday of the week")
+
+    def __str__(self):
+        return f"Stale summary week of {self.week_start}"
@@ -0,0 +1,29 @@
+from django.db.models import DEFERRED
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from assessments.models import ChildAssessment
+
+from .models import StaleSummaryWeek
+from .summaries import week_start
+
+
+@receiver(post_save, sender=ChildAssessment)
+def mark_summarized_weeks_stale(sender, instance, created, raw=False, **kwargs):
+    """
+    An assessment whose status or timestamps changed leaves its old week's
+    counts behind (a resubmission moves submitted_at to now): log the weeks
+    of the old and new timestamps for the next incremental refresh.
+    """
+    current = tuple(getattr(instance, name) for name in ChildAssessment.SUMMARIZED_FIELDS)
+    loaded = getattr(instance, '_summarized', None)
+    instance._summarized = current
+    if raw or created or loaded is None or loaded == current:
+        return
+    _, *old_times = loaded
+    _, *new_times = current
+    weeks = {week_start(timezone.localdate(moment)) for moment in old_times + new_times
+             if moment is not None and moment is not DEFERRED}
+    StaleSummaryWeek.objects.bulk_create([StaleSummaryWeek(week_start=week) for week in weeks],
+                                         ignore_conflicts=True)
@@ -0,0 +1,184 @@
+"""
+Materialized regional screening statistics.
+
+RegionalWeeklySummary holds one row per (province, district, week) with
+that week's screenings, risk levels, assessment submissions, acceptances
+and diagnoses. Dashboards sum these rows instead of joining responses,
+assessments and reports to the parents' addresses on every load.
+
+refresh_regional_summaries() is run by a scheduled job. Events are counted
+in the week they happen, so a refresh recomputes the weeks from the
+previous refresh on (a handful of aggregate queries over recent rows) and
+replaces those rows, plus any older week whose events changed since:
+
+- M-CHAT responses and diagnosis reports count in the week they were
+  created; rows updated since the last refresh (a re-posted M-CHAT with a
+  new risk level) mark their creation week;
+- an assessment counts in the weeks of its submitted_at and reviewed_at,
+  which a resubmission or review moves; signals.py logs the weeks it
+  leaves in StaleSummaryWeek.
+
+``full=True`` rebuilds everything; use it after backfills, rescoring,
+deletions or queryset.update(), which change the past without a trace.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, DateField, DurationField, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncWeek
+from django.utils import timezone
+
+from assessments.models import ChildAssessment, MChatResponse
+from therapy.models import DiagnosisReport
+
+from .models import RegionalWeeklySummary, StaleSummaryWeek, SummaryRefresh
+
+REFRESH_NAME = 'regional_weekly'
+
+# Rows committed shortly after a refresh may carry an earlier timestamp
+LATE_ARRIVAL = timedelta(hours=1)
+
+COUNTERS = [
+    'screenings', 'high_risk', 'medium_risk', 'submissions', 'acceptances', 'acceptance_hours',
+    'diagnoses', 'diagnosed_mild', 'diagnosed_moderate', 'diagnosed_severe',
+]
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def _week_begins(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _weekly(queryset, timestamp, since, weeks, **aggregates):
+    """Aggregates of queryset per (province, district, week of timestamp), for since on and weeks"""
+    queryset = queryset.filter(**{f'{timestamp}__isnull': False})
+    if since is not None:
+        selected = Q(**{f'{timestamp}__gte': _week_begins(since)})
+        for week in weeks:
+            selected |= Q(**{f'{timestamp}__gte': _week_begins(week),
+                             f'{timestamp}__lt': _week_begins(week + timedelta(weeks=1))})
+        queryset = queryset.filter(selected)
+    return (
+        queryset
+        .annotate(
+            province=Coalesce(F('child__parent__parent_details__province'), Value('')),
+            district=Coalesce(F('child__parent__parent_details__district'), Value('')),
+            week=TruncWeek(timestamp, output_field=DateField()),
+        )
+        .values('province', 'district', 'week')
+        .annotate(**aggregates)
+        .order_by()
+    )
+
+
+def compute_summaries(since=None, weeks=()):
+    """RegionalWeeklySummary rows (unsaved) for the weeks starting on or after since and weeks (all if no since)"""
+    accepted = ChildAssessment.objects.filter(status__in=['accepted', 'completed'], submitted_at__isnull=False)
+    waited = ExpressionWrapper(F('reviewed_at') - F('submitted_at'), output_field=DurationField())
+    sources = [
+        _weekly(MChatResponse.objects, 'created_at', since, weeks, screenings=Count('pk'),
+                high_risk=Count('pk', filter=Q(risk_level='high')),
+                medium_risk=Count('pk', filter=Q(risk_level='medium'))),
+        _weekly(ChildAssessment.objects, 'submitted_at', since, weeks, submissions=Count('pk')),
+        _weekly(accepted, 'reviewed_at', since, weeks, acceptances=Count('pk'), waited=Sum(waited)),
+        _weekly(DiagnosisReport.objects, 'created_at', since, weeks, diagnoses=Count('pk'),
+                diagnosed_mild=Count('pk', filter=Q(spectrum_type='mild')),
+                diagnosed_moderate=Count('pk', filter=Q(spectrum_type='moderate')),
+                diagnosed_severe=Count('pk', filter=Q(spectrum_type='severe'))),
+    ]
+
+    weeks = defaultdict(dict)
+    for rows in sources:
+        for row in rows:
+            waited_total = row.pop('waited', None)
+            if waited_total is not None:
+                row['acceptance_hours'] = waited_total.total_seconds() / 3600
+            weeks[row.pop('province'), row.pop('district'), row.pop('week')].update(row)
+
+    return [
+        RegionalWeeklySummary(province=province, district=district, week_start=week, **counts)
+        for (province, district, week), counts in weeks.items()
+    ]
+
+
+def changed_weeks(changed_since):
+    """Weeks with events changed since changed_since, besides those it falls in"""
+    weeks = set(StaleSummaryWeek.objects.values_list('week_start', flat=True))
+    for model in (MChatResponse, DiagnosisReport):
+        weeks.update(
+            model.objects.filter(updated_at__gte=changed_since)
+            .annotate(week=TruncWeek('created_at', output_field=DateField()))
+            .values_list('week', flat=True).distinct().order_by()
+        )
+    return weeks
+
+
+def refresh_regional_summaries(full=False, now=None):
+    """Recompute the weeks since the last refresh and older changed weeks (or everything); returns (rows, since)"""
+    now = now or timezone.now()
+    state = SummaryRefresh.objects.filter(name=REFRESH_NAME).first()
+    since, weeks = None, set()
+    if state is not None and not full:
+        changed_since = state.refreshed_at - LATE_ARRIVAL
+        since = week_start(timezone.localdate(changed_since))
+        weeks = {week for week in changed_weeks(changed_since) if week < since}
+
+    summaries = compute_summaries(since, weeks)
+    with transaction.atomic():
+        stale = RegionalWeeklySummary.objects.all()
+        if since is not None:
+            stale = stale.filter(Q(week_start__gte=since) | Q(week_start__in=weeks))
+        stale.delete()
+        logged = StaleSummaryWeek.objects.all()
+        if since is not None:
+            logged = logged.filter(Q(week_start__gte=since) | Q(week_start__in=weeks))
+        logged.delete()
+        RegionalWeeklySummary.objects.bulk_create(summaries, batch_size=1000)
+        SummaryRefresh.objects.update_or_create(name=REFRESH_NAME, defaults={
+            'refreshed_at': now, 'weeks_refreshed': len({summary.week_start for summary in summaries}),
+        })
+    return len(summaries), since
+
+
+def regional_dashboard(weeks, level='province', province=None, district=None, today=None):
+    """Totals and weekly series per province (or district) over the last `weeks` weeks"""
+    first_week = week_start(today or timezone.localdate()) - timedelta(weeks=weeks - 1)
+    summaries = RegionalWeeklySummary.objects.filter(week_start__gte=first_week)
+    if province:
+        summaries = summaries.filter(province=province)
+    if district:
+        summaries = summaries.filter(district=district)
+
+    region_fields = ['province'] if level == 'province' else ['province', 'district']
+    rows = (
+        summaries.values(*region_fields, 'week_start')
+        .annotate(**{f'sum_{name}': Sum(name) for name in COUNTERS})
+        .order_by(*region_fields, 'week_start')
+    )
+
+    regions = {}
+    for row in rows:
+        key = tuple(row[name] for name in region_fields)
+        region = regions.setdefault(key, {
+            **{name: row[name] for name in region_fields}, **{name: 0 for name in COUNTERS}, 'weeks': [],
+        })
+        week = {name: row[f'sum_{name}'] for name in COUNTERS}
+        for name in COUNTERS:
+            region[name] += week[name]
+        region['weeks'].append({
+            'week_start': row['week_start'], 'screenings': week['screenings'], 'high_risk': week['high_risk'],
+            'submissions': week['submissions'], 'acceptances': week['acceptances'], 'diagnoses': week['diagnoses'],
+        })
+
+    for region in regions.values():
+        screenings, acceptances = region['screenings'], region['acceptances']
+        hours = region.pop('acceptance_hours')
+        region['high_risk_rate'] = round(region['high_risk'] / screenings, 4) if screenings else None
+        region['mean_hours_to_acceptance'] = round(hours / acceptances, 1) if acceptances else None
+        region['screenings_per_week'] = round(screenings / weeks, 2)
+    return first_week, list(regions.values())
@@ -1,3 +1,83 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from assessments import scoring
+from assessments.models import ChildAssessment, MChatResponse
+from autisahara.query_budget import EndpointBudget, QueryBudgetMixin, create_family, seed_dataset
+
+from .models import RegionalWeeklySummary, StaleSummaryWeek
+from .summaries import refresh_regional_summaries
+
+
+def summary_rows():
+    return list(RegionalWeeklySummary.objects.order_by('province', 'district', 'week_start').values_list(
+        'province', 'district', 'week_start', 'screenings', 'high_risk', 'submissions', 'acceptances', 'diagnoses',
+    ))
+
+
+class ReportsQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budgets = [
+        EndpointBudget('regional-dashboard', role='doctor', max_queries=2),
+    ]
+
+
+class RegionalSummaryTests(TestCase):
+    def test_incremental_refresh_matches_full_rebuild(self):
+        data = seed_dataset(1)
+        refresh_regional_summaries(now=timezone.now() - timedelta(minutes=5))
+
+        # New activity after the first refresh
+        _, child = create_family(1000)
+        ChildAssessment.objects.filter(child=child).update(submitted_at=timezone.now())
+        ChildAssessment.objects.filter(child=data.pending_child).update(
+            status='accepted', assigned_doctor=data.doctor, reviewed_at=timezone.now(),
+        )
+        rows, since = refresh_regional_summaries()
+        self.assertIsNotNone(since)
+        incremental = summary_rows()
+
+        refresh_regional_summaries(full=True)
+        self.assertEqual(summary_rows(), incremental)
+
+        self.assertEqual(sum(row[3] for row in incremental), MChatResponse.objects.count())
+
+    def test_dashboard_reports_region_totals(self):
+        data = seed_dataset(1)
+        refresh_regional_summaries()
+        self.client = APIClient()
+        self.client.force_authenticate(data.doctor_user)
+
+        response = self.client.get('/api/reports/regional/?level=district&province=bagmati')
+        self.assertEqual(response.status_code, 200)
+        [region] = response.data['regions']
+        self.assertEqual((region['district'], region['screenings']), ('Kathmandu', 1))
+        self.assertEqual(self.client.get('/api/reports/regional/?weeks=0').status_code, 400)
+
+    def test_changes_to_summarized_weeks_are_refreshed(self):
+        data = seed_dataset(1)
+        refresh_regional_summaries(now=timezone.now() - timedelta(minutes=5))
+        client = APIClient()
+        client.force_authenticate(data.parent)
+
+        # Moves submitted_at (seeded weeks ago) to now
+        response = client.post(f'/api/children/{data.child.id}/assessment/submit/', {'parent_confirmed': True},
+                               format='json')
+        self.assertEqual(response.status_code, 201)
+        # Keeps created_at (weeks ago) but changes the risk level
+        answers = {f'q{q}': q in scoring.REVERSE_QUESTIONS for q in range(1, 21)}
+        self.assertEqual(client.post(f'/api/children/{data.child.id}/mchat/', answers, format='json').status_code, 201)
+        self.assertEqual(MChatResponse.objects.get(child=data.child).risk_level, 'high')
+
+        refresh_regional_summaries()
+        incremental = summary_rows()
+        self.assertEqual(sum(row[5] for row in incremental),
+                         ChildAssessment.objects.filter(submitted_at__isnull=False).count())
+        self.assertEqual(sum(row[4] for row in incremental), MChatResponse.objects.filter(risk_level='high').count())
+        self.assertFalse(StaleSummaryWeek.objects.exists())
 
-# Create your tests here.
+        refresh_regional_summaries(full=True)
+        self.assertEqual(summary_rows(), incremental)
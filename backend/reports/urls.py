@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import RegionalDashboardView
+
+urlpatterns = [
+    path('regional/', RegionalDashboardView.as_view(), name='regional-dashboard'),
+]
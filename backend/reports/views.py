@@ -1,3 +1,67 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from autisahara.docs import openapi, swagger_auto_schema
 
-# Create your views here.
+from accounts.models import ParentDetails
+from .models import SummaryRefresh
+from .summaries import REFRESH_NAME, regional_dashboard
+
+MAX_WEEKS = 104
+
+
+class RegionalDashboardView(APIView):
+    """
+    Province/district screening statistics (doctors and admins).
+    Read from the materialized RegionalWeeklySummary table.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Regional screening dashboard",
+        operation_description="""
+        Screenings, high-risk rate, time to doctor acceptance and diagnoses
+        per province (or district with `level=district`) over the last
+        `weeks` weeks (default 12), with a weekly series.
+
+        Figures come from summary tables refreshed by a scheduled job;
+        `refreshed_at` tells how current they are.
+        """,
+        manual_parameters=[
+            openapi.Parameter('weeks', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('level', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['province', 'district']),
+            openapi.Parameter('province', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('district', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={200: "Regions with totals and weekly series", 403: "Doctors and admins only"},
+        tags=["Reports"]
+    )
+    def get(self, request):
+        if request.user.role not in ('doctor', 'admin'):
+            return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        level = request.query_params.get('level', 'province')
+        province = request.query_params.get('province')
+        try:
+            weeks = int(request.query_params.get('weeks', 12))
+        except ValueError:
+            weeks = 0
+        if not 1 <= weeks <= MAX_WEEKS:
+            return Response({'error': f'weeks must be between 1 and {MAX_WEEKS}'}, status=status.HTTP_400_BAD_REQUEST)
+        if level not in ('province', 'district'):
+            return Response({'error': 'level must be province or district'}, status=status.HTTP_400_BAD_REQUEST)
+        if province and province not in dict(ParentDetails.PROVINCE_CHOICES):
+            return Response({'error': 'Invalid province'}, status=status.HTTP_400_BAD_REQUEST)
+
+        first_week, regions = regional_dashboard(
+            weeks, level=level, province=province, district=request.query_params.get('district'),
+        )
+        refresh = SummaryRefresh.objects.filter(name=REFRESH_NAME).first()
+        return Response({
+            'first_week': first_week,
+            'weeks': weeks,
+            'level': level,
+            'refreshed_at': refresh.refreshed_at if refresh else None,
+            'regions': regions,
+        })
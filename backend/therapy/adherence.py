@@ -0,0 +1,65 @@
+"""
+Adherence monitoring: active curricula whose family stopped submitting progress.
+
+refresh_adherence_flags() is run by a scheduled job (``manage.py
+refresh_adherence_flags``, e.g. daily). It finds every active curriculum
+started at least N days ago with no DailyProgress in the last N days in one
+query: a NOT EXISTS anti-join per curriculum on the (child_curriculum, date)
+index. Each probe is one index seek, so the run time grows with the number
+of active curricula, not with the size of the progress table.
+
+The result replaces the AdherenceFlag table, which the doctor dashboard
+reads directly. A flag keeps its flagged_at across runs and is dropped as
+soon as the family submits progress again (signals.py).
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import AdherenceFlag, ChildCurriculum, DailyProgress
+
+# Days without progress before a curriculum is flagged
+INACTIVE_DAYS = 3
+
+
+def inactive_curricula(days=INACTIVE_DAYS, today=None):
+    """Active curricula with no progress in the last `days` days, with their last_progress date"""
+    today = today or timezone.localdate()
+    cutoff = today - timedelta(days=days)
+    progress = DailyProgress.objects.filter(child_curriculum=OuterRef('pk')).order_by()
+    return (
+        ChildCurriculum.objects
+        .filter(status='active', start_date__lte=cutoff)
+        .filter(~Exists(progress.filter(date__gt=cutoff)))
+        .annotate(last_progress=Subquery(progress.order_by('-date').values('date')[:1]))
+        .values('pk', 'assigned_by_id', 'start_date', 'last_progress')
+        .order_by()
+    )
+
+
+def refresh_adherence_flags(days=INACTIVE_DAYS, today=None, now=None):
+    """Replace the flags with the currently inactive curricula; returns (flagged, cleared)"""
+    today = today or timezone.localdate()
+    now = now or timezone.now()
+    flags = [
+        AdherenceFlag(
+            child_curriculum_id=row['pk'],
+            doctor_id=row['assigned_by_id'],
+            last_progress_date=row['last_progress'],
+            days_inactive=(today - (row['last_progress'] or row['start_date'])).days,
+            flagged_at=now,
+            checked_at=now,
+        )
+        for row in inactive_curricula(days, today)
+    ]
+    with transaction.atomic():
+        # Upsert keeps flagged_at of curricula that were already flagged
+        AdherenceFlag.objects.bulk_create(
+            flags, batch_size=1000, update_conflicts=True, unique_fields=['child_curriculum'],
+            update_fields=['doctor', 'last_progress_date', 'days_inactive', 'checked_at'],
+        )
+        cleared, _ = AdherenceFlag.objects.filter(checked_at__lt=now).delete()
+    return len(flags), cleared
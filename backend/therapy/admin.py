@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Curriculum, CurriculumTask, ChildCurriculum, DailyProgress, DoctorReview, DiagnosisReport
+from .models import (
+    Curriculum, CurriculumTask, ChildCurriculum, DailyProgress, DoctorReview, DiagnosisReport, AdherenceFlag
+)
 
 
 class CurriculumTaskInline(admin.TabularInline):
@@ -44,6 +46,12 @@ class DoctorReviewAdmin(admin.ModelAdmin):
     search_fields = ['child_curriculum__child__full_name', 'doctor__user__full_name']
 
 
+@admin.register(AdherenceFlag)
+class AdherenceFlagAdmin(admin.ModelAdmin):
+    list_display = ['child_curriculum', 'doctor', 'days_inactive', 'last_progress_date', 'flagged_at', 'checked_at']
+    search_fields = ['child_curriculum__child__full_name']
+
+
 @admin.register(DiagnosisReport)
 class DiagnosisReportAdmin(admin.ModelAdmin):
     list_display = ['child', 'doctor', 'has_autism', 'spectrum_type', 'shared_with_parent', 'created_at']
@@ -0,0 +1,166 @@
+"""
+Async variants of the hot read endpoints, served under ASGI.
+
+Each view returns exactly what its sync counterpart in views.py returns
+(they share the response builders), but uses the async ORM so a slow
+request waits on the event loop instead of holding a worker thread.
+They are routed in place of the sync views when settings.ASYNC_READ_VIEWS
+is on; under WSGI the sync views are the better choice. The progress
+history streams its days like the sync view (AsyncAPIView.stream()).
+"""
+
+import asyncio
+from datetime import date
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import aget_object_or_404
+from rest_framework import status
+
+from autisahara.async_views import AsyncAPIView
+from autisahara.compiled import compiled
+from autisahara.fieldsets import FieldSelection, sparse_data
+from assessments.events import broker, format_sse
+from assessments.models import ChildAssessment
+from children.models import Child
+from .models import ChildCurriculum, CurriculumTask, DailyProgress
+from .serializers import CurriculumTaskSerializer, DailyProgressSerializer
+from .views import (
+    PENDING_PATIENT_RELATED, PATIENT_DETAIL_RELATED, CHILD_CURRICULUM_RELATED,
+    HISTORY_ORDER, pending_patient_row, patient_detail_data, today_tasks_data, progress_history_stream,
+)
+
+
+# ============== DOCTOR DASHBOARD ENDPOINTS ==============
+
+class AsyncDoctorPendingPatientsView(AsyncAPIView):
+    """Get list of patients pending review for doctor"""
+
+    async def get(self, request):
+        if request.user.role != 'doctor':
+            return self.respond({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        pending = ChildAssessment.objects.filter(status='pending').select_related(*PENDING_PATIENT_RELATED)
+
+        return self.respond([pending_patient_row(assessment) async for assessment in pending])
+
+
+class DoctorQueueStreamView(AsyncAPIView):
+    """
+    Server-Sent Events stream of assessment state changes for the doctor dashboard.
+
+    Replaces polling doctor/pending/: the dashboard loads the list once, then
+    applies events as patients are submitted, accepted or completed.
+    Only served through autisahara.asgi, where each open stream is a coroutine.
+    Under WSGI the endless body would hold a worker thread per open dashboard,
+    so WSGI requests get 501 and the dashboard keeps polling doctor/pending/.
+    EventSource authenticates with ?ticket= from api/stream-ticket/ (stream_tickets.py).
+    """
+    allow_stream_ticket = True
+    HEARTBEAT_SECONDS = 15
+
+    async def get(self, request):
+        if request.user.role != 'doctor':
+            return self.respond({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+        if not isinstance(request, ASGIRequest):
+            return self.respond({'error': 'The event stream is only served over ASGI'},
+                                status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        response = StreamingHttpResponse(self.events(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+        return response
+
+    async def events(self):
+        subscription = broker.subscribe()
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+                    continue
+                yield format_sse(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+
+class AsyncDoctorPatientDetailView(AsyncAPIView):
+    """Get detailed info about a patient for doctor review"""
+
+    async def get(self, request, child_id):
+        if request.user.role != 'doctor':
+            return self.respond({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        child = await aget_object_or_404(Child.objects.select_related(*PATIENT_DETAIL_RELATED), pk=child_id)
+        selection = FieldSelection.from_request(request)
+        videos = [video async for video in child.videos.all()] if selection is None or selection.keeps('videos') else []
+
+        return self.respond(sparse_data(patient_detail_data(child, videos), selection))
+
+
+# ============== PARENT ENDPOINTS ==============
+
+class AsyncTodayTasksView(AsyncAPIView):
+    """Get today's tasks for parent's child"""
+
+    async def get(self, request, child_id):
+        if request.user.role != 'parent':
+            return self.respond({'error': 'Only parents can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        child = await aget_object_or_404(Child, pk=child_id, parent=request.user)
+
+        child_curriculum = await ChildCurriculum.objects.filter(
+            child=child, status='active'
+        ).select_related('curriculum').afirst()
+
+        if not child_curriculum:
+            return self.respond({'error': 'No active curriculum'}, status=status.HTTP_404_NOT_FOUND)
+
+        task_plan, progress_plan = compiled(CurriculumTaskSerializer), compiled(DailyProgressSerializer)
+        tasks = [task_plan.render(row) async for row in task_plan.values(CurriculumTask.objects.filter(
+            curriculum=child_curriculum.curriculum_id,
+            day_number=child_curriculum.current_day
+        ))]
+
+        today = date.today()
+        progress_entries = DailyProgress.objects.filter(
+            child_curriculum=child_curriculum,
+            task__in=[task['id'] for task in tasks],
+            date=today
+        )
+
+        progress_by_task = {}
+        async for row in progress_plan.values(progress_entries):
+            entry = progress_plan.render(row)
+            progress_by_task[entry['task']['id']] = entry
+        return self.respond(today_tasks_data(child_curriculum, tasks, progress_by_task, today))
+
+
+class AsyncProgressHistoryView(AsyncAPIView):
+    """Get progress history for a child"""
+
+    async def get(self, request, child_id):
+        child = await aget_object_or_404(Child, pk=child_id)
+
+        # Check access
+        if request.user.role == 'parent' and child.parent_id != request.user.id:
+            return self.respond({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        child_curriculum = await ChildCurriculum.objects.filter(
+            child=child
+        ).select_related(*CHILD_CURRICULUM_RELATED).afirst()
+
+        if not child_curriculum:
+            return self.respond({'error': 'No curriculum found'}, status=status.HTTP_404_NOT_FOUND)
+
+        progress_entries = DailyProgress.objects.filter(
+            child_curriculum=child_curriculum
+        ).order_by(*HISTORY_ORDER)
+
+        # Rows are read from the sync queryset as the body is sent, see AsyncAPIView.stream()
+        return await self.stream(progress_history_stream(
+            child_curriculum, compiled(DailyProgressSerializer).rows(progress_entries)
+        ))
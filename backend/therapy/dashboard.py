@@ -0,0 +1,81 @@
+"""
+Doctor dashboard header counters.
+
+The header shows assessments waiting for a doctor, the doctor's accepted
+patients, reviews due, reports shared with parents and today's progress
+submissions on the doctor's curricula. Counting them from the full pending
+and accepted lists made the header as slow as those lists.
+
+dashboard_counters() serves them from the shared (database) cache, so an
+entry one worker drops is gone for every worker: the pending count is
+shared by all doctors, the others are cached per doctor and day (so
+today's submissions start from zero at midnight), and reviews due is
+review_inbox's cached count. signals.py drops the affected entries when an
+assessment, diagnosis report or progress entry is written, so only the
+first read after a change runs the COUNT queries; a warm read is a single
+cache query. Writes that bypass signals (bulk_create, queryset.update)
+show up within COUNTER_CACHE_TIMEOUT.
+"""
+
+from django.core.cache import caches
+
+from assessments.models import ChildAssessment
+
+from .models import DailyProgress, DiagnosisReport
+from .review_inbox import count_cache_key, due_reviews
+
+COUNTER_CACHE_TIMEOUT = 5 * 60
+
+# Assessment statuses listed by DoctorAcceptedPatientsView
+ACCEPTED_STATUSES = ['accepted', 'completed']
+
+PENDING_CACHE_KEY = 'dashboard-pending-count'
+
+
+def _cache():
+    return caches['shared']
+
+
+def doctor_cache_key(doctor_id, day):
+    return f'dashboard-counters:{doctor_id}:{day.isoformat()}'
+
+
+def invalidate_pending_count():
+    _cache().delete(PENDING_CACHE_KEY)
+
+
+def invalidate_doctor_counters(doctor_id, day):
+    if doctor_id is not None:
+        _cache().delete(doctor_cache_key(doctor_id, day))
+
+
+def dashboard_counters(doctor, today):
+    cache = _cache()
+    doctor_key, due_key = doctor_cache_key(doctor.pk, today), count_cache_key(doctor.pk)
+    cached = cache.get_many([PENDING_CACHE_KEY, doctor_key, due_key])
+
+    pending = cached.get(PENDING_CACHE_KEY)
+    if pending is None:
+        pending = ChildAssessment.objects.filter(status='pending').count()
+        cache.set(PENDING_CACHE_KEY, pending, COUNTER_CACHE_TIMEOUT)
+
+    counters = cached.get(doctor_key)
+    if counters is None:
+        counters = {
+            'accepted_patients': ChildAssessment.objects.filter(
+                assigned_doctor=doctor, status__in=ACCEPTED_STATUSES
+            ).count(),
+            'reports_shared': DiagnosisReport.objects.filter(doctor=doctor, shared_with_parent=True).count(),
+            'submissions_today': DailyProgress.objects.filter(
+                child_curriculum__assigned_by=doctor, date=today
+            ).count(),
+        }
+        cache.set(doctor_key, counters, COUNTER_CACHE_TIMEOUT)
+
+    return {
+        'pending_patients': pending,
+        'accepted_patients': counters['accepted_patients'],
+        'reviews_due': cached[due_key] if due_key in cached else len(due_reviews(doctor)),
+        'reports_shared': counters['reports_shared'],
+        'submissions_today': counters['submissions_today'],
+    }
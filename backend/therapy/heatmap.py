@@ -0,0 +1,58 @@
+"""
+Day x task progress heatmap of a ChildCurriculum.
+
+The dashboard and the parent history screen only draw a grid, so instead
+of serializing every DailyProgress entry this returns a dense matrix:
+grid[day - 1][slot] is the status code of the slot-th task of that day
+(latest submission wins). Task titles are sent once, in the same shape.
+
+The grid comes from one query over the curriculum's tasks, each with a
+correlated subquery for its latest status on the (child_curriculum, task,
+date) unique index.
+"""
+
+from django.db.models import OuterRef, Subquery
+
+from .models import CurriculumTask, DailyProgress
+
+# Cell values; STATUSES[code] names a code
+NO_TASK = 0
+PENDING = 1
+STATUS_CODES = {'not_done': 2, 'done_with_help': 3, 'done_without_help': 4}
+STATUSES = ['no_task', 'pending', *STATUS_CODES]
+
+
+def progress_heatmap(child_curriculum):
+    """child_curriculum needs curriculum loaded"""
+    latest = (
+        DailyProgress.objects
+        .filter(child_curriculum=child_curriculum, task=OuterRef('pk'))
+        .order_by('-date', '-submitted_at')
+        .values('status')[:1]
+    )
+    duration = child_curriculum.curriculum.duration_days
+    tasks = (
+        CurriculumTask.objects
+        .filter(curriculum_id=child_curriculum.curriculum_id, day_number__range=(1, duration))
+        .annotate(latest_status=Subquery(latest))
+        .order_by('day_number', 'order_index', 'pk')
+        .values_list('id', 'day_number', 'title', 'latest_status')
+    )
+
+    titles = [[] for _ in range(duration)]
+    cells = [[] for _ in range(duration)]
+    for task_id, day, title, latest_status in tasks:
+        titles[day - 1].append({'id': task_id, 'title': title})
+        cells[day - 1].append(STATUS_CODES.get(latest_status, PENDING))
+    width = max(map(len, cells), default=0)
+
+    return {
+        'child_curriculum_id': child_curriculum.id,
+        'curriculum_title': child_curriculum.curriculum.title,
+        'duration_days': duration,
+        'current_day': child_curriculum.current_day,
+        'status': child_curriculum.status,
+        'statuses': STATUSES,
+        'tasks': titles,
+        'grid': [row + [NO_TASK] * (width - len(row)) for row in cells],
+    }
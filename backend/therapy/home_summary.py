@@ -0,0 +1,86 @@
+"""
+Parent home screen summary across all children.
+
+The home screen used to load the children list and then, for every child,
+today's tasks, doctor feedback and assessment status: 1 + 3N requests.
+parent_home_summary() returns the same facts for all of a parent's
+children in three queries, however many children there are:
+
+1. the children, with their assessment (select_related) and the id of
+   their most recent curriculum (subquery);
+2. their active curricula, with the number of tasks for the current day
+   and of those done today annotated as COUNT subqueries;
+3. the reviews of the most recent curricula, newest first; the first one
+   per curriculum is the latest review.
+
+The picks match the per-child endpoints: the active curriculum is the one
+TodayTasksView shows, the latest review the one ChildDoctorFeedbackView
+reports, and a task counts as completed as in today's tasks (submitted,
+and not 'not_done').
+"""
+
+from django.db.models import F, Func, OuterRef, Subquery
+
+from children.models import Child
+
+from .models import ChildCurriculum, CurriculumTask, DailyProgress, DoctorReview
+from .serializers import DoctorReviewSerializer
+
+
+def _count(queryset):
+    # COUNT(*) of a correlated subquery (no GROUP BY, so always one row)
+    return Subquery(queryset.order_by().annotate(n=Func(F('pk'), function='COUNT')).values('n'))
+
+
+def parent_home_summary(parent, today):
+    latest_curriculum = ChildCurriculum.objects.filter(child=OuterRef('pk')).order_by('-created_at')
+    children = list(
+        Child.objects.filter(parent=parent)
+        .select_related('assessment')
+        .annotate(latest_curriculum_id=Subquery(latest_curriculum.values('pk')[:1]))
+    )
+
+    tasks_today = CurriculumTask.objects.filter(curriculum=OuterRef('curriculum'), day_number=OuterRef('current_day'))
+    done_today = DailyProgress.objects.filter(
+        child_curriculum=OuterRef('pk'), task__day_number=OuterRef('current_day'), date=today,
+    ).exclude(status='not_done')
+    active = {}
+    for child_curriculum in (
+        ChildCurriculum.objects.filter(child__in=children, status='active')
+        .select_related('curriculum')
+        .annotate(tasks_today=_count(tasks_today), tasks_completed_today=_count(done_today))
+        .order_by('-created_at')
+    ):
+        active.setdefault(child_curriculum.child_id, child_curriculum)
+
+    latest_review = {}
+    for review in (
+        DoctorReview.objects.filter(child_curriculum__in=[child.latest_curriculum_id for child in children])
+        .select_related('doctor__user')
+        .order_by('-reviewed_at')
+    ):
+        latest_review.setdefault(review.child_curriculum_id, review)
+
+    return {
+        'date': today,
+        'children': [_child_summary(child, active.get(child.id), latest_review.get(child.latest_curriculum_id))
+                     for child in children],
+    }
+
+
+def _child_summary(child, child_curriculum, review):
+    assessment = getattr(child, 'assessment', None)
+    return {
+        'child_id': child.id,
+        'child_name': child.full_name,
+        'assessment_status': assessment.status if assessment else None,
+        'active_curriculum': {
+            'id': child_curriculum.id,
+            'title': child_curriculum.curriculum.title,
+            'current_day': child_curriculum.current_day,
+            'total_days': child_curriculum.curriculum.duration_days,
+            'tasks_today': child_curriculum.tasks_today,
+            'tasks_completed_today': child_curriculum.tasks_completed_today,
+        } if child_curriculum else None,
+        'latest_review': DoctorReviewSerializer(review).data if review else None,
+    }
@@ -0,0 +1,426 @@
+"""
+Generate production-shaped synthetic data for load testing and index work.
+
+    python manage.py generate_synthetic_data --families 100000 --days 180
+
+Creates doctors, parent accounts with profiles, children with registration
+sections, M-CHAT responses, assessments, curriculum assignments, daily
+progress, doctor reviews and diagnosis reports. Rows are written with
+bulk_create, except daily progress (the bulk of the data), which goes
+through a plain executemany INSERT; both run in batches of families, so
+memory stays flat however large the population. The same --seed and
+--end-date always produce the same data. Bulk writes skip the model
+signals, so the command drops the cached counters itself afterwards.
+
+Synthetic accounts use the @synthetic.autisahara.test email domain and
+synthetic curricula are titled "Synthetic ..."; --clear removes them.
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User, Doctor, ParentDetails, Household
+from assessments.analytics import counting_paused, rebuild_item_stats
+from assessments.models import MChatResponse, ChildAssessment
+from children.models import Child, ChildEducation, ChildHealth, MedicalHistory
+from therapy.dashboard import invalidate_doctor_counters, invalidate_pending_count
+from therapy.models import (
+    Curriculum, CurriculumTask, ChildCurriculum, DailyProgress, DoctorReview, DiagnosisReport,
+)
+from therapy.review_inbox import invalidate_due_count
+
+EMAIL_DOMAIN = 'synthetic.autisahara.test'
+PASSWORD = 'synthetic123'
+
+# Share of families per province with a few districts each, roughly by population
+PROVINCES = [
+    ('bagmati', 0.21, ['Kathmandu', 'Lalitpur', 'Bhaktapur', 'Chitwan', 'Makwanpur', 'Kavrepalanchok']),
+    ('2', 0.21, ['Dhanusha', 'Parsa', 'Bara', 'Saptari', 'Siraha']),
+    ('1', 0.17, ['Morang', 'Sunsari', 'Jhapa', 'Ilam']),
+    ('lumbini', 0.18, ['Rupandehi', 'Dang', 'Banke', 'Kapilvastu']),
+    ('gandaki', 0.09, ['Kaski', 'Tanahun', 'Syangja']),
+    ('sudurpaschim', 0.09, ['Kailali', 'Kanchanpur', 'Doti']),
+    ('karnali', 0.05, ['Surkhet', 'Jumla', 'Dailekh']),
+]
+FIRST_NAMES = ['Aarav', 'Aayush', 'Anish', 'Bibek', 'Kiran', 'Nabin', 'Prabin', 'Sujan',
+               'Aasha', 'Anjali', 'Gita', 'Kabita', 'Nisha', 'Pooja', 'Sita', 'Srijana']
+SURNAMES = ['Sharma', 'Thapa', 'Shrestha', 'Gurung', 'Tamang', 'Rai', 'Magar', 'Karki',
+            'Adhikari', 'Yadav', 'Chaudhary', 'Bhandari', 'Khadka', 'Limbu', 'Poudel']
+
+# Children per family and M-CHAT risk groups of the screened population
+CHILDREN_PER_FAMILY = ([1, 2, 3], [0.72, 0.23, 0.05])
+RISK_GROUPS = [
+    # (share, probability that each item is answered the concerning way)
+    (0.78, 0.04),
+    (0.16, 0.25),
+    (0.06, 0.60),
+]
+ASSESSMENT_STATUS = (['pending', 'in_review', 'accepted', 'completed'], [0.14, 0.04, 0.52, 0.30])
+REVIEW_CHECKPOINTS = DoctorReview.CHECKPOINTS
+PROGRESS_COLUMNS = ['child_curriculum', 'task', 'day_number', 'date', 'status', 'video_url', 'parent_notes',
+                    'submitted_at']
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk_create keep the auto_now/auto_now_add values we set, so history spans months"""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def timestamp_fields():
+    return [
+        Child._meta.get_field('created_at'), Child._meta.get_field('updated_at'),
+        MChatResponse._meta.get_field('created_at'), MChatResponse._meta.get_field('updated_at'),
+        ChildCurriculum._meta.get_field('created_at'),
+        DoctorReview._meta.get_field('reviewed_at'),
+        DiagnosisReport._meta.get_field('created_at'), DiagnosisReport._meta.get_field('updated_at'),
+    ]
+
+
+class SyntheticDataGenerator:
+    def __init__(self, seed, end_date, days, batch_size, stdout=None):
+        self.random = random.Random(seed)
+        self.end_date = end_date
+        self.days = days
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.password = make_password(PASSWORD)
+        self.counts = dict.fromkeys([
+            'doctors', 'parents', 'children', 'mchat', 'assessments',
+            'child_curricula', 'progress', 'reviews', 'reports',
+        ], 0)
+        self.doctor_ids = []
+        self.pending_progress = []
+        self.progress_sql = self.insert_sql(DailyProgress, PROGRESS_COLUMNS)
+
+    # ============== HELPERS ==============
+
+    def moment(self, day, start_hour=7, end_hour=21):
+        """A timezone-aware datetime on `day` during waking hours"""
+        seconds = self.random.randrange(start_hour * 3600, end_hour * 3600)
+        naive = datetime.combine(day, time()) + timedelta(seconds=seconds)
+        return timezone.make_aware(naive, timezone.get_default_timezone())
+
+    def past_day(self, max_days_ago):
+        return self.end_date - timedelta(days=self.random.randint(0, max_days_ago))
+
+    def name(self):
+        return f"{self.random.choice(FIRST_NAMES)} {self.random.choice(SURNAMES)}"
+
+    @staticmethod
+    def insert_sql(model, field_names):
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(model._meta.get_field(name).column) for name in field_names)
+        placeholders = ', '.join(['%s'] * len(field_names))
+        return f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})"
+
+    # ============== REFERENCE DATA ==============
+
+    def create_doctors(self, count):
+        users = User.objects.bulk_create([
+            User(email=f'doctor{n}@{EMAIL_DOMAIN}', password=self.password, full_name=f'Dr. {self.name()}',
+                 phone=f'98{self.random.randrange(10**8):08d}', role='doctor')
+            for n in range(count)
+        ], batch_size=self.batch_size)
+        self.counts['doctors'] = count
+        doctors = Doctor.objects.bulk_create([
+            Doctor(user=user, license_number=f'NMC-S{n:05d}',
+                   specialization=self.random.choice(['Child Psychiatry', 'Pediatrics', 'Developmental Pediatrics']))
+            for n, user in enumerate(users)
+        ], batch_size=self.batch_size)
+        self.doctor_ids = [doctor.pk for doctor in doctors]
+        return doctors
+
+    def curricula(self, doctors):
+        """Task ids per curriculum day for every therapy curriculum, creating synthetic ones if none exist"""
+        curricula = list(Curriculum.objects.exclude(type='assessment').filter(tasks__isnull=False).distinct())
+        if not curricula:
+            curricula = Curriculum.objects.bulk_create([
+                Curriculum(title=f'Synthetic {days}-Day Program', description='Synthetic curriculum',
+                           duration_days=days, type=kind, spectrum_type=spectrum, created_by=doctors[0])
+                for days, kind, spectrum in [(15, 'general', ''), (30, 'specialized', 'mild'),
+                                             (45, 'specialized', 'moderate')]
+            ])
+            CurriculumTask.objects.bulk_create([
+                CurriculumTask(curriculum=curriculum, day_number=day, title=f'Day {day} activity {i + 1}',
+                               why_description='Builds social communication.', instructions='Follow the steps.',
+                               order_index=i)
+                for curriculum in curricula
+                for day in range(1, curriculum.duration_days + 1)
+                for i in range(3)
+            ], batch_size=self.batch_size)
+
+        tasks = {curriculum.id: {} for curriculum in curricula}
+        for task_id, curriculum_id, day in CurriculumTask.objects.filter(
+            curriculum__in=curricula
+        ).order_by('day_number', 'order_index').values_list('id', 'curriculum_id', 'day_number'):
+            tasks[curriculum_id].setdefault(day, []).append(task_id)
+        return curricula, tasks
+
+    # ============== FAMILIES ==============
+
+    def create_families(self, first, count, doctors, curricula, tasks):
+        rnd = self.random
+        provinces, weights, districts = zip(*PROVINCES)
+
+        parents = User.objects.bulk_create([
+            User(email=f'parent{first + n}@{EMAIL_DOMAIN}', password=self.password, full_name=self.name(),
+                 phone=f'98{rnd.randrange(10**8):08d}', role='parent')
+            for n in range(count)
+        ], batch_size=self.batch_size)
+        self.counts['parents'] += count
+
+        details = []
+        for parent in parents:
+            index = rnd.choices(range(len(provinces)), weights)[0]
+            details.append(ParentDetails(
+                user=parent, mother_name=self.name(), father_name=self.name(),
+                province=provinces[index], district=rnd.choice(districts[index]),
+                primary_phone=parent.phone, has_whatsapp=rnd.random() < 0.6,
+                primary_caregiver=rnd.choices(['mother', 'father', 'grandparent'], [0.8, 0.12, 0.08])[0],
+                smartphone_comfort=rnd.choice(['very_comfortable', 'somewhat_comfortable', 'need_help']),
+                consent_followup=True, consent_research=rnd.random() < 0.4,
+            ))
+        ParentDetails.objects.bulk_create(details, batch_size=self.batch_size)
+        Household.objects.bulk_create([
+            Household(user=parent, siblings_count=rnd.choices([0, 1, 2, 3], [0.3, 0.45, 0.2, 0.05])[0])
+            for parent in parents
+        ], batch_size=self.batch_size)
+
+        children = []
+        for parent in parents:
+            for _ in range(rnd.choices(*CHILDREN_PER_FAMILY)[0]):
+                # M-CHAT screens toddlers of 16-30 months; registered some time in the window
+                registered = self.past_day(self.days)
+                age_months = rnd.randint(16, 30)
+                created = self.moment(registered)
+                children.append(Child(
+                    parent=parent, full_name=f"{rnd.choice(FIRST_NAMES)} {parent.full_name.split()[-1]}",
+                    date_of_birth=registered - timedelta(days=age_months * 30 + rnd.randint(0, 29)),
+                    age_years=age_months // 12, age_months=age_months % 12,
+                    gender=rnd.choices(['male', 'female', 'other'], [0.62, 0.37, 0.01])[0],
+                    created_at=created, updated_at=created,
+                ))
+        Child.objects.bulk_create(children, batch_size=self.batch_size)
+        self.counts['children'] += len(children)
+
+        ChildEducation.objects.bulk_create([
+            ChildEducation(child=child, goes_to_school=rnd.random() < 0.15) for child in children
+        ], batch_size=self.batch_size)
+        ChildHealth.objects.bulk_create([
+            ChildHealth(child=child, height_cm=round(rnd.gauss(84, 5), 1), weight_kg=round(rnd.gauss(11.5, 1.5), 1),
+                        has_vaccinations=rnd.choices(['complete', 'incomplete', 'unknown'], [0.8, 0.15, 0.05])[0])
+            for child in children
+        ], batch_size=self.batch_size)
+        histories = []
+        for child in children:
+            history = MedicalHistory(
+                child=child, pregnancy_infection=rnd.random() < 0.05, birth_complications=rnd.random() < 0.1,
+                brain_injury_first_year=rnd.random() < 0.02, family_autism_history=rnd.random() < 0.04,
+            )
+            history.requires_specialist = history.needs_specialist()
+            histories.append(history)
+        MedicalHistory.objects.bulk_create(histories, batch_size=self.batch_size)
+
+        self.create_screening(children, doctors, curricula, tasks)
+
+    def create_screening(self, children, doctors, curricula, tasks):
+        rnd = self.random
+        shares, concern_rates = zip(*RISK_GROUPS)
+
+        responses, assessments, assigned = [], [], []
+        for child in children:
+            concern = rnd.choices(concern_rates, shares)[0]
+            answers = {}
+            for q in range(1, 21):
+                concerning = rnd.random() < concern
+                # Reverse-scored items are concerning when answered YES
+                answers[f'q{q}'] = concerning if q in MChatResponse.REVERSE_QUESTIONS else not concerning
+            response = MChatResponse(child=child, created_at=child.created_at, updated_at=child.created_at, **answers)
+            response.total_score = response.calculate_score()
+            response.risk_level = response.get_risk_level(response.total_score)
+            responses.append(response)
+
+            status = rnd.choices(*ASSESSMENT_STATUS)[0]
+            submitted = child.created_at + timedelta(hours=rnd.randint(1, 72))
+            doctor = rnd.choice(doctors) if status != 'pending' else None
+            reviewed = None
+            if doctor:
+                reviewed = min(submitted + timedelta(days=rnd.randint(1, 7)), self.moment(self.end_date))
+            assessment = ChildAssessment(
+                child=child, status=status, assigned_doctor=doctor, parent_confirmed=True,
+                submitted_at=submitted, reviewed_at=reviewed,
+            )
+            assessments.append(assessment)
+            if status in ('accepted', 'completed'):
+                assigned.append((child, assessment))
+
+        MChatResponse.objects.bulk_create(responses, batch_size=self.batch_size)
+        ChildAssessment.objects.bulk_create(assessments, batch_size=self.batch_size)
+        self.counts['mchat'] += len(responses)
+        self.counts['assessments'] += len(assessments)
+
+        self.create_therapy(assigned, curricula, tasks)
+
+    def create_therapy(self, assigned, curricula, tasks):
+        rnd = self.random
+
+        child_curricula, reports = [], []
+        for child, assessment in assigned:
+            curriculum = rnd.choice(curricula)
+            start = assessment.reviewed_at.date() + timedelta(days=rnd.randint(0, 3))
+            if start > self.end_date:
+                continue
+            elapsed = (self.end_date - start).days
+            if elapsed >= curriculum.duration_days:
+                status, current_day = 'completed', curriculum.duration_days
+            else:
+                status = 'paused' if rnd.random() < 0.05 else 'active'
+                current_day = elapsed + 1
+            child_curricula.append(ChildCurriculum(
+                child=child, curriculum=curriculum, assigned_by=assessment.assigned_doctor,
+                start_date=start, end_date=start + timedelta(days=curriculum.duration_days),
+                current_day=current_day, status=status, created_at=self.moment(start),
+            ))
+
+            if assessment.status == 'completed':
+                has_autism = rnd.random() < 0.7
+                reported = self.moment(min(assessment.reviewed_at.date() + timedelta(days=rnd.randint(7, 45)),
+                                           self.end_date))
+                reports.append(DiagnosisReport(
+                    child=child, doctor=assessment.assigned_doctor, has_autism=has_autism,
+                    spectrum_type=rnd.choice(['mild', 'moderate', 'severe']) if has_autism else 'none',
+                    detailed_report='Synthetic findings', next_steps='Continue the home programme',
+                    shared_with_parent=rnd.random() < 0.8, created_at=reported, updated_at=reported,
+                ))
+
+        ChildCurriculum.objects.bulk_create(child_curricula, batch_size=self.batch_size)
+        DiagnosisReport.objects.bulk_create(reports, batch_size=self.batch_size)
+        self.counts['child_curricula'] += len(child_curricula)
+        self.counts['reports'] += len(reports)
+
+        reviews = []
+        for child_curriculum in child_curricula:
+            self.add_progress(child_curriculum, tasks[child_curriculum.curriculum_id])
+            for checkpoint in REVIEW_CHECKPOINTS:
+                if checkpoint < child_curriculum.current_day and rnd.random() < 0.8:
+                    reviewed = min(child_curriculum.start_date + timedelta(days=checkpoint + rnd.randint(0, 5)),
+                                   self.end_date)
+                    reviews.append(DoctorReview(
+                        child_curriculum=child_curriculum, doctor=child_curriculum.assigned_by,
+                        review_period=checkpoint, observations='Synthetic observations',
+                        recommendations='Continue', reviewed_at=self.moment(reviewed, 9, 18),
+                    ))
+        DoctorReview.objects.bulk_create(reviews, batch_size=self.batch_size)
+        self.counts['reviews'] += len(reviews)
+
+    def add_progress(self, child_curriculum, tasks_by_day):
+        """Queue one curriculum's history: some families skip days, children need less help over time"""
+        rnd = self.random
+        adherence = rnd.betavariate(4, 1.5)
+        duration = child_curriculum.curriculum.duration_days
+        last_day = child_curriculum.current_day - (child_curriculum.status != 'completed')
+
+        ops = connection.ops
+        for day in range(1, last_day + 1):
+            if rnd.random() > adherence:
+                continue
+            day_date = child_curriculum.start_date + timedelta(days=day - 1)
+            db_date = ops.adapt_datefield_value(day_date)
+            independent = 0.1 + 0.5 * day / duration
+            for task_id in tasks_by_day.get(day, []):
+                roll = rnd.random()
+                if roll < 0.15:
+                    status = 'not_done'
+                elif roll < 0.15 + 0.85 * independent:
+                    status = 'done_without_help'
+                else:
+                    status = 'done_with_help'
+                self.pending_progress.append((
+                    child_curriculum.id, task_id, day, db_date, status, '', '',
+                    ops.adapt_datetimefield_value(self.moment(day_date)),
+                ))
+        if len(self.pending_progress) >= self.batch_size:
+            self.flush_progress()
+
+    def flush_progress(self):
+        # DailyProgress is the bulk of the data: plain executemany skips model
+        # instances and per-row SQL compilation, which dominate bulk_create here
+        with connection.cursor() as cursor:
+            cursor.executemany(self.progress_sql, self.pending_progress)
+        self.counts['progress'] += len(self.pending_progress)
+        self.pending_progress = []
+
+    # ============== ENTRY POINT ==============
+
+    def run(self, families, doctors, family_batch):
+        with explicit_timestamps(*timestamp_fields()):
+            with transaction.atomic():
+                doctor_profiles = self.create_doctors(doctors)
+                curricula, tasks = self.curricula(doctor_profiles)
+
+            for first in range(0, families, family_batch):
+                count = min(family_batch, families - first)
+                with transaction.atomic():
+                    self.create_families(first, count, doctor_profiles, curricula, tasks)
+                    self.flush_progress()
+                if self.stdout:
+                    self.stdout.write(f"  {first + count}/{families} families, {self.counts['progress']} progress rows")
+        return self.counts
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, deterministic synthetic dataset for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--families', type=int, default=1000, help='Parent accounts to create')
+        parser.add_argument('--doctors', type=int, default=20)
+        parser.add_argument('--days', type=int, default=90,
+                            help='History window: registrations and progress span this many days')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--end-date', type=date.fromisoformat, default=None,
+                            help='Last day of history (YYYY-MM-DD, default today); fix it for reproducible data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT')
+        parser.add_argument('--family-batch', type=int, default=1000, help='Families per transaction')
+        parser.add_argument('--clear', action='store_true', help='Delete existing synthetic data first')
+
+    def handle(self, *args, **options):
+        synthetic_users = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+        if options['clear']:
+            Curriculum.objects.filter(title__startswith='Synthetic ').delete()
+            with counting_paused():
+                deleted, _ = synthetic_users.delete()
+            self.stdout.write(f"Deleted {deleted} synthetic rows")
+        elif synthetic_users.exists():
+            raise CommandError('Synthetic data already exists; re-run with --clear to replace it')
+
+        generator = SyntheticDataGenerator(
+            seed=options['seed'], end_date=options['end_date'] or date.today(), days=options['days'],
+            batch_size=options['batch_size'], stdout=self.stdout,
+        )
+        self.stdout.write(f"Generating {options['families']} families (seed {options['seed']})...")
+        counts = generator.run(options['families'], options['doctors'], options['family_batch'])
+
+        for name, count in counts.items():
+            self.stdout.write(f"  {name:<16}{count:>12}")
+        # M-CHAT responses were bulk-created, bypassing the item counters
+        self.stdout.write(f"Rebuilt M-CHAT item statistics for {rebuild_item_stats()} cohorts")
+        # ...and the cached dashboard counters and reviews-due badges
+        invalidate_pending_count()
+        for doctor_id in generator.doctor_ids:
+            invalidate_doctor_counters(doctor_id, date.today())
+            invalidate_due_count(doctor_id)
+        self.stdout.write(self.style.SUCCESS('Done'))
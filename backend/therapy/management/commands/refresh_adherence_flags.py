@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from therapy.adherence import INACTIVE_DAYS, refresh_adherence_flags
+
+
+class Command(BaseCommand):
+    help = 'Flag active curricula with no progress for N days (schedule daily, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=INACTIVE_DAYS,
+                            help=f'Days without progress before flagging (default {INACTIVE_DAYS})')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        flagged, cleared = refresh_adherence_flags(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{flagged} inactive curricula flagged, {cleared} flags cleared in {time.perf_counter() - start:.2f}s'
+        ))
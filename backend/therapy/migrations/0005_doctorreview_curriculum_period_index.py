@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('therapy', '0004_alter_curriculum_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='doctorreview',
+            index=models.Index(fields=['child_curriculum', 'review_period'], name='review_curriculum_period_idx'),
+        ),
+    ]
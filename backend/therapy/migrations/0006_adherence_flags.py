@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('therapy', '0005_doctorreview_curriculum_period_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdherenceFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_progress_date', models.DateField(blank=True, help_text='Empty if nothing was ever submitted', null=True)),
+                ('days_inactive', models.PositiveIntegerField()),
+                ('flagged_at', models.DateTimeField(help_text='First run that flagged this curriculum')),
+                ('checked_at', models.DateTimeField(help_text='Last run that found it still inactive')),
+            ],
+            options={
+                'ordering': ['-days_inactive'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dailyprogress',
+            index=models.Index(fields=['child_curriculum', 'date'], name='progress_curriculum_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='adherenceflag',
+            name='child_curriculum',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='adherence_flag', to='therapy.childcurriculum'),
+        ),
+        migrations.AddField(
+            model_name='adherenceflag',
+            name='doctor',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='adherence_flags', to='accounts.doctor'),
+        ),
+    ]
@@ -135,6 +135,10 @@ class DailyProgress(models.Model):
         verbose_name_plural = 'Daily Progress'
         ordering = ['-date', '-submitted_at']
         unique_together = ['child_curriculum', 'task', 'date']
+        indexes = [
+            # Adherence job: latest progress date of a curriculum with one index seek
+            models.Index(fields=['child_curriculum', 'date'], name='progress_curriculum_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.child_curriculum.child.full_name} - Day {self.day_number} - {self.status}"
@@ -144,6 +148,9 @@ class DoctorReview(models.Model):
     """
     Doctor's review of child's progress at checkpoints (Day 15, 30, 45).
     """
+    # Curriculum days at which a review is due
+    CHECKPOINTS = [15, 30, 45]
+
     child_curriculum = models.ForeignKey(
         ChildCurriculum,
         on_delete=models.CASCADE,
@@ -163,11 +170,43 @@ class DoctorReview(models.Model):
 
     class Meta:
         ordering = ['-reviewed_at']
+        indexes = [
+            # "Reviews due" anti-join: is there a review for this curriculum and checkpoint?
+            models.Index(fields=['child_curriculum', 'review_period'], name='review_curriculum_period_idx'),
+        ]
 
     def __str__(self):
         return f"Review for {self.child_curriculum.child.full_name} - Day {self.review_period}"
 
 
+class AdherenceFlag(models.Model):
+    """
+    Active curriculum whose family has not submitted progress for a while.
+    Written by the refresh_adherence_flags job; read by the doctor dashboard.
+    """
+    child_curriculum = models.OneToOneField(
+        ChildCurriculum,
+        on_delete=models.CASCADE,
+        related_name='adherence_flag'
+    )
+    doctor = models.ForeignKey(
+        'accounts.Doctor',
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='adherence_flags'
+    )
+    last_progress_date = models.DateField(null=True, blank=True, help_text="Empty if nothing was ever submitted")
+    days_inactive = models.PositiveIntegerField()
+    flagged_at = models.DateTimeField(help_text="First run that flagged this curriculum")
+    checked_at = models.DateTimeField(help_text="Last run that found it still inactive")
+
+    class Meta:
+        ordering = ['-days_inactive']
+
+    def __str__(self):
+        return f"{self.child_curriculum} - inactive {self.days_inactive} days"
+
+
 class DiagnosisReport(models.Model):
     """
     Formal diagnosis report created by doctor for a child.
@@ -0,0 +1,87 @@
+"""
+Doctor "reviews due" inbox.
+
+A curriculum owes a review at each DoctorReview.CHECKPOINTS day it has
+reached (and that its curriculum lasts to) until a DoctorReview for that
+review_period exists. due_reviews() finds them for all of a doctor's
+patients in one query: per checkpoint, a NOT EXISTS anti-join on the
+(child_curriculum, review_period) index.
+
+The dashboard badge polls due_review_count(), which is cached per doctor
+in the shared (database) cache and dropped (signals.py) whenever one of the
+doctor's curricula or reviews is saved, so the count is recomputed only
+after something changed, whichever worker made the change.
+"""
+
+from django.core.cache import caches
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+
+from .models import ChildCurriculum, DoctorReview
+
+# Bounds staleness from writes the signals can't attribute to a doctor
+COUNT_CACHE_TIMEOUT = 5 * 60
+
+# Curricula whose checkpoints can still be owed
+REVIEWABLE_STATUSES = ['active', 'completed']
+
+
+def _cache():
+    return caches['shared']
+
+
+def count_cache_key(doctor_id):
+    return f'reviews-due-count:{doctor_id}'
+
+
+def invalidate_due_count(doctor_id):
+    if doctor_id is not None:
+        _cache().delete(count_cache_key(doctor_id))
+
+
+def due_curricula(doctor):
+    """The doctor's curricula owing at least one review, with a due_<day> flag per checkpoint"""
+    flags = {}
+    for day in DoctorReview.CHECKPOINTS:
+        reviewed = DoctorReview.objects.filter(child_curriculum=OuterRef('pk'), review_period=day)
+        flags[f'due_{day}'] = ExpressionWrapper(
+            Q(current_day__gte=day, curriculum__duration_days__gte=day) & ~Exists(reviewed),
+            output_field=BooleanField(),
+        )
+    owing = Q()
+    for name in flags:
+        owing |= Q(**{name: True})
+    return (
+        ChildCurriculum.objects
+        .filter(assigned_by=doctor, status__in=REVIEWABLE_STATUSES)
+        .annotate(**flags)
+        .filter(owing)
+        .select_related('child', 'curriculum')
+        .order_by('start_date', 'pk')
+    )
+
+
+def due_reviews(doctor):
+    """One inbox row per owed (curriculum, checkpoint), oldest checkpoint first"""
+    rows = []
+    for child_curriculum in due_curricula(doctor):
+        for day in DoctorReview.CHECKPOINTS:
+            if getattr(child_curriculum, f'due_{day}'):
+                rows.append({
+                    'child_curriculum_id': child_curriculum.id,
+                    'child_id': child_curriculum.child_id,
+                    'child_name': child_curriculum.child.full_name,
+                    'curriculum_title': child_curriculum.curriculum.title,
+                    'curriculum_status': child_curriculum.status,
+                    'current_day': child_curriculum.current_day,
+                    'review_period': day,
+                })
+    rows.sort(key=lambda row: (row['review_period'], row['child_curriculum_id']))
+    _cache().set(count_cache_key(doctor.pk), len(rows), COUNT_CACHE_TIMEOUT)
+    return rows
+
+
+def due_review_count(doctor):
+    count = _cache().get(count_cache_key(doctor.pk))
+    if count is None:
+        count = len(due_reviews(doctor))
+    return count
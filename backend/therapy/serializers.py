@@ -1,26 +1,36 @@
 from rest_framework import serializers
 from datetime import timedelta
+from autisahara.compiled import CompiledListSerializer
+from autisahara.fieldsets import SparseFieldsMixin
+from autisahara.performance import TimedSerializerMixin
 from .models import Curriculum, CurriculumTask, ChildCurriculum, DailyProgress, DoctorReview, DiagnosisReport
 
 
-class CurriculumTaskSerializer(serializers.ModelSerializer):
+class CurriculumTaskSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CurriculumTask
         fields = ['id', 'day_number', 'title', 'why_description', 'instructions', 'demo_video_url', 'order_index']
+        # Curriculum task lists render from .values() rows (see autisahara/compiled.py)
+        list_serializer_class = CompiledListSerializer
 
 
-class CurriculumSerializer(serializers.ModelSerializer):
+class CurriculumSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     tasks_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Curriculum
         fields = ['id', 'title', 'description', 'duration_days', 'type', 'spectrum_type', 'tasks_count', 'created_at']
+        # Columns read by method fields (sparse fieldsets); tasks_count is annotated
+        sparse_sources = {'tasks_count': []}
 
     def get_tasks_count(self, obj):
+        # Annotated by CurriculumListView
+        if hasattr(obj, 'tasks_total'):
+            return obj.tasks_total
         return obj.tasks.count()
 
 
-class CurriculumDetailSerializer(serializers.ModelSerializer):
+class CurriculumDetailSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Curriculum with all tasks included"""
     tasks = CurriculumTaskSerializer(many=True, read_only=True)
     created_by_name = serializers.SerializerMethodField()
@@ -28,6 +38,7 @@ class CurriculumDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Curriculum
         fields = ['id', 'title', 'description', 'duration_days', 'type', 'spectrum_type', 'tasks', 'created_by_name', 'created_at']
+        sparse_sources = {'created_by_name': ['created_by__user__full_name']}
 
     def get_created_by_name(self, obj):
         if obj.created_by:
@@ -35,7 +46,7 @@ class CurriculumDetailSerializer(serializers.ModelSerializer):
         return None
 
 
-class ChildCurriculumSerializer(serializers.ModelSerializer):
+class ChildCurriculumSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     curriculum_title = serializers.CharField(source='curriculum.title', read_only=True)
     curriculum_duration = serializers.IntegerField(source='curriculum.duration_days', read_only=True)
     child_name = serializers.CharField(source='child.full_name', read_only=True)
@@ -50,6 +61,10 @@ class ChildCurriculumSerializer(serializers.ModelSerializer):
             'progress_percentage', 'created_at'
         ]
         read_only_fields = ['id', 'end_date', 'current_day', 'created_at']
+        sparse_sources = {
+            'assigned_by_name': ['assigned_by__user__full_name'],
+            'progress_percentage': ['current_day', 'curriculum__duration_days'],
+        }
 
     def get_assigned_by_name(self, obj):
         if obj.assigned_by:
@@ -91,7 +106,7 @@ class AssignCurriculumSerializer(serializers.Serializer):
         return child_curriculum
 
 
-class DailyProgressSerializer(serializers.ModelSerializer):
+class DailyProgressSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     task = CurriculumTaskSerializer(read_only=True)
 
     class Meta:
@@ -115,13 +130,14 @@ class TodayTaskSerializer(serializers.Serializer):
     is_completed = serializers.BooleanField()
 
 
-class DoctorReviewSerializer(serializers.ModelSerializer):
+class DoctorReviewSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     doctor_name = serializers.SerializerMethodField()
 
     class Meta:
         model = DoctorReview
         fields = ['id', 'review_period', 'observations', 'spectrum_identified', 'recommendations', 'doctor_name', 'reviewed_at']
         read_only_fields = ['id', 'reviewed_at']
+        sparse_sources = {'doctor_name': ['doctor__user__full_name']}
 
     def get_doctor_name(self, obj):
         if obj.doctor:
@@ -137,7 +153,7 @@ class CreateReviewSerializer(serializers.Serializer):
     recommendations = serializers.CharField()
 
 
-class DiagnosisReportSerializer(serializers.ModelSerializer):
+class DiagnosisReportSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for viewing diagnosis reports"""
     doctor_name = serializers.SerializerMethodField()
     child_name = serializers.CharField(source='child.full_name', read_only=True)
@@ -151,6 +167,10 @@ class DiagnosisReportSerializer(serializers.ModelSerializer):
             'next_steps', 'shared_with_parent', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        sparse_sources = {
+            'doctor_name': ['doctor__user__full_name'],
+            'spectrum_type_display': ['spectrum_type'],
+        }
 
     def get_doctor_name(self, obj):
         if obj.doctor:
@@ -0,0 +1,59 @@
+from datetime import date
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assessments.models import ChildAssessment
+
+from .dashboard import invalidate_doctor_counters, invalidate_pending_count
+from .models import AdherenceFlag, ChildCurriculum, DailyProgress, DiagnosisReport, DoctorReview
+from .review_inbox import invalidate_due_count
+
+
+def _drop(invalidate, *args, origin=None):
+    """
+    invalidate(*args), once per delete: deleting a child fires post_delete
+    for each of its curricula and reports, and every drop is a query on the
+    shared cache. origin (Django's post_delete argument) is the object or
+    queryset whose delete() started the cascade.
+    """
+    if origin is not None:
+        dropped = origin.__dict__.setdefault('_dropped_cache_entries', set())
+        if (invalidate, args) in dropped:
+            return
+        dropped.add((invalidate, args))
+    invalidate(*args)
+
+
+@receiver([post_save, post_delete], sender=ChildCurriculum)
+def curriculum_changed(sender, instance, origin=None, **kwargs):
+    """Assigning or advancing a curriculum can make a checkpoint review due"""
+    _drop(invalidate_due_count, instance.assigned_by_id, origin=origin)
+
+
+@receiver(post_save, sender=DoctorReview)
+def review_created(sender, instance, **kwargs):
+    # The view creates reviews with child_curriculum loaded, so this costs no query.
+    # Deleting a review (only via admin) is left to COUNT_CACHE_TIMEOUT.
+    invalidate_due_count(instance.child_curriculum.assigned_by_id)
+
+
+@receiver(post_save, sender=DailyProgress)
+def progress_submitted(sender, instance, created, **kwargs):
+    """The family is active again: drop its adherence flag until the next run says otherwise"""
+    AdherenceFlag.objects.filter(child_curriculum_id=instance.child_curriculum_id).delete()
+    if created:
+        # Created with child_curriculum loaded (update_or_create), so no query
+        invalidate_doctor_counters(instance.child_curriculum.assigned_by_id, instance.date)
+
+
+@receiver([post_save, post_delete], sender=ChildAssessment)
+def assessment_changed(sender, instance, origin=None, **kwargs):
+    """Submitting, accepting or completing an assessment moves the pending and accepted counts"""
+    _drop(invalidate_pending_count, origin=origin)
+    _drop(invalidate_doctor_counters, instance.assigned_doctor_id, date.today(), origin=origin)
+
+
+@receiver([post_save, post_delete], sender=DiagnosisReport)
+def report_changed(sender, instance, origin=None, **kwargs):
+    _drop(invalidate_doctor_counters, instance.doctor_id, date.today(), origin=origin)
@@ -1,3 +1,399 @@
-from django.test import TestCase
+import io
+from datetime import date, timedelta
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, AsyncRequestFactory, Client, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from assessments.models import ChildAssessment, MChatResponse
+from autisahara.query_budget import EndpointBudget, QueryBudgetMixin, create_family, seed_dataset
+from children.models import Child
+
+from . import async_views
+from .adherence import refresh_adherence_flags
+from .dashboard import PENDING_CACHE_KEY
+from .heatmap import NO_TASK, PENDING, STATUS_CODES
+from .management.commands.generate_synthetic_data import EMAIL_DOMAIN
+from .models import AdherenceFlag, ChildCurriculum, DailyProgress, DiagnosisReport
+
+
+def child_id(d):
+    return {'child_id': d.child.id}
+
+
+class TherapyQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budgets = [
+        # Curricula
+        EndpointBudget('curriculum-list', max_queries=1),
+        EndpointBudget('curriculum-detail', kwargs=lambda d: {'pk': d.curriculum.id}, max_queries=4),
+
+        # Doctor dashboard
+        EndpointBudget('doctor-pending', role='doctor', max_queries=1),
+        EndpointBudget('doctor-patients', role='doctor', max_queries=3),
+        EndpointBudget('doctor-patient-detail', role='doctor', kwargs=child_id, max_queries=2),
+        # Assessment and report writes drop dashboard counters: a DELETE on the shared cache each.
+        # Assessment status changes also log their summarized week for the regional summaries.
+        EndpointBudget('doctor-accept', 'post', role='doctor', max_queries=7,
+                       kwargs=lambda d: {'child_id': d.pending_child.id}),
+        # Writes touching a doctor's curricula or reviews drop the reviews-due count:
+        # one DELETE on the shared cache table
+        EndpointBudget('doctor-assign', 'post', role='doctor', status=201, max_queries=8,
+                       kwargs=lambda d: {'child_id': d.accepted_child.id},
+                       data=lambda d: {'curriculum_id': d.curriculum.id, 'start_date': '2024-02-01'}),
+        EndpointBudget('doctor-progress', role='doctor', kwargs=child_id, max_queries=7),
+        EndpointBudget('doctor-review', 'post', role='doctor', status=201, kwargs=child_id, max_queries=5,
+                       data=lambda d: {'review_period': 30, 'observations': 'Better eye contact',
+                                       'recommendations': 'Continue'}),
+        EndpointBudget('doctor-diagnosis', 'post', role='doctor', status=201, kwargs=child_id, max_queries=9,
+                       data=lambda d: {'has_autism': True, 'spectrum_type': 'mild',
+                                       'detailed_report': 'Findings', 'next_steps': 'Speech therapy'}),
+        EndpointBudget('toggle-report-share', 'post', role='doctor', max_queries=5,
+                       kwargs=lambda d: {'report_id': d.report.id}),
+        # Storing the count in the shared cache costs 3 queries (cull check, lookup, insert)
+        EndpointBudget('doctor-reviews-due', role='doctor', max_queries=5),
+        # 2 with the count cached
+        EndpointBudget('doctor-reviews-due-count', role='doctor', max_queries=6),
+        EndpointBudget('doctor-adherence', role='doctor', max_queries=2),
+        # 2 with the counters cached: the profile and one get_many on the shared cache
+        EndpointBudget('doctor-counters', role='doctor', max_queries=16),
+
+        # Parent
+        EndpointBudget('today-tasks', kwargs=child_id, max_queries=4),
+        # +2: clears the curriculum's adherence flag and drops the doctor's dashboard counters
+        EndpointBudget('submit-progress', 'post', status=201, kwargs=child_id, max_queries=7,
+                       data=lambda d: {'task_id': d.task.id, 'status': 'done_with_help'}),
+        EndpointBudget('advance-day', 'post', kwargs=child_id, max_queries=6),
+        EndpointBudget('progress-history', kwargs=child_id, max_queries=4),
+        EndpointBudget('progress-heatmap', kwargs=child_id, max_queries=2),
+        EndpointBudget('curriculum-status', kwargs=child_id, max_queries=3),
+        EndpointBudget('child-reports', kwargs=child_id, max_queries=3),
+        EndpointBudget('child-feedback', kwargs=child_id, max_queries=5),
+        EndpointBudget('parent-home', max_queries=3),
+    ]
+
+
+class ReviewsDueTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.data = seed_dataset(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.data.doctor_user)
+
+    def test_inbox_lists_unreviewed_checkpoints_and_badge_follows_reviews(self):
+        d = self.data
+        # Day 15 already reviewed by seed_dataset; day 30 is due
+        ChildCurriculum.objects.filter(pk=d.child_curriculum.pk).update(current_day=31)
+        # Finished 45-day programme without reviews: all three due
+        ChildCurriculum.objects.create(child=d.accepted_child, curriculum=d.curriculum, assigned_by=d.doctor,
+                                       start_date=date(2024, 2, 1), end_date=date(2024, 3, 17),
+                                       current_day=45, status='completed')
+        # A 7-day curriculum never reaches a checkpoint
+        ChildCurriculum.objects.create(child=d.pending_child, curriculum=d.assessment_curriculum,
+                                       assigned_by=d.doctor, start_date=date(2024, 2, 1),
+                                       end_date=date(2024, 2, 8), current_day=7)
+
+        response = self.client.get('/api/therapy/doctor/reviews-due/')
+        due = [(row['child_id'], row['review_period']) for row in response.data['reviews']]
+        self.assertEqual(sorted(due), sorted([(d.child.id, 30)] + [(d.accepted_child.id, day) for day in (15, 30, 45)]))
+        self.assertEqual(self.client.get('/api/therapy/doctor/reviews-due/count/').data, {'count': 4})
+
+        self.client.post(f'/api/therapy/doctor/patient/{d.child.id}/review/', {
+            'review_period': 30, 'observations': 'Better eye contact', 'recommendations': 'Continue',
+        }, format='json')
+        self.assertEqual(self.client.get('/api/therapy/doctor/reviews-due/count/').data, {'count': 3})
+
+
+class ProgressHeatmapTests(TestCase):
+    def test_grid_has_latest_status_per_task(self):
+        d = seed_dataset(1)
+        client = APIClient()
+        client.force_authenticate(d.parent)
+        tasks = list(d.curriculum.tasks.order_by('day_number', 'order_index'))
+        DailyProgress.objects.filter(child_curriculum=d.child_curriculum).delete()
+        first = tasks[0]
+        DailyProgress.objects.bulk_create([
+            DailyProgress(child_curriculum=d.child_curriculum, task=first, day_number=1,
+                          date=date(2024, 2, 1), status='not_done'),
+            DailyProgress(child_curriculum=d.child_curriculum, task=first, day_number=1,
+                          date=date(2024, 2, 2), status='done_without_help'),
+        ])
+        # A day with fewer tasks is padded
+        tasks[-1].delete()
+
+        data = client.get(f'/api/therapy/child/{d.child.id}/heatmap/').data
+        per_day = len([task for task in tasks if task.day_number == 1])
+        self.assertEqual(len(data['grid']), 45)
+        self.assertEqual(data['tasks'][0][0], {'id': first.id, 'title': first.title})
+        self.assertEqual(data['grid'][0][:2], [STATUS_CODES['done_without_help'], PENDING])
+        self.assertEqual(data['grid'][44], [PENDING] * (per_day - 1) + [NO_TASK])
+        self.assertEqual(data['statuses'][data['grid'][0][0]], 'done_without_help')
+
+    def test_child_curriculum_must_be_an_integer(self):
+        d = seed_dataset(1)
+        client = APIClient()
+        client.force_authenticate(d.parent)
+        url = f'/api/therapy/child/{d.child.id}/heatmap/'
+        self.assertEqual(client.get(url, {'child_curriculum': 'abc'}).status_code, 400)
+        self.assertEqual(client.get(url, {'child_curriculum': d.child_curriculum.id}).data['child_curriculum_id'],
+                         d.child_curriculum.id)
+
+
+class AdherenceFlagTests(TestCase):
+    def setUp(self):
+        self.data = seed_dataset(1)
+        self.today = date.today()
+
+    def assign(self, child, started_days_ago, progress_days_ago=()):
+        d = self.data
+        start = self.today - timedelta(days=started_days_ago)
+        child_curriculum = ChildCurriculum.objects.create(
+            child=child, curriculum=d.curriculum, assigned_by=d.doctor,
+            start_date=start, end_date=start + timedelta(days=45), current_day=started_days_ago + 1,
+        )
+        task = d.curriculum.tasks.first()
+        DailyProgress.objects.bulk_create([
+            DailyProgress(child_curriculum=child_curriculum, task=task, day_number=1,
+                          date=self.today - timedelta(days=ago))
+            for ago in progress_days_ago
+        ])
+        return child_curriculum
+
+    def test_job_flags_inactive_curricula_and_progress_clears_them(self):
+        d = self.data
+        lapsed = self.assign(d.accepted_child, 10, progress_days_ago=[9, 5])
+        never_started = self.assign(d.pending_child, 4)
+        self.assign(create_family(1000, d.doctor, 'accepted')[1], 2)  # too new to judge
+
+        self.assertEqual(refresh_adherence_flags(days=3), (2, 0))
+        client = APIClient()
+        client.force_authenticate(d.doctor_user)
+        rows = {row['child_curriculum_id']: row for row in client.get('/api/therapy/doctor/adherence/').data}
+        self.assertEqual(set(rows), {lapsed.pk, never_started.pk})
+        self.assertEqual(rows[lapsed.pk]['days_inactive'], 5)
+        self.assertEqual(rows[lapsed.pk]['last_progress_date'], self.today - timedelta(days=5))
+        self.assertIsNone(rows[never_started.pk]['last_progress_date'])
+
+        # Re-running keeps when the curriculum was first flagged
+        flagged_at = AdherenceFlag.objects.get(child_curriculum=lapsed).flagged_at
+        refresh_adherence_flags(days=3)
+        self.assertEqual(AdherenceFlag.objects.get(child_curriculum=lapsed).flagged_at, flagged_at)
+
+        DailyProgress.objects.create(child_curriculum=lapsed, task=d.task, day_number=11, date=self.today)
+        self.assertFalse(AdherenceFlag.objects.filter(child_curriculum=lapsed).exists())
+        self.assertEqual(refresh_adherence_flags(days=3), (1, 0))
+
+
+class ParentHomeSummaryTests(TestCase):
+    def setUp(self):
+        self.d = seed_dataset(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.d.parent)
+
+    def test_summary_matches_per_child_endpoints(self):
+        d = self.d
+        today_tasks = d.curriculum.tasks.filter(day_number=d.child_curriculum.current_day)
+        DailyProgress.objects.bulk_create([
+            DailyProgress(child_curriculum=d.child_curriculum, task=task, day_number=task.day_number,
+                          date=date.today(), status=status)
+            for task, status in zip(today_tasks, ['done_with_help', 'not_done'])
+        ])
+
+        with self.assertNumQueries(3):
+            summary = self.client.get('/api/therapy/parent/home/').data
+        self.assertEqual([row['child_id'] for row in summary['children']],
+                         [child['id'] for child in self.client.get('/api/children/').data])
+
+        for row in summary['children']:
+            child = row['child_id']
+            status = self.client.get(f'/api/children/{child}/assessment/status/')
+            self.assertEqual(row['assessment_status'], status.data['status'] if status.status_code == 200 else None)
+            today = self.client.get(f'/api/therapy/child/{child}/today/')
+            if today.status_code == 200:
+                self.assertEqual(row['active_curriculum']['current_day'], today.data['current_day'])
+                self.assertEqual(row['active_curriculum']['tasks_today'], len(today.data['tasks']))
+                self.assertEqual(row['active_curriculum']['tasks_completed_today'],
+                                 sum(task['is_completed'] for task in today.data['tasks']))
+            else:
+                self.assertIsNone(row['active_curriculum'])
+            feedback = self.client.get(f'/api/therapy/child/{child}/feedback/').data
+            self.assertEqual(row['latest_review'], feedback.get('latest_review'))
+
+        main = summary['children'][-1]
+        self.assertEqual(main['active_curriculum']['tasks_completed_today'], 1)
+        self.assertIsNotNone(main['latest_review'])
+
+    def test_query_count_is_independent_of_children(self):
+        d = self.d
+        for index in range(1000, 1003):
+            child = create_family(index, d.doctor, 'accepted')[1]
+            child.parent = d.parent
+            child.save()
+            ChildCurriculum.objects.create(
+                child=child, curriculum=d.curriculum, assigned_by=d.doctor,
+                start_date=date.today(), end_date=date.today() + timedelta(days=45),
+            )
+        with self.assertNumQueries(3):
+            summary = self.client.get('/api/therapy/parent/home/').data
+        self.assertEqual(len(summary['children']), 5)
+
+    def test_parents_only(self):
+        self.client.force_authenticate(self.d.doctor_user)
+        self.assertEqual(self.client.get('/api/therapy/parent/home/').status_code, 403)
+
+
+class DoctorDashboardCountersTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.data = seed_dataset(1)
+        self.doctor = APIClient()
+        self.doctor.force_authenticate(self.data.doctor_user)
+        self.parent = APIClient()
+        self.parent.force_authenticate(self.data.parent)
+
+    def counters(self):
+        return self.doctor.get('/api/therapy/doctor/counters/').data
+
+    def test_counters_match_lists_and_follow_writes(self):
+        d = self.data
+        counters = self.counters()
+        self.assertEqual(counters['pending_patients'], len(self.doctor.get('/api/therapy/doctor/pending/').json()))
+        self.assertEqual(counters['accepted_patients'], len(self.doctor.get('/api/therapy/doctor/patients/').data))
+        self.assertEqual(counters['reviews_due'], self.doctor.get('/api/therapy/doctor/reviews-due/count/').data['count'])
+        self.assertEqual(counters['reports_shared'], DiagnosisReport.objects.filter(shared_with_parent=True).count())
+        self.assertEqual(counters['submissions_today'], 0)
+
+        with self.assertNumQueries(2):  # the doctor profile and one read of the shared cache
+            self.counters()
+
+        self.doctor.post(f'/api/therapy/doctor/patient/{d.pending_child.id}/accept/')
+        self.doctor.post(f'/api/therapy/doctor/report/{d.report.id}/toggle-share/')
+        self.parent.post(f'/api/therapy/child/{d.child.id}/submit/',
+                         {'task_id': d.task.id, 'status': 'done_with_help'}, format='json')
+        self.assertEqual(self.counters(), {
+            **counters,
+            'pending_patients': counters['pending_patients'] - 1,
+            'accepted_patients': counters['accepted_patients'] + 1,
+            'reports_shared': counters['reports_shared'] - 1,
+            'submissions_today': 1,
+        })
+
+    def test_doctors_only(self):
+        self.assertEqual(self.parent.get('/api/therapy/doctor/counters/').status_code, 403)
+
+
+class DoctorQueueStreamTests(TestCase):
+    url = '/api/therapy/doctor/pending/stream/'
+
+    def setUp(self):
+        self.data = seed_dataset(1)
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.data.doctor_user)}'}
+
+    def test_wsgi_requests_are_refused(self):
+        response = Client().get(self.url, headers=self.auth)
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.streaming)
+
+    async def test_asgi_requests_stream_events(self):
+        response = await AsyncClient().get(self.url, headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = aiter(response.streaming_content)
+        self.assertEqual(await anext(events), b'retry: 5000\n\n')
+        await events.aclose()
+
+
+class AsyncViewParityTests(TestCase):
+    """The async read views answer like the sync views they replace under ASYNC_READ_VIEWS"""
+
+    def setUp(self):
+        self.data = seed_dataset(1)
+        self.other_parent, self.other_child = create_family(1000)  # no curriculum
+        parent = APIClient()
+        parent.force_authenticate(self.data.parent)
+        parent.post(f'/api/therapy/child/{self.data.child.id}/submit/',
+                    {'task_id': self.data.task.id, 'status': 'done_with_help'}, format='json')
+
+    def cases(self):
+        d = self.data
+        doctor, parent, other = d.doctor_user, d.parent, self.other_parent
+        pending, detail = async_views.AsyncDoctorPendingPatientsView, async_views.AsyncDoctorPatientDetailView
+        today, history = async_views.AsyncTodayTasksView, async_views.AsyncProgressHistoryView
+        return [
+            (pending, doctor, {}, 200), (pending, parent, {}, 403), (pending, None, {}, 401),
+            (detail, doctor, {'child_id': d.child.id}, 200), (detail, parent, {'child_id': d.child.id}, 403),
+            (detail, doctor, {'child_id': 999999}, 404),
+            (today, parent, {'child_id': d.child.id}, 200), (today, doctor, {'child_id': d.child.id}, 403),
+            (today, other, {'child_id': d.child.id}, 404),
+            (history, parent, {'child_id': d.child.id}, 200), (history, doctor, {'child_id': d.child.id}, 200),
+            (history, other, {'child_id': d.child.id}, 403), (history, other, {'child_id': self.other_child.id}, 404),
+            (history, None, {'child_id': d.child.id}, 401),
+        ]
+
+    @staticmethod
+    def headers(user):
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'} if user else {}
+
+    def sync_get(self, url, user):
+        response = Client().get(url, headers=self.headers(user))
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, body
+
+    async def test_async_views_match_sync_views(self):
+        names = {
+            async_views.AsyncDoctorPendingPatientsView: 'doctor-pending',
+            async_views.AsyncDoctorPatientDetailView: 'doctor-patient-detail',
+            async_views.AsyncTodayTasksView: 'today-tasks',
+            async_views.AsyncProgressHistoryView: 'progress-history',
+        }
+        for view, user, kwargs, expected in await sync_to_async(self.cases)():
+            url = reverse(names[view], kwargs=kwargs)
+            with self.subTest(url=url, user=user and user.email):
+                status_code, body = await sync_to_async(self.sync_get)(url, user)
+                headers = await sync_to_async(self.headers)(user)
+                response = await view.as_view()(AsyncRequestFactory().get(url, headers=headers), **kwargs)
+                if response.streaming:
+                    content = b''.join([chunk async for chunk in response.streaming_content])
+                else:
+                    content = response.content
+                self.assertEqual((response.status_code, content), (status_code, body))
+                self.assertEqual(status_code, expected)
+
+
+class SyntheticDataCommandTests(TestCase):
+    options = {'families': 5, 'doctors': 2, 'end_date': date(2025, 3, 31), 'stdout': io.StringIO()}
+
+    def generate(self, **options):
+        call_command('generate_synthetic_data', **self.options, **options)
+        return {
+            'parents': list(User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}', role='parent')
+                            .order_by('email').values_list('email', 'full_name')),
+            'children': list(Child.objects.order_by('pk').values_list('full_name', 'date_of_birth', 'gender')),
+            'mchat': list(MChatResponse.objects.order_by('pk').values_list('total_score', 'risk_level')),
+            'assessments': list(ChildAssessment.objects.order_by('pk').values_list('status', 'submitted_at')),
+            'curricula': list(ChildCurriculum.objects.order_by('pk').values_list('start_date', 'current_day')),
+            'progress': list(DailyProgress.objects.order_by('pk').values_list('day_number', 'date', 'status')),
+        }
+
+    def test_generates_the_same_data_for_a_seed(self):
+        first = self.generate()
+        self.assertEqual(len(first['parents']), 5)
+        self.assertEqual(User.objects.filter(role='doctor').count(), 2)
+        self.assertEqual(len(first['children']), len(first['mchat']))
+        self.assertEqual(len(first['children']), len(first['assessments']))
+        self.assertTrue(first['progress'])
+
+        with self.assertRaises(CommandError):  # refuses to add to existing synthetic data
+            self.generate()
+        # --clear replaces the data rather than adding to it
+        self.assertEqual(self.generate(clear=True), first)
+        self.assertNotEqual(self.generate(clear=True, seed=7), first)
+
+    def test_drops_the_cached_pending_count(self):
+        caches['shared'].set(PENDING_CACHE_KEY, 0)
+        self.generate()
+        self.assertIsNone(caches['shared'].get(PENDING_CACHE_KEY))
@@ -1,5 +1,18 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, async_views
+
+# Hot read endpoints: async variants under ASGI, sync DRF views otherwise
+if settings.ASYNC_READ_VIEWS:
+    pending_view = async_views.AsyncDoctorPendingPatientsView
+    patient_detail_view = async_views.AsyncDoctorPatientDetailView
+    today_tasks_view = async_views.AsyncTodayTasksView
+    progress_history_view = async_views.AsyncProgressHistoryView
+else:
+    pending_view = views.DoctorPendingPatientsView
+    patient_detail_view = views.DoctorPatientDetailView
+    today_tasks_view = views.TodayTasksView
+    progress_history_view = views.ProgressHistoryView
 
 urlpatterns = [
     # Curriculum endpoints
@@ -7,23 +20,30 @@ urlpatterns = [
     path('curricula/<int:pk>/', views.CurriculumDetailView.as_view(), name='curriculum-detail'),
 
     # Doctor dashboard endpoints
-    path('doctor/pending/', views.DoctorPendingPatientsView.as_view(), name='doctor-pending'),
+    path('doctor/pending/', pending_view.as_view(), name='doctor-pending'),
+    path('doctor/pending/stream/', async_views.DoctorQueueStreamView.as_view(), name='doctor-pending-stream'),
     path('doctor/patients/', views.DoctorAcceptedPatientsView.as_view(), name='doctor-patients'),
-    path('doctor/patient/<int:child_id>/', views.DoctorPatientDetailView.as_view(), name='doctor-patient-detail'),
+    path('doctor/patient/<int:child_id>/', patient_detail_view.as_view(), name='doctor-patient-detail'),
     path('doctor/patient/<int:child_id>/accept/', views.DoctorAcceptPatientView.as_view(), name='doctor-accept'),
     path('doctor/patient/<int:child_id>/assign/', views.DoctorAssignCurriculumView.as_view(), name='doctor-assign'),
     path('doctor/patient/<int:child_id>/progress/', views.DoctorPatientProgressView.as_view(), name='doctor-progress'),
     path('doctor/patient/<int:child_id>/review/', views.DoctorCreateReviewView.as_view(), name='doctor-review'),
     path('doctor/patient/<int:child_id>/diagnosis/', views.DoctorCreateDiagnosisView.as_view(), name='doctor-diagnosis'),
+    path('doctor/reviews-due/', views.DoctorReviewsDueView.as_view(), name='doctor-reviews-due'),
+    path('doctor/reviews-due/count/', views.DoctorReviewsDueCountView.as_view(), name='doctor-reviews-due-count'),
+    path('doctor/adherence/', views.DoctorAdherenceFlagsView.as_view(), name='doctor-adherence'),
+    path('doctor/counters/', views.DoctorDashboardCountersView.as_view(), name='doctor-counters'),
 
     # Doctor report management
     path('doctor/report/<int:report_id>/toggle-share/', views.DoctorToggleReportShareView.as_view(), name='toggle-report-share'),
 
     # Parent endpoints
-    path('child/<int:child_id>/today/', views.TodayTasksView.as_view(), name='today-tasks'),
+    path('parent/home/', views.ParentHomeSummaryView.as_view(), name='parent-home'),
+    path('child/<int:child_id>/today/', today_tasks_view.as_view(), name='today-tasks'),
     path('child/<int:child_id>/submit/', views.SubmitProgressView.as_view(), name='submit-progress'),
     path('child/<int:child_id>/advance/', views.AdvanceDayView.as_view(), name='advance-day'),
-    path('child/<int:child_id>/history/', views.ProgressHistoryView.as_view(), name='progress-history'),
+    path('child/<int:child_id>/history/', progress_history_view.as_view(), name='progress-history'),
+    path('child/<int:child_id>/heatmap/', views.ProgressHeatmapView.as_view(), name='progress-heatmap'),
     path('child/<int:child_id>/curriculum/', views.ChildCurriculumStatusView.as_view(), name='curriculum-status'),
     path('child/<int:child_id>/reports/', views.ChildDiagnosisReportsView.as_view(), name='child-reports'),
     path('child/<int:child_id>/feedback/', views.ChildDoctorFeedbackView.as_view(), name='child-feedback'),
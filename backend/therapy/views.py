@@ -2,11 +2,24 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count, Prefetch
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from datetime import date
 
-from .models import Curriculum, CurriculumTask, ChildCurriculum, DailyProgress, DoctorReview, DiagnosisReport
+from autisahara.batch import cached_object_or_404
+from autisahara.compiled import compiled
+from autisahara.fieldsets import FieldSelection, sparse_data, sparse_queryset
+from autisahara.idempotency import idempotent
+from autisahara.streaming import streamed_response
+
+from .models import (
+    Curriculum, CurriculumTask, ChildCurriculum, DailyProgress, DoctorReview, DiagnosisReport, AdherenceFlag
+)
+from .dashboard import dashboard_counters
+from .heatmap import progress_heatmap
+from .home_summary import parent_home_summary
+from .review_inbox import due_review_count, due_reviews
 from .serializers import (
     CurriculumSerializer, CurriculumDetailSerializer, CurriculumTaskSerializer,
     ChildCurriculumSerializer, AssignCurriculumSerializer,
@@ -32,6 +45,160 @@ def get_or_create_doctor_profile(user):
     return doctor
 
 
+# ============== RESPONSE BUILDERS ==============
+# Shared by the sync views below and their async variants in async_views.py,
+# so both return identical payloads. Callers must load the related objects
+# listed next to each builder (async code cannot lazy-load them).
+
+# select_related for pending_patient_row
+PENDING_PATIENT_RELATED = ['child', 'child__parent', 'child__mchat']
+
+
+def pending_patient_row(assessment):
+    child = assessment.child
+    mchat = getattr(child, 'mchat', None)
+    return {
+        'assessment_id': assessment.id,
+        'child_id': child.id,
+        'child_name': child.full_name,
+        'age': f"{child.age_years}y {child.age_months}m",
+        'parent_name': child.parent.full_name,
+        'mchat_score': mchat.total_score if mchat else None,
+        'mchat_risk': mchat.risk_level if mchat else None,
+        'submitted_at': assessment.submitted_at,
+    }
+
+
+# select_related on Child for patient_detail_data
+PATIENT_DETAIL_RELATED = ['parent', 'mchat', 'medical_history', 'education', 'health', 'assessment']
+
+
+def patient_detail_data(child, videos):
+    mchat = getattr(child, 'mchat', None)
+    medical_history = getattr(child, 'medical_history', None)
+    education = getattr(child, 'education', None)
+    health = getattr(child, 'health', None)
+    assessment = getattr(child, 'assessment', None)
+
+    return {
+        'id': assessment.id if assessment else None,
+        'child': {
+            'id': child.id,
+            'full_name': child.full_name,
+            'date_of_birth': child.date_of_birth,
+            'age_years': child.age_years,
+            'age_months': child.age_months,
+            'gender': child.gender,
+        },
+        'parent': {
+            'id': child.parent.id,
+            'full_name': child.parent.full_name,
+            'email': child.parent.email,
+            'phone': child.parent.phone,
+        },
+        'mchat_result': {
+            'id': mchat.id,
+            'total_score': mchat.total_score,
+            'risk_level': mchat.risk_level,
+            'created_at': mchat.created_at,
+        } if mchat else None,
+        'medical_history': {
+            'pregnancy_infection': medical_history.pregnancy_infection,
+            'pregnancy_infection_desc': medical_history.pregnancy_infection_desc,
+            'birth_complications': medical_history.birth_complications,
+            'birth_complications_desc': medical_history.birth_complications_desc,
+            'brain_injury_first_year': medical_history.brain_injury_first_year,
+            'brain_injury_desc': medical_history.brain_injury_desc,
+            'family_autism_history': medical_history.family_autism_history,
+            'requires_specialist': medical_history.requires_specialist,
+        } if medical_history else None,
+        'education': {
+            'is_in_school': education.goes_to_school,
+            'school_name': education.school_name,
+            'grade_class': education.grade_class,
+            'school_type': education.school_type,
+        } if education else None,
+        'health': {
+            'height': str(health.height_cm) if health.height_cm else None,
+            'weight': str(health.weight_kg) if health.weight_kg else None,
+            'has_vaccinations': health.has_vaccinations,
+            'medical_conditions': health.medical_conditions,
+            'taking_medication': health.takes_medication,
+            'medication_list': health.medication_list,
+        } if health else None,
+        'videos': [
+            {
+                'id': v.id,
+                'video_type': v.video_type,
+                'video_url': v.video_url,
+                'description': v.description,
+                'uploaded_at': v.uploaded_at,
+            }
+            for v in videos
+        ],
+        'status': assessment.status if assessment else 'pending',
+        'submitted_at': assessment.submitted_at if assessment else None,
+    }
+
+
+def today_tasks_data(child_curriculum, tasks, progress_by_task, today):
+    """
+    child_curriculum needs curriculum loaded; tasks and progress entries are
+    rendered rows (compiled CurriculumTaskSerializer / DailyProgressSerializer)
+    """
+    result = []
+    for task in tasks:
+        progress = progress_by_task.get(task['id'])
+        result.append({
+            'task': task,
+            'progress': progress,
+            'is_completed': progress is not None and progress['status'] != 'not_done',
+        })
+
+    return {
+        'curriculum_title': child_curriculum.curriculum.title,
+        'current_day': child_curriculum.current_day,
+        'total_days': child_curriculum.curriculum.duration_days,
+        'date': today,
+        'tasks': result,
+    }
+
+
+# select_related on ChildCurriculum for ChildCurriculumSerializer
+CHILD_CURRICULUM_RELATED = ['child', 'curriculum', 'assigned_by__user']
+
+
+# Order for progress_history_stream: each day's entries are contiguous. It groups
+# like newest-first does because day_number never decreases as dates advance.
+HISTORY_ORDER = ['-day_number', '-date', '-submitted_at']
+
+
+def progress_history_stream(child_curriculum, progress_entries):
+    """Progress history with the days streamed; progress_entries are rendered rows in HISTORY_ORDER"""
+    return {
+        'curriculum': ChildCurriculumSerializer(child_curriculum).data,
+        'history': _history_days(progress_entries),
+    }
+
+
+def _history_days(progress_entries):
+    day = None
+    for entry in progress_entries:
+        if day is None or entry['day_number'] != day['day_number']:
+            if day is not None:
+                yield day
+            day = {'day_number': entry['day_number'], 'date': entry['date'], 'tasks': []}
+        day['tasks'].append(entry)
+    if day is not None:
+        yield day
+
+
+def stream_serialized(serializer_class, queryset):
+    """Rows of queryset serialized one at a time as they are read, for streamed_response()"""
+    serializer = serializer_class()
+    return (serializer.to_representation(obj) for obj in queryset.iterator())
+
+
 # ============== CURRICULUM ENDPOINTS ==============
 
 class CurriculumListView(generics.ListAPIView):
@@ -40,7 +207,7 @@ class CurriculumListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Curriculum.objects.all()
+        queryset = Curriculum.objects.annotate(tasks_total=Count('tasks'))
         # Optional filters
         curriculum_type = self.request.query_params.get('type')
         spectrum = self.request.query_params.get('spectrum')
@@ -53,15 +220,17 @@ class CurriculumListView(generics.ListAPIView):
         if duration:
             queryset = queryset.filter(duration_days=duration)
 
-        return queryset
+        return sparse_queryset(queryset, self.get_serializer_class(), self.request)
 
 
 class CurriculumDetailView(generics.RetrieveAPIView):
     """Get curriculum details with all tasks"""
-    queryset = Curriculum.objects.all()
     serializer_class = CurriculumDetailSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return sparse_queryset(Curriculum.objects.all(), self.get_serializer_class(), self.request)
+
 
 # ============== DOCTOR DASHBOARD ENDPOINTS ==============
 
@@ -74,24 +243,9 @@ class DoctorPendingPatientsView(APIView):
             return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
 
         # Get pending assessments
-        pending = ChildAssessment.objects.filter(status='pending').select_related('child', 'child__parent')
-
-        data = []
-        for assessment in pending:
-            child = assessment.child
-            mchat = getattr(child, 'mchat', None)
-            data.append({
-                'assessment_id': assessment.id,
-                'child_id': child.id,
-                'child_name': child.full_name,
-                'age': f"{child.age_years}y {child.age_months}m",
-                'parent_name': child.parent.full_name,
-                'mchat_score': mchat.total_score if mchat else None,
-                'mchat_risk': mchat.risk_level if mchat else None,
-                'submitted_at': assessment.submitted_at,
-            })
+        pending = ChildAssessment.objects.filter(status='pending').select_related(*PENDING_PATIENT_RELATED)
 
-        return Response(data)
+        return Response([pending_patient_row(assessment) for assessment in pending])
 
 
 class DoctorAcceptedPatientsView(APIView):
@@ -106,15 +260,17 @@ class DoctorAcceptedPatientsView(APIView):
         accepted = ChildAssessment.objects.filter(
             assigned_doctor=doctor,
             status__in=['accepted', 'completed']
-        ).select_related('child', 'child__parent')
+        ).select_related('child', 'child__parent').prefetch_related(
+            # Active curriculum of every patient in one query
+            Prefetch('child__curricula', queryset=ChildCurriculum.objects.filter(status='active'),
+                     to_attr='active_curricula')
+        )
 
         data = []
         for assessment in accepted:
             child = assessment.child
             # Get active curriculum if any
-            active_curriculum = ChildCurriculum.objects.filter(
-                child=child, status='active'
-            ).first()
+            active_curriculum = child.active_curricula[0] if child.active_curricula else None
 
             data.append({
                 'assessment_id': assessment.id,
@@ -139,77 +295,11 @@ class DoctorPatientDetailView(APIView):
         if request.user.role != 'doctor':
             return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
 
-        child = get_object_or_404(Child, pk=child_id)
+        child = get_object_or_404(Child.objects.select_related(*PATIENT_DETAIL_RELATED), pk=child_id)
+        selection = FieldSelection.from_request(request)
+        videos = child.videos.all() if selection is None or selection.keeps('videos') else []
 
-        # Get all related data
-        mchat = getattr(child, 'mchat', None)
-        medical_history = getattr(child, 'medical_history', None)
-        education = getattr(child, 'education', None)
-        health = getattr(child, 'health', None)
-        videos = child.videos.all()
-        assessment = getattr(child, 'assessment', None)
-
-        data = {
-            'id': assessment.id if assessment else None,
-            'child': {
-                'id': child.id,
-                'full_name': child.full_name,
-                'date_of_birth': child.date_of_birth,
-                'age_years': child.age_years,
-                'age_months': child.age_months,
-                'gender': child.gender,
-            },
-            'parent': {
-                'id': child.parent.id,
-                'full_name': child.parent.full_name,
-                'email': child.parent.email,
-                'phone': child.parent.phone,
-            },
-            'mchat_result': {
-                'id': mchat.id,
-                'total_score': mchat.total_score,
-                'risk_level': mchat.risk_level,
-                'created_at': mchat.created_at,
-            } if mchat else None,
-            'medical_history': {
-                'pregnancy_infection': medical_history.pregnancy_infection,
-                'pregnancy_infection_desc': medical_history.pregnancy_infection_desc,
-                'birth_complications': medical_history.birth_complications,
-                'birth_complications_desc': medical_history.birth_complications_desc,
-                'brain_injury_first_year': medical_history.brain_injury_first_year,
-                'brain_injury_desc': medical_history.brain_injury_desc,
-                'family_autism_history': medical_history.family_autism_history,
-                'requires_specialist': medical_history.requires_specialist,
-            } if medical_history else None,
-            'education': {
-                'is_in_school': education.goes_to_school,
-                'school_name': education.school_name,
-                'grade_class': education.grade_class,
-                'school_type': education.school_type,
-            } if education else None,
-            'health': {
-                'height': str(health.height_cm) if health.height_cm else None,
-                'weight': str(health.weight_kg) if health.weight_kg else None,
-                'has_vaccinations': health.has_vaccinations,
-                'medical_conditions': health.medical_conditions,
-                'taking_medication': health.takes_medication,
-                'medication_list': health.medication_list,
-            } if health else None,
-            'videos': [
-                {
-                    'id': v.id,
-                    'video_type': v.video_type,
-                    'video_url': v.video_url,
-                    'description': v.description,
-                    'uploaded_at': v.uploaded_at,
-                }
-                for v in videos
-            ],
-            'status': assessment.status if assessment else 'pending',
-            'submitted_at': assessment.submitted_at if assessment else None,
-        }
-
-        return Response(data)
+        return Response(sparse_data(patient_detail_data(child, videos), selection))
 
 
 class DoctorAcceptPatientView(APIView):
@@ -289,18 +379,16 @@ class DoctorPatientProgressView(APIView):
         child = get_object_or_404(Child, pk=child_id)
 
         # Get active or most recent curriculum
-        child_curriculum = ChildCurriculum.objects.filter(child=child).first()
+        child_curriculum = ChildCurriculum.objects.filter(child=child).select_related('curriculum').first()
 
         if not child_curriculum:
             return Response({'error': 'No curriculum assigned'}, status=status.HTTP_404_NOT_FOUND)
 
         # Get all progress entries
-        progress_entries = DailyProgress.objects.filter(
-            child_curriculum=child_curriculum
-        ).select_related('task')
+        progress_entries = DailyProgress.objects.filter(child_curriculum=child_curriculum)
 
         # Get reviews
-        reviews = DoctorReview.objects.filter(child_curriculum=child_curriculum)
+        reviews = DoctorReview.objects.filter(child_curriculum=child_curriculum).select_related('doctor__user')
 
         # Calculate stats
         total_tasks = progress_entries.count()
@@ -323,11 +411,11 @@ class DoctorPatientProgressView(APIView):
                 'tasks_done_without_help': done_without_help,
                 'completion_rate': round(done_tasks / total_tasks * 100, 1) if total_tasks > 0 else 0,
             },
-            'progress': DailyProgressSerializer(progress_entries, many=True).data,
+            'progress': compiled(DailyProgressSerializer).rows(progress_entries),
             'reviews': DoctorReviewSerializer(reviews, many=True).data,
         }
 
-        return Response(data)
+        return streamed_response(request, data)
 
 
 class DoctorCreateReviewView(APIView):
@@ -366,8 +454,81 @@ class DoctorCreateReviewView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class DoctorReviewsDueView(APIView):
+    """Checkpoint reviews (Day 15/30/45) owed across all of the doctor's patients"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'doctor':
+            return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        doctor = get_or_create_doctor_profile(request.user)
+        reviews = due_reviews(doctor)
+        return Response({'count': len(reviews), 'reviews': reviews})
+
+
+class DoctorReviewsDueCountView(APIView):
+    """Number of reviews due, for the dashboard badge (cached)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'doctor':
+            return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        doctor = get_or_create_doctor_profile(request.user)
+        return Response({'count': due_review_count(doctor)})
+
+
+class DoctorDashboardCountersView(APIView):
+    """Dashboard header counters (cached, see dashboard.py)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'doctor':
+            return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        doctor = get_or_create_doctor_profile(request.user)
+        return Response(dashboard_counters(doctor, date.today()))
+
+
+class DoctorAdherenceFlagsView(APIView):
+    """Patients whose family stopped submitting progress (from the adherence job)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'doctor':
+            return Response({'error': 'Only doctors can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        doctor = get_or_create_doctor_profile(request.user)
+        flags = AdherenceFlag.objects.filter(doctor=doctor).select_related(
+            'child_curriculum__child', 'child_curriculum__curriculum'
+        )
+        return Response([{
+            'child_curriculum_id': flag.child_curriculum_id,
+            'child_id': flag.child_curriculum.child_id,
+            'child_name': flag.child_curriculum.child.full_name,
+            'curriculum_title': flag.child_curriculum.curriculum.title,
+            'current_day': flag.child_curriculum.current_day,
+            'last_progress_date': flag.last_progress_date,
+            'days_inactive': flag.days_inactive,
+            'flagged_at': flag.flagged_at,
+            'checked_at': flag.checked_at,
+        } for flag in flags])
+
+
 # ============== PARENT ENDPOINTS ==============
 
+class ParentHomeSummaryView(APIView):
+    """Home screen summary of all the parent's children (see home_summary.py)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'parent':
+            return Response({'error': 'Only parents can access this'}, status=status.HTTP_403_FORBIDDEN)
+
+        return Response(parent_home_summary(request.user, date.today()))
+
+
 class TodayTasksView(APIView):
     """Get today's tasks for parent's child"""
     permission_classes = [IsAuthenticated]
@@ -376,53 +537,39 @@ class TodayTasksView(APIView):
         if request.user.role != 'parent':
             return Response({'error': 'Only parents can access this'}, status=status.HTTP_403_FORBIDDEN)
 
-        child = get_object_or_404(Child, pk=child_id, parent=request.user)
+        child = cached_object_or_404(Child, child_id, parent=request.user)
 
         # Get active curriculum
         child_curriculum = ChildCurriculum.objects.filter(
             child=child, status='active'
-        ).first()
+        ).select_related('curriculum').first()
 
         if not child_curriculum:
             return Response({'error': 'No active curriculum'}, status=status.HTTP_404_NOT_FOUND)
 
         # Get tasks for current day
-        current_day = child_curriculum.current_day
-        tasks = CurriculumTask.objects.filter(
-            curriculum=child_curriculum.curriculum,
-            day_number=current_day
-        )
+        tasks = list(compiled(CurriculumTaskSerializer).rows(CurriculumTask.objects.filter(
+            curriculum=child_curriculum.curriculum_id,
+            day_number=child_curriculum.current_day
+        )))
 
+        # Progress already submitted today, one query for all tasks
         today = date.today()
-        result = []
-
-        for task in tasks:
-            # Check if progress already submitted
-            progress = DailyProgress.objects.filter(
-                child_curriculum=child_curriculum,
-                task=task,
-                date=today
-            ).first()
-
-            result.append({
-                'task': CurriculumTaskSerializer(task).data,
-                'progress': DailyProgressSerializer(progress).data if progress else None,
-                'is_completed': progress is not None and progress.status != 'not_done',
-            })
+        progress_entries = DailyProgress.objects.filter(
+            child_curriculum=child_curriculum,
+            task__in=[task['id'] for task in tasks],
+            date=today
+        )
 
-        return Response({
-            'curriculum_title': child_curriculum.curriculum.title,
-            'current_day': current_day,
-            'total_days': child_curriculum.curriculum.duration_days,
-            'date': today,
-            'tasks': result,
-        })
+        progress_by_task = {entry['task']['id']: entry for entry in compiled(DailyProgressSerializer).rows(progress_entries)}
+        return Response(today_tasks_data(child_curriculum, tasks, progress_by_task, today))
 
 
 class SubmitProgressView(APIView):
     """Parent submits progress for a task"""
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request, child_id):
         if request.user.role != 'parent':
             return Response({'error': 'Only parents can access this'}, status=status.HTTP_403_FORBIDDEN)
@@ -526,31 +673,43 @@ class ProgressHistoryView(APIView):
         if request.user.role == 'parent' and child.parent != request.user:
             return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        child_curriculum = ChildCurriculum.objects.filter(child=child).first()
+        child_curriculum = ChildCurriculum.objects.filter(
+            child=child
+        ).select_related(*CHILD_CURRICULUM_RELATED).first()
 
         if not child_curriculum:
             return Response({'error': 'No curriculum found'}, status=status.HTTP_404_NOT_FOUND)
 
         progress_entries = DailyProgress.objects.filter(
             child_curriculum=child_curriculum
-        ).select_related('task').order_by('-date', '-submitted_at')
-
-        # Group by day
-        days = {}
-        for entry in progress_entries:
-            day = entry.day_number
-            if day not in days:
-                days[day] = {
-                    'day_number': day,
-                    'date': entry.date,
-                    'tasks': []
-                }
-            days[day]['tasks'].append(DailyProgressSerializer(entry).data)
+        ).order_by(*HISTORY_ORDER)
 
-        return Response({
-            'curriculum': ChildCurriculumSerializer(child_curriculum).data,
-            'history': list(days.values()),
-        })
+        return streamed_response(request, progress_history_stream(
+            child_curriculum, compiled(DailyProgressSerializer).rows(progress_entries)
+        ))
+
+
+class ProgressHeatmapView(APIView):
+    """Day x task status grid of a child's curriculum (latest, or ?child_curriculum=<id>)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, child_id):
+        curricula = ChildCurriculum.objects.filter(child_id=child_id).select_related('child', 'curriculum')
+        if request.query_params.get('child_curriculum'):
+            try:
+                curricula = curricula.filter(pk=int(request.query_params['child_curriculum']))
+            except ValueError:
+                return Response({'error': 'child_curriculum must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        child_curriculum = curricula.first()
+
+        if not child_curriculum:
+            return Response({'error': 'No curriculum found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Check access
+        if request.user.role == 'parent' and child_curriculum.child.parent_id != request.user.id:
+            return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        return Response(progress_heatmap(child_curriculum))
 
 
 class ChildCurriculumStatusView(APIView):
@@ -564,17 +723,21 @@ class ChildCurriculumStatusView(APIView):
         if request.user.role == 'parent' and child.parent != request.user:
             return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        curricula = ChildCurriculum.objects.filter(child=child)
+        curricula = ChildCurriculum.objects.filter(child=child).select_related(*CHILD_CURRICULUM_RELATED)
 
-        return Response({
+        return streamed_response(request, {
             'child_id': child.id,
             'child_name': child.full_name,
-            'curricula': ChildCurriculumSerializer(curricula, many=True).data,
+            'curricula': stream_serialized(ChildCurriculumSerializer, curricula),
         })
 
 
 # ============== DIAGNOSIS REPORT ENDPOINTS ==============
 
+# select_related on DiagnosisReport for DiagnosisReportSerializer
+REPORT_RELATED = ['child', 'doctor__user']
+
+
 class DoctorCreateDiagnosisView(APIView):
     """Doctor creates a diagnosis report for a child"""
     permission_classes = [IsAuthenticated]
@@ -634,7 +797,7 @@ class ChildDiagnosisReportsView(APIView):
             if child.parent != request.user:
                 return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
             # Parents can only see shared reports
-            reports = DiagnosisReport.objects.filter(child=child, shared_with_parent=True)
+            reports = DiagnosisReport.objects.filter(child=child, shared_with_parent=True).select_related(*REPORT_RELATED)
         elif request.user.role == 'doctor':
             # Doctors can see all reports for their patients
             doctor = get_or_create_doctor_profile(request.user)
@@ -644,7 +807,7 @@ class ChildDiagnosisReportsView(APIView):
                 assigned_doctor=doctor
             ).first()
             if assessment:
-                reports = DiagnosisReport.objects.filter(child=child)
+                reports = DiagnosisReport.objects.filter(child=child).select_related(*REPORT_RELATED)
             else:
                 return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
         else:
@@ -662,10 +825,10 @@ class ChildDoctorFeedbackView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, child_id):
-        child = get_object_or_404(Child, pk=child_id)
+        child = cached_object_or_404(Child, child_id)
 
         # Check access - parent can only see their own child's feedback
-        if request.user.role == 'parent' and child.parent != request.user:
+        if request.user.role == 'parent' and child.parent_id != request.user.id:
             return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
         # Get active or most recent curriculum